@@ -55,6 +55,19 @@ class ConfigLoader:
             reddit_config['client_secret'] = client_secret
         if user_agent:
             reddit_config['user_agent'] = user_agent
+        
+        # Extra OAuth apps for the client pool: REDDIT_CLIENT_ID_2, REDDIT_CLIENT_SECRET_2, ...
+        credentials = list(reddit_config.get('credentials') or [])
+        index = 2
+        while os.getenv(f'REDDIT_CLIENT_ID_{index}'):
+            credentials.append({
+                'client_id': os.getenv(f'REDDIT_CLIENT_ID_{index}'),
+                'client_secret': os.getenv(f'REDDIT_CLIENT_SECRET_{index}', ''),
+                'user_agent': os.getenv(f'REDDIT_USER_AGENT_{index}') or reddit_config.get('user_agent')
+            })
+            index += 1
+        if credentials:
+            reddit_config['credentials'] = credentials
             
         self.config['reddit'] = reddit_config
     
@@ -110,6 +123,12 @@ class ConfigLoader:
             if not value or value.startswith('YOUR_') or value.startswith('your_'):
                 return False
         
+        for credentials in reddit.get('credentials') or []:
+            for field in ['client_id', 'client_secret']:
+                value = credentials.get(field, '')
+                if not value or value.startswith('YOUR_') or value.startswith('your_'):
+                    return False
+        
         return True
     
     def get_reddit_config(self):
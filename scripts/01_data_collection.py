@@ -14,31 +14,79 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 import praw
+import prawcore
 import pandas as pd
+import asyncio
 from datetime import datetime, timedelta
 import time
-from tqdm import tqdm
 import logging
 import traceback
 import json
 import signal
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from contextlib import asynccontextmanager
 from utils import setup_logger, save_dataframe, save_json
+from rate_limiter import TokenBucketRateLimiter
+from checkpoint_store import CheckpointStore
+from watermarks import WatermarkStore
+from comment_expander import CommentTreeExpander
+from id_index import IdIndex
 from config.config_loader import ConfigLoader
 
+try:
+    import asyncpraw
+    import asyncprawcore
+except ImportError:  # Only needed for the concurrent collection mode
+    asyncpraw = None
+    asyncprawcore = None
+
+
+class RateLimitedRequestor(prawcore.Requestor):
+    """prawcore requestor that routes every HTTP request through a shared rate limiter"""
+    
+    def __init__(self, *args, rate_limiter=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.rate_limiter = rate_limiter
+    
+    def request(self, *args, **kwargs):
+        self.rate_limiter.acquire()
+        response = super().request(*args, **kwargs)
+        self.rate_limiter.update_from_headers(response.headers, response.status_code)
+        return response
+
+
+if asyncprawcore is not None:
+    class AsyncRateLimitedRequestor(asyncprawcore.Requestor):
+        """asyncprawcore counterpart of RateLimitedRequestor"""
+        
+        def __init__(self, *args, rate_limiter=None, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.rate_limiter = rate_limiter
+        
+        @asynccontextmanager
+        async def request(self, *args, **kwargs):
+            await self.rate_limiter.acquire_async()
+            async with super().request(*args, **kwargs) as response:
+                self.rate_limiter.update_from_headers(response.headers, response.status)
+                yield response
+
 
 class RedditScraper:
     """Enhanced Reddit scraper designed for long-running collection"""
     
-    def __init__(self, config, checkpoint_file='data/raw/checkpoint.json'):
+    def __init__(self, config, checkpoint_file='data/raw/checkpoint.json', incremental=False):
         """
         Initialize Reddit API connection
         
         Args:
             config: Configuration dictionary
             checkpoint_file: Path to checkpoint file for resuming
+            incremental: Only collect content newer than the stored watermarks
         """
         self.config = config
         self.checkpoint_file = checkpoint_file
+        self.checkpoint_store = CheckpointStore(checkpoint_file)
         self.logger = setup_logger(
             'data_collection',
             f'logs/collection_{datetime.now():%Y%m%d_%H%M%S}.log'
@@ -47,13 +95,30 @@ class RedditScraper:
         self.reddit = None
         self.posts_collected = []
         self.comments_collected = []
-        self.collected_post_ids = set()
         
-        # Rate limiting configuration
-        self.requests_count = 0
-        self.requests_start_time = time.time()
-        self.max_requests_per_minute = 50  # Conservative limit
-        self.request_delay = 1.2  # Seconds between requests
+        # Number of records already written to checkpoint segments
+        self._posts_flushed = 0
+        self._comments_flushed = 0
+        
+        # Incremental mode: watermarks plus what earlier runs already hold
+        self.incremental = incremental
+        self.incremental_config = config['data_collection'].get('incremental', {})
+        self.watermarks = WatermarkStore(
+            self.incremental_config.get('watermark_file', 'data/raw/watermarks.json')
+        )
+        self.comment_count_updates = {}  # post_id -> refreshed num_comments
+        self._records_lock = threading.RLock()  # Collected records, index and checkpoints
+        
+        # Dedupe: persistent index of collected post ids (with num_comments) and comment ids
+        dedupe_config = config['data_collection'].get('dedupe', {})
+        self.id_index = IdIndex(
+            dedupe_config.get('index_file', 'data/raw/id_index.sqlite'),
+            expected_items=dedupe_config.get('expected_items', 1_000_000),
+            false_positive_rate=dedupe_config.get('false_positive_rate', 0.01)
+        )
+        
+        # Rate limiting: one token per HTTP request, refilled from X-Ratelimit-* headers
+        self.rate_limiter = self._create_rate_limiter()
         
         # Error tracking
         self.consecutive_errors = 0
@@ -64,6 +129,8 @@ class RedditScraper:
         self.start_time = datetime.now()
         self.last_save_time = datetime.now()
         self.save_interval_minutes = 5
+        self.batch_pause_seconds = config['data_collection'].get('batch_pause_seconds', 5)
+        self.sleep_seconds = 0.0  # Back-off and batch pauses (rate limiter waits are tracked separately)
         
         # Graceful shutdown
         self.should_stop = False
@@ -71,6 +138,20 @@ class RedditScraper:
         signal.signal(signal.SIGTERM, self._signal_handler)
         
         self._initialize_reddit()
+        self.comment_expander = CommentTreeExpander(
+            self.reddit,
+            record_builder=self._comment_to_record,
+            error_handler=self._handle_api_error,
+            logger=self.logger,
+            config=config['data_collection'].get('comment_expansion', {}),
+            known_filter=lambda ids: self.id_index.filter_new('comment', ids)
+        )
+        
+        if self.incremental:
+            self._load_incremental_baseline()
+        elif not self._has_checkpoint():
+            # Fresh run: the output files will be replaced, so start an empty index
+            self.id_index.reset()
         self._load_checkpoint()
     
     def _signal_handler(self, signum, frame):
@@ -78,153 +159,286 @@ class RedditScraper:
         self.logger.warning(f"Received signal {signum}. Initiating graceful shutdown...")
         self.should_stop = True
     
+    def _sleep(self, seconds):
+        """Sleep and account the time in sleep_seconds"""
+        time.sleep(seconds)
+        self.sleep_seconds += seconds
+    
+    def _create_rate_limiter(self):
+        """Token bucket for one OAuth app, configured from data_collection.rate_limit"""
+        rate_config = self.config['data_collection'].get('rate_limit', {})
+        return TokenBucketRateLimiter(
+            requests_per_minute=rate_config.get('requests_per_minute', 60),
+            burst=rate_config.get('burst', 10)
+        )
+    
+    def _credential_pool(self):
+        """Primary credentials followed by any extra OAuth apps listed under reddit.credentials"""
+        reddit_config = self.config['reddit']
+        pool = [{
+            'client_id': reddit_config['client_id'],
+            'client_secret': reddit_config['client_secret'],
+            'user_agent': reddit_config['user_agent']
+        }]
+        for extra in reddit_config.get('credentials') or []:
+            pool.append({
+                'client_id': extra['client_id'],
+                'client_secret': extra['client_secret'],
+                'user_agent': extra.get('user_agent') or reddit_config['user_agent']
+            })
+        return pool
+    
+    def _client_settings(self, credentials=None):
+        """Credentials and endpoint overrides shared by the praw and asyncpraw clients"""
+        reddit_config = self.config['reddit']
+        credentials = credentials or self._credential_pool()[0]
+        settings = {
+            'client_id': credentials['client_id'],
+            'client_secret': credentials['client_secret'],
+            'user_agent': credentials['user_agent'],
+            'timeout': 30  # 30 second timeout
+        }
+        # Optional endpoint overrides, e.g. a local mock API (scripts/mock_reddit_server.py)
+        for key in ('oauth_url', 'reddit_url'):
+            if reddit_config.get(key):
+                settings[key] = reddit_config[key]
+        return settings
+    
     def _initialize_reddit(self):
         """Initialize Reddit API connection with retry"""
+        self.reddit = self._connect(self.rate_limiter)
+    
+    def _connect(self, rate_limiter, credentials=None):
+        """
+        Create a praw client routed through a rate limiter and test the connection
+        
+        Args:
+            rate_limiter: TokenBucketRateLimiter for this client's OAuth app
+            credentials: Credential dict (defaults to the primary credentials)
+        
+        Returns:
+            praw.Reddit: Connected client
+        """
         max_retries = 3
         for attempt in range(max_retries):
             try:
-                reddit_config = self.config['reddit']
-                
-                self.reddit = praw.Reddit(
-                    client_id=reddit_config['client_id'],
-                    client_secret=reddit_config['client_secret'],
-                    user_agent=reddit_config['user_agent'],
-                    timeout=30  # 30 second timeout
+                reddit = praw.Reddit(
+                    **self._client_settings(credentials),
+                    requestor_class=RateLimitedRequestor,
+                    requestor_kwargs={'rate_limiter': rate_limiter}
                 )
                 
-                # Test connection
-                _ = self.reddit.user.me()
-                self.logger.info(f"Connected to Reddit (read-only: {self.reddit.read_only})")
+                # Test connection (user.me() raises for application-only clients)
+                if not reddit.read_only:
+                    _ = reddit.user.me()
+                self.logger.info(f"Connected to Reddit (read-only: {reddit.read_only})")
                 self.logger.info("Reddit API connection successful")
-                return
+                return reddit
                 
             except Exception as e:
                 self.logger.warning(f"Connection attempt {attempt + 1}/{max_retries} failed: {e}")
                 if attempt < max_retries - 1:
-                    time.sleep(5 * (attempt + 1))
+                    self._sleep(5 * (attempt + 1))
                 else:
                     self.logger.error("Failed to initialize Reddit API after all retries")
                     raise
     
+    def _has_checkpoint(self):
+        return self.checkpoint_store.exists() or Path('data/raw/posts_checkpoint.csv').exists()
+    
     def _load_checkpoint(self):
         """Load checkpoint from previous run if exists"""
-        checkpoint_path = Path(self.checkpoint_file)
+        if not self.checkpoint_store.exists():
+            self._load_legacy_checkpoint()
+            return
         
-        if checkpoint_path.exists():
-            try:
-                with open(checkpoint_path, 'r') as f:
-                    checkpoint = json.load(f)
-                
-                self.logger.info(f"Loading checkpoint from {checkpoint_path}")
-                self.logger.info(f"Previous run collected: {checkpoint.get('posts_count', 0)} posts, "
-                               f"{checkpoint.get('comments_count', 0)} comments")
-                
-                # Load existing data
-                if Path('data/raw/posts_checkpoint.csv').exists():
-                    df_posts = pd.read_csv('data/raw/posts_checkpoint.csv')
-                    self.posts_collected = df_posts.to_dict('records')
-                    self.collected_post_ids = set(df_posts['post_id'].unique())
-                    self.logger.info(f"Loaded {len(self.posts_collected)} posts from checkpoint")
-                
-                if Path('data/raw/comments_checkpoint.csv').exists():
-                    df_comments = pd.read_csv('data/raw/comments_checkpoint.csv')
-                    self.comments_collected = df_comments.to_dict('records')
-                    self.logger.info(f"Loaded {len(self.comments_collected)} comments from checkpoint")
-                
-                self.logger.info("Checkpoint loaded successfully. Resuming collection...")
-                
-            except Exception as e:
-                self.logger.warning(f"Failed to load checkpoint: {e}. Starting fresh.")
-                self.collected_post_ids = set()
-    
-    def _save_checkpoint(self):
-        """Save checkpoint for resuming later"""
         try:
-            checkpoint = {
-                'timestamp': datetime.now().isoformat(),
-                'posts_count': len(self.posts_collected),
-                'comments_count': len(self.comments_collected),
-                'collected_post_ids': list(self.collected_post_ids),
-                'total_errors': self.total_errors,
-                'runtime_minutes': (datetime.now() - self.start_time).total_seconds() / 60
-            }
+            metadata = self.checkpoint_store.metadata
+            self.logger.info(f"Loading checkpoint from {self.checkpoint_file}")
+            self.logger.info(f"Previous run collected: {metadata.get('posts_count', 0)} posts, "
+                           f"{metadata.get('comments_count', 0)} comments")
             
-            # Save checkpoint metadata
-            with open(self.checkpoint_file, 'w') as f:
-                json.dump(checkpoint, f, indent=2)
+            # Replay segments in write order
+            self.posts_collected = list(self.checkpoint_store.replay('posts'))
+            self.comments_collected = list(self.checkpoint_store.replay('comments'))
+            self._posts_flushed = len(self.posts_collected)
+            self._comments_flushed = len(self.comments_collected)
+            self.comment_count_updates = metadata.get('comment_count_updates', {})
             
-            # Save data
-            if self.posts_collected:
-                df_posts = pd.DataFrame(self.posts_collected)
-                save_dataframe(df_posts, 'data/raw/posts_checkpoint.csv', format='csv')
+            # Segments may have been committed without the index (crash in between)
+            self._index_records(self.posts_collected, self.comments_collected)
+            self.id_index.add('post', self.comment_count_updates)
+            self.id_index.commit()
             
-            if self.comments_collected:
-                df_comments = pd.DataFrame(self.comments_collected)
-                save_dataframe(df_comments, 'data/raw/comments_checkpoint.csv', format='csv')
+            self.logger.info(f"Loaded {len(self.posts_collected)} posts and "
+                           f"{len(self.comments_collected)} comments from checkpoint")
+            self.logger.info("Checkpoint loaded successfully. Resuming collection...")
+            
+        except Exception as e:
+            self.logger.warning(f"Failed to load checkpoint: {e}. Starting fresh.")
+            self.posts_collected = []
+            self.comments_collected = []
+            self._posts_flushed = 0
+            self._comments_flushed = 0
+            self._reset_index()
+    
+    def _load_legacy_checkpoint(self):
+        """Resume from CSV checkpoints written by earlier versions of this script"""
+        if not Path('data/raw/posts_checkpoint.csv').exists():
+            return
+        
+        try:
+            df_posts = pd.read_csv('data/raw/posts_checkpoint.csv')
+            self.posts_collected = df_posts.to_dict('records')
+            
+            if Path('data/raw/comments_checkpoint.csv').exists():
+                df_comments = pd.read_csv('data/raw/comments_checkpoint.csv')
+                self.comments_collected = df_comments.to_dict('records')
+            self._index_records(self.posts_collected, self.comments_collected)
+            
+            # Nothing flushed yet: the next checkpoint migrates them into segments
+            self.logger.info(f"Loaded {len(self.posts_collected)} posts and "
+                           f"{len(self.comments_collected)} comments from legacy CSV checkpoint")
+        
+        except Exception as e:
+            self.logger.warning(f"Failed to load legacy checkpoint: {e}. Starting fresh.")
+            self.posts_collected = []
+            self.comments_collected = []
+            self._reset_index()
+    
+    def _reset_index(self):
+        """Drop indexed ids that belonged to a discarded checkpoint"""
+        self.id_index.reset()
+        if self.incremental:
+            self._load_incremental_baseline()
+    
+    def _index_records(self, posts, comments):
+        """Add post and comment records to the id index (uncommitted)"""
+        self.id_index.add('post', {p['post_id']: p.get('num_comments') for p in posts})
+        self.id_index.add('comment', (c['comment_id'] for c in comments))
+    
+    @staticmethod
+    def _outputs_signature():
+        """Size and mtime of data/raw outputs, used to detect files the index has not seen"""
+        signature = {}
+        for path in (Path('data/raw/posts.csv'), Path('data/raw/comments.csv')):
+            if path.exists():
+                stat = path.stat()
+                signature[path.name] = [stat.st_size, stat.st_mtime_ns]
+        return json.dumps(signature, sort_keys=True)
+    
+    def _load_incremental_baseline(self):
+        """Make sure the id index covers the posts and comments held from earlier runs"""
+        signature = self._outputs_signature()
+        
+        # The index is normally synced by save_final_data; reseed if the files changed since
+        if self.id_index.get_meta('outputs_signature') != signature:
+            posts_path = Path('data/raw/posts.csv')
+            comments_path = Path('data/raw/comments.csv')
+            if posts_path.exists():
+                df_posts = pd.read_csv(posts_path, usecols=['post_id', 'num_comments'])
+                # Blank counts (e.g. null in an ingested dump) read back as NaN
+                num_comments = pd.to_numeric(df_posts['num_comments'], errors='coerce').fillna(0).astype(int)
+                self.id_index.add('post', dict(zip(df_posts['post_id'], num_comments)))
+            if comments_path.exists():
+                df_comments = pd.read_csv(comments_path, usecols=['comment_id'])
+                self.id_index.add('comment', df_comments['comment_id'])
+            self.id_index.set_meta('outputs_signature', signature)
+            self.id_index.commit()
+            self.logger.info(f"Seeded id index from {posts_path} and {comments_path}")
+        
+        self.logger.info(f"Incremental mode: {self.id_index.count('post'):,} posts and "
+                         f"{self.id_index.count('comment'):,} comments already held")
+    
+    def _save_checkpoint(self):
+        """Append records collected since the last checkpoint"""
+        try:
+            with self._records_lock:
+                new_posts = self.posts_collected[self._posts_flushed:]
+                new_comments = self.comments_collected[self._comments_flushed:]
+                
+                self.checkpoint_store.append('posts', new_posts)
+                self.checkpoint_store.append('comments', new_comments)
+                self.checkpoint_store.commit(
+                    timestamp=datetime.now().isoformat(),
+                    posts_count=self._posts_flushed + len(new_posts),
+                    comments_count=self._comments_flushed + len(new_comments),
+                    total_errors=self.total_errors,
+                    runtime_minutes=(datetime.now() - self.start_time).total_seconds() / 60,
+                    comment_count_updates=self.comment_count_updates
+                )
+                self.id_index.commit()  # Only after the records it covers are durable
+                
+                self._posts_flushed += len(new_posts)
+                self._comments_flushed += len(new_comments)
             
             self.last_save_time = datetime.now()
             self.logger.info(f"Checkpoint saved: {len(self.posts_collected)} posts, "
-                           f"{len(self.comments_collected)} comments")
+                           f"{len(self.comments_collected)} comments "
+                           f"(+{len(new_posts)} posts, +{len(new_comments)} comments)")
             
         except Exception as e:
             self.logger.error(f"Failed to save checkpoint: {e}")
     
-    def _respect_rate_limit(self):
-        """Adaptive rate limiting with backoff"""
-        self.requests_count += 1
-        
-        # Check if we should slow down based on requests per minute
-        elapsed = time.time() - self.requests_start_time
-        if elapsed >= 60:
-            requests_per_minute = self.requests_count / (elapsed / 60)
-            if requests_per_minute > self.max_requests_per_minute:
-                self.logger.warning(f"Rate limit approaching ({requests_per_minute:.1f} req/min). Slowing down...")
-                self.request_delay = min(self.request_delay * 1.5, 5.0)
-            
-            # Reset counter
-            self.requests_count = 0
-            self.requests_start_time = time.time()
+    def _api_error_wait_time(self, error, context=""):
+        """
+        Classify an API error and decide how long to back off
         
-        # Base delay between requests
-        time.sleep(self.request_delay)
-    
-    def _handle_api_error(self, error, context=""):
-        """Handle API errors with exponential backoff"""
+        Args:
+            error: Exception raised by the API call
+            context: Description of the failed operation (for logging)
+        
+        Returns:
+            float: Seconds to wait before retrying, or None to stop
+        """
         self.consecutive_errors += 1
         self.total_errors += 1
         
         error_str = str(error).lower()
         
-        # Check for rate limiting
-        if 'rate limit' in error_str or '429' in error_str:
-            wait_time = min(60 * (2 ** self.consecutive_errors), 600)  # Max 10 minutes
-            self.logger.warning(f"Rate limit hit. Waiting {wait_time} seconds...")
-            time.sleep(wait_time)
-            return True  # Can retry
+        # Rate limiting: the 429 response already paused the shared rate limiter
+        # until the quota resets, so the retry simply queues behind it
+        if self._is_rate_limit_error(error):
+            self.logger.warning(f"Rate limit hit in {context}. Retrying once the quota resets...")
+            return 0
         
         # Check for server errors
         elif '500' in error_str or '502' in error_str or '503' in error_str:
             wait_time = min(30 * (2 ** self.consecutive_errors), 300)  # Max 5 minutes
             self.logger.warning(f"Server error. Waiting {wait_time} seconds...")
-            time.sleep(wait_time)
-            return True  # Can retry
+            return wait_time
         
         # Check for timeout
         elif 'timeout' in error_str or 'timed out' in error_str:
             self.logger.warning(f"Timeout error in {context}. Retrying...")
-            time.sleep(10)
-            return True  # Can retry
+            return 10
         
         # Check if we should stop due to too many errors
         elif self.consecutive_errors >= self.max_consecutive_errors:
             self.logger.error(f"Too many consecutive errors ({self.consecutive_errors}). Stopping collection.")
             self.should_stop = True
-            return False  # Stop
+            return None
         
         else:
             self.logger.error(f"Error in {context}: {error}")
-            time.sleep(5)
-            return True  # Can retry for unknown errors
+            return 5
+    
+    @staticmethod
+    def _is_rate_limit_error(error):
+        """Check whether an exception is a 429 response"""
+        if isinstance(error, prawcore.exceptions.TooManyRequests):
+            return True
+        return (asyncprawcore is not None
+                and isinstance(error, asyncprawcore.exceptions.TooManyRequests))
+    
+    def _handle_api_error(self, error, context=""):
+        """Handle API errors with exponential backoff"""
+        wait_time = self._api_error_wait_time(error, context)
+        if wait_time is None:
+            return False  # Stop
+        if wait_time > 0:
+            self._sleep(wait_time)
+        return True  # Can retry
     
     def get_post_data(self, submission):
         """Extract data from Reddit submission with error handling"""
@@ -248,6 +462,19 @@ class RedditScraper:
             self.logger.warning(f"Error extracting post data: {e}")
             return None
     
+    def _comment_to_record(self, comment, post_id):
+        """Convert a Reddit comment into a flat record"""
+        return {
+            'comment_id': comment.id,
+            'post_id': post_id,
+            'author': str(comment.author) if comment.author else '[deleted]',
+            'body': comment.body,
+            'score': comment.score,
+            'created_utc': datetime.fromtimestamp(comment.created_utc).isoformat(),
+            'parent_id': comment.parent_id,
+            'collected_at': datetime.now().isoformat()
+        }
+    
     def get_comments(self, submission, max_comments=100):
         """Extract comments from post with enhanced error handling"""
         comments = []
@@ -260,17 +487,7 @@ class RedditScraper:
                 for comment in submission.comments.list()[:max_comments]:
                     try:
                         if isinstance(comment, praw.models.Comment):
-                            comment_data = {
-                                'comment_id': comment.id,
-                                'post_id': submission.id,
-                                'author': str(comment.author) if comment.author else '[deleted]',
-                                'body': comment.body,
-                                'score': comment.score,
-                                'created_utc': datetime.fromtimestamp(comment.created_utc).isoformat(),
-                                'parent_id': comment.parent_id,
-                                'collected_at': datetime.now().isoformat()
-                            }
-                            comments.append(comment_data)
+                            comments.append(self._comment_to_record(comment, submission.id))
                     except Exception as e:
                         continue
                 
@@ -290,7 +507,8 @@ class RedditScraper:
         
         return comments
     
-    def search_subreddit(self, subreddit_name, keyword=None, limit=1000, method='search'):
+    def search_subreddit(self, subreddit_name, keyword=None, limit=1000, method='search',
+                         newer_than=None, reddit=None):
         """
         Search subreddit with multiple collection methods
         
@@ -299,22 +517,28 @@ class RedditScraper:
             keyword: Search keyword (for search method)
             limit: Maximum posts to collect
             method: 'search', 'hot', 'top', 'new'
+            newer_than: Stop paging at the first submission created at or before
+                this UTC timestamp (chronological listings only)
+            reddit: praw client to use (defaults to self.reddit)
         
         Returns:
             list: List of submissions
         """
         max_retries = 3
+        reddit = reddit or self.reddit
         
         for attempt in range(max_retries):
             try:
-                subreddit = self.reddit.subreddit(subreddit_name)
+                subreddit = reddit.subreddit(subreddit_name)
                 data_config = self.config['data_collection']
                 
                 if method == 'search' and keyword:
+                    search_kwargs = {'sort': 'new'} if self.incremental else {}
                     submissions = subreddit.search(
                         keyword,
                         time_filter=data_config.get('time_filter', 'all'),
-                        limit=limit
+                        limit=limit,
+                        **search_kwargs
                     )
                 elif method == 'hot':
                     submissions = subreddit.hot(limit=limit)
@@ -329,7 +553,15 @@ class RedditScraper:
                     submissions = subreddit.hot(limit=limit)
                 
                 # Convert to list to catch errors early
-                submission_list = list(submissions)
+                if newer_than is None:
+                    submission_list = list(submissions)
+                else:
+                    # Listings page lazily, so breaking here stops further requests
+                    submission_list = []
+                    for submission in submissions:
+                        if submission.created_utc <= newer_than:
+                            break
+                        submission_list.append(submission)
                 self.consecutive_errors = 0  # Reset on success
                 return submission_list
             
@@ -344,35 +576,128 @@ class RedditScraper:
         
         return []
     
-    def collect_data(self, target_posts=10000, max_runtime_hours=8):
+    def _listing_limit(self, target_posts):
+        """Number of submissions to request from a single listing"""
+        if self.incremental:
+            # Paging stops at the watermark, so allow walking deep listings
+            return self.incremental_config.get('max_listing_size', 1000)
+        posts_per_request = min(100, (target_posts - len(self.posts_collected)) // 10)
+        return max(50, posts_per_request)  # At least 50
+    
+    def _iter_work_plan(self):
         """
-        Main collection function with multiple strategies
+        Yield (subreddit, method, keyword) combinations in collection order
         
-        Args:
-            target_posts: Target number of posts to collect
-            max_runtime_hours: Maximum hours to run
+        Regular runs rotate through all methods indefinitely. Incremental runs
+        make a single pass over every chronological listing.
         """
         data_config = self.config['data_collection']
         subreddits = data_config['subreddits']
         keywords = data_config['keywords']
         
-        self.logger.info("=" * 80)
-        self.logger.info("REDDIT DATA COLLECTION")
-        self.logger.info("=" * 80)
-        self.logger.info(f"Target posts: {target_posts}")
-        self.logger.info(f"Max runtime: {max_runtime_hours} hours")
-        self.logger.info(f"Subreddits: {subreddits}")
-        self.logger.info(f"Keywords: {keywords}")
-        self.logger.info(f"Starting with {len(self.posts_collected)} existing posts")
-        self.logger.info("=" * 80)
+        if self.incremental:
+            for method in self.incremental_config.get('methods', ['new', 'search']):
+                if method not in ('new', 'search'):
+                    self.logger.warning(f"Skipping non-chronological method '{method}' in incremental mode")
+                    continue
+                for subreddit in subreddits:
+                    if method == 'search':
+                        for keyword in keywords:
+                            yield subreddit, method, keyword
+                    else:
+                        yield subreddit, method, None
+            return
         
-        max_runtime = timedelta(hours=max_runtime_hours)
         collection_methods = ['search', 'hot', 'top', 'new']
-        
-        # Main collection loop
         method_index = 0
         subreddit_index = 0
         
+        while True:
+            subreddit = subreddits[subreddit_index % len(subreddits)]
+            method = collection_methods[method_index % len(collection_methods)]
+            
+            # Cycle through keywords for search method
+            if method == 'search':
+                keyword = keywords[(subreddit_index + method_index) % len(keywords)]
+            else:
+                keyword = None
+            
+            yield subreddit, method, keyword
+            
+            # Move to next combination
+            subreddit_index += 1
+            if subreddit_index % len(subreddits) == 0:
+                method_index += 1
+    
+    def _listing_cutoff(self, subreddit, method, keyword):
+        """created_utc watermark to stop paging at, or None for a full walk"""
+        if not self.incremental:
+            return None
+        watermark = self.watermarks.get(subreddit, method, keyword)
+        return watermark['created_utc'] if watermark else None
+    
+    def _finish_listing(self, subreddit, method, keyword, complete):
+        """
+        Advance a listing's watermark after its walk (incremental mode only)
+        
+        Args:
+            complete: Whether paging reached the old watermark or the end of the
+                      listing; a walk cut short keeps the old watermark so the
+                      next run collects the posts in between
+        """
+        if not self.incremental:
+            return
+        self.watermarks.finish_listing(subreddit, method, keyword, complete)
+        if not complete:
+            self.logger.info(f"Keeping the r/{subreddit} ({method}{f', {keyword!r}' if keyword else ''}) "
+                             f"watermark: paging stopped before reaching it")
+    
+    def _needs_comment_refresh(self, submission, known_count):
+        """Check whether an already collected post has new comments (incremental mode only)"""
+        return self.incremental and submission.num_comments > (known_count or 0)
+    
+    def _register_post(self, submission, post_data):
+        """Keep a new post and index it"""
+        with self._records_lock:
+            self.posts_collected.append(post_data)
+            self.id_index.add('post', {submission.id: submission.num_comments})
+    
+    def _register_comments(self, comments):
+        """Keep comments of a new post and index them"""
+        with self._records_lock:
+            self.comments_collected.extend(comments)
+            self.id_index.add('comment', (c['comment_id'] for c in comments))
+    
+    def _record_comment_delta(self, submission, comments):
+        """Keep only comments not held yet and remember the new comment count"""
+        with self._records_lock:
+            new_ids = set(self.id_index.filter_new('comment', (c['comment_id'] for c in comments)))
+            new_comments = [c for c in comments if c['comment_id'] in new_ids]
+            self._register_comments(new_comments)
+            self.id_index.add('post', {submission.id: submission.num_comments})
+            self.comment_count_updates[submission.id] = submission.num_comments
+        return len(new_comments)
+    
+    def _should_stop_collecting(self, target_posts, max_runtime):
+        """Check stopping conditions shared by concurrent workers"""
+        return (self.should_stop
+                or len(self.posts_collected) >= target_posts
+                or datetime.now() - self.start_time > max_runtime)
+    
+    def collect_data(self, target_posts=10000, max_runtime_hours=8):
+        """
+        Main collection function with multiple strategies
+        
+        Args:
+            target_posts: Target number of posts to collect
+            max_runtime_hours: Maximum hours to run
+        """
+        self._log_collection_start(target_posts, max_runtime_hours)
+        
+        max_runtime = timedelta(hours=max_runtime_hours)
+        work_plan = self._iter_work_plan()
+        
+        # Main collection loop
         while not self.should_stop:
             # Check stopping conditions
             if len(self.posts_collected) >= target_posts:
@@ -389,79 +714,133 @@ class RedditScraper:
                 self._print_progress(target_posts)
             
             # Get current collection parameters
-            subreddit = subreddits[subreddit_index % len(subreddits)]
-            method = collection_methods[method_index % len(collection_methods)]
+            next_listing = next(work_plan, None)
+            if next_listing is None:
+                self.logger.info("Incremental pass complete: all listings are up to date")
+                break
+            subreddit, method, keyword = next_listing
             
-            # Cycle through keywords for search method
-            if method == 'search':
-                keyword = keywords[(subreddit_index + method_index) % len(keywords)]
-                self.logger.info(f"\nSearching r/{subreddit} for '{keyword}' using {method} method...")
-            else:
-                keyword = None
-                self.logger.info(f"\nCollecting from r/{subreddit} using {method} method...")
+            self._process_listing(subreddit, method, keyword, target_posts)
             
-            try:
-                # Get submissions
-                posts_per_request = min(100, (target_posts - len(self.posts_collected)) // 10)
-                posts_per_request = max(50, posts_per_request)  # At least 50
-                
-                submissions = self.search_subreddit(
-                    subreddit,
-                    keyword=keyword,
-                    limit=posts_per_request,
-                    method=method
-                )
-                
-                self.logger.info(f"Found {len(submissions)} submissions")
+            # Brief pause between batches
+            if not self.should_stop and self.batch_pause_seconds > 0:
+                self._sleep(self.batch_pause_seconds)
+        
+        self._log_collection_end()
+    
+    def _process_listing(self, subreddit, method, keyword, target_posts, reddit=None, expander=None):
+        """
+        Collect new posts of one listing and their comments
+        
+        Args:
+            subreddit: Subreddit name
+            method: Listing method
+            keyword: Search keyword (search method only)
+            target_posts: Target number of posts, used to size the listing
+            reddit: praw client to use (defaults to self.reddit)
+            expander: CommentTreeExpander bound to that client (defaults to self.comment_expander)
+        
+        Returns:
+            tuple: (new posts, new comments)
+        """
+        expander = expander or self.comment_expander
+        
+        if method == 'search':
+            self.logger.info(f"\nSearching r/{subreddit} for '{keyword}' using {method} method...")
+        else:
+            self.logger.info(f"\nCollecting from r/{subreddit} using {method} method...")
+        
+        new_posts_count = 0
+        new_comments_count = 0
+        complete = False  # Paging reached the watermark or the end of the listing
+        
+        try:
+            # Get submissions
+            posts_per_request = self._listing_limit(target_posts)
+            
+            submissions = self.search_subreddit(
+                subreddit,
+                keyword=keyword,
+                limit=posts_per_request,
+                method=method,
+                newer_than=self._listing_cutoff(subreddit, method, keyword),
+                reddit=reddit
+            )
+            
+            self.logger.info(f"Found {len(submissions)} submissions")
+            
+            # Register new posts; comments are fetched for the whole listing at once
+            new_submissions = []
+            refresh_submissions = []
+            # A full page means the listing size cap may have cut the walk short
+            complete = len(submissions) < posts_per_request
+            for submission in submissions:
+                if self.should_stop:
+                    complete = False
+                    break
                 
-                new_posts_count = 0
-                new_comments_count = 0
+                if self.incremental:
+                    self.watermarks.observe(subreddit, method, keyword,
+                                            submission.created_utc, submission.fullname)
                 
-                # Process submissions
-                for submission in tqdm(submissions, desc=f"r/{subreddit}", leave=False):
-                    if self.should_stop:
-                        break
-                    
-                    # Skip duplicates
-                    if submission.id in self.collected_post_ids:
+                with self._records_lock:
+                    # Skip duplicates; posts held from earlier runs only get comment deltas
+                    known, known_count = self.id_index.get('post', submission.id)
+                    if known:
+                        if self._needs_comment_refresh(submission, known_count):
+                            submission.comment_sort = 'new'  # Newest comments first
+                            refresh_submissions.append(submission)
                         continue
                     
-                    try:
-                        # Get post data
-                        post_data = self.get_post_data(submission)
-                        if post_data:
-                            self.posts_collected.append(post_data)
-                            self.collected_post_ids.add(submission.id)
-                            new_posts_count += 1
-                            
-                            # Get comments
-                            comments = self.get_comments(submission, max_comments=100)
-                            if comments:
-                                self.comments_collected.extend(comments)
-                                new_comments_count += len(comments)
-                        
-                        # Rate limiting
-                        self._respect_rate_limit()
-                    
-                    except Exception as e:
-                        self.logger.warning(f"Error processing submission {submission.id}: {e}")
-                        continue
-                
-                self.logger.info(f"Collected {new_posts_count} new posts, {new_comments_count} new comments")
-                
-            except Exception as e:
-                self.logger.error(f"Error in collection loop: {e}")
-                self.logger.error(traceback.format_exc())
+                    # Get post data
+                    post_data = self.get_post_data(submission)
+                    if post_data:
+                        self._register_post(submission, post_data)
+                        new_posts_count += 1
+                        new_submissions.append(submission)
             
-            # Move to next combination
-            subreddit_index += 1
-            if subreddit_index % len(subreddits) == 0:
-                method_index += 1
+            # Get comments, expanding MoreComments by expected yield across the listing
+            comments_by_post = expander.fetch(
+                new_submissions + refresh_submissions,
+                should_stop=lambda: self.should_stop
+            )
+            for submission in new_submissions:
+                comments = comments_by_post.get(submission.id, [])
+                if comments:
+                    self._register_comments(comments)
+                    new_comments_count += len(comments)
+                    self.consecutive_errors = 0
+            for submission in refresh_submissions:
+                new_comments_count += self._record_comment_delta(
+                    submission, comments_by_post.get(submission.id, [])
+                )
             
-            # Brief pause between batches
-            if not self.should_stop:
-                time.sleep(5)
+            self.logger.info(f"Collected {new_posts_count} new posts, {new_comments_count} new comments")
+            
+        except Exception as e:
+            complete = False
+            self.logger.error(f"Error in collection loop: {e}")
+            self.logger.error(traceback.format_exc())
         
+        self._finish_listing(subreddit, method, keyword, complete)
+        return new_posts_count, new_comments_count
+    
+    def _log_collection_start(self, target_posts, max_runtime_hours):
+        """Log collection parameters"""
+        data_config = self.config['data_collection']
+        
+        self.logger.info("=" * 80)
+        self.logger.info("REDDIT DATA COLLECTION")
+        self.logger.info("=" * 80)
+        self.logger.info(f"Target posts: {target_posts}")
+        self.logger.info(f"Max runtime: {max_runtime_hours} hours")
+        self.logger.info(f"Subreddits: {data_config['subreddits']}")
+        self.logger.info(f"Keywords: {data_config['keywords']}")
+        self.logger.info(f"Starting with {len(self.posts_collected)} existing posts")
+        self.logger.info("=" * 80)
+    
+    def _log_collection_end(self):
+        """Log collection totals"""
         self.logger.info("=" * 80)
         self.logger.info("Collection loop ended")
         self.logger.info(f"Total posts collected: {len(self.posts_collected)}")
@@ -484,22 +863,43 @@ class RedditScraper:
         self.logger.info(f"Runtime: {runtime.total_seconds() / 3600:.2f} hours")
         self.logger.info(f"Collection rate: {posts_per_hour:.1f} posts/hour")
         self.logger.info(f"Total errors: {self.total_errors}")
-        self.logger.info(f"Current delay: {self.request_delay:.2f}s")
+        self._log_rate_limit_metrics()
+        expansion_stats = self._comment_expansion_stats()
+        self.logger.info(f"Comment requests: {expansion_stats['tree_requests']:,} trees, "
+                         f"{expansion_stats['morechildren_requests']:,} morechildren batches")
         self.logger.info("=" * 80 + "\n")
     
+    def _rate_limit_report(self):
+        """Rate limiter metrics for the collection report"""
+        return self.rate_limiter.get_metrics()
+    
+    def _comment_expansion_stats(self):
+        """Comment expander counters for progress logs and the report"""
+        return dict(self.comment_expander.stats)
+    
+    def _log_rate_limit_metrics(self, rate_limiter=None, label=''):
+        """Log tokens used versus available"""
+        metrics = (rate_limiter or self.rate_limiter).get_metrics()
+        self.logger.info(f"{label}API requests: {metrics['tokens_used']:,} "
+                         f"(tokens available: {metrics['tokens_available']:.1f}/{metrics['capacity']:.0f}, "
+                         f"refill: {metrics['refill_rate_per_minute']:.1f}/min)")
+        if metrics['server_remaining'] is not None:
+            self.logger.info(f"{label}Reddit quota: {metrics['server_remaining']:.0f} remaining, "
+                             f"resets in {metrics['server_reset_in_seconds']:.0f}s")
+        self.logger.info(f"{label}Rate limit waits: {metrics['wait_seconds']:.1f}s over {metrics['wait_events']} waits, "
+                         f"{metrics['rate_limited_responses']} 429 responses")
+    
     def save_final_data(self):
         """Save final collected data"""
         self.logger.info("Saving final data...")
         
-        # Convert to DataFrames
-        df_posts = pd.DataFrame(self.posts_collected)
-        df_comments = pd.DataFrame(self.comments_collected)
+        # Flush the tail and compact segments (duplicates removed by id)
+        self._save_checkpoint()
+        df_posts = pd.DataFrame(self.checkpoint_store.compact('posts', key='post_id'))
+        df_comments = pd.DataFrame(self.checkpoint_store.compact('comments', key='comment_id'))
         
-        # Remove duplicates (just in case)
-        if len(df_posts) > 0:
-            df_posts = df_posts.drop_duplicates(subset=['post_id'], keep='first')
-        if len(df_comments) > 0:
-            df_comments = df_comments.drop_duplicates(subset=['comment_id'], keep='first')
+        if self.incremental:
+            df_posts, df_comments = self._merge_with_existing(df_posts, df_comments)
         
         # Save posts
         posts_path = 'data/raw/posts.csv'
@@ -511,19 +911,54 @@ class RedditScraper:
         save_dataframe(df_comments, comments_path, format='csv')
         self.logger.info(f"Saved {len(df_comments)} comments to {comments_path}")
         
+        # The index now mirrors the output files
+        self.id_index.set_meta('outputs_signature', self._outputs_signature())
+        self.id_index.commit()
+        
+        # Data is on disk: incremental watermarks can advance
+        if self.incremental:
+            self.watermarks.save()
+            self.logger.info(f"Saved watermarks to {self.watermarks.path}")
+        
         # Generate collection report
         self._generate_report(df_posts, df_comments)
         
         # Clean up checkpoint files
         self.logger.info("Cleaning up checkpoint files...")
         try:
+            self.checkpoint_store.clear()
             Path('data/raw/posts_checkpoint.csv').unlink(missing_ok=True)
             Path('data/raw/comments_checkpoint.csv').unlink(missing_ok=True)
-            Path(self.checkpoint_file).unlink(missing_ok=True)
             self.logger.info("Checkpoint files removed")
         except Exception as e:
             self.logger.warning(f"Failed to remove checkpoint files: {e}")
     
+    def _merge_with_existing(self, df_posts, df_comments):
+        """
+        Append an incremental run's results to the data held from earlier runs
+        
+        Returns:
+            tuple: (merged posts DataFrame, merged comments DataFrame)
+        """
+        posts_path = Path('data/raw/posts.csv')
+        comments_path = Path('data/raw/comments.csv')
+        
+        if posts_path.exists():
+            existing_posts = pd.read_csv(posts_path)
+            if self.comment_count_updates:
+                updated = existing_posts['post_id'].map(self.comment_count_updates)
+                existing_posts['num_comments'] = updated.fillna(existing_posts['num_comments']).astype(int)
+            df_posts = pd.concat([existing_posts, df_posts], ignore_index=True)
+            df_posts = df_posts.drop_duplicates(subset=['post_id'], keep='first')
+        
+        if comments_path.exists():
+            existing_comments = pd.read_csv(comments_path)
+            df_comments = pd.concat([existing_comments, df_comments], ignore_index=True)
+            df_comments = df_comments.drop_duplicates(subset=['comment_id'], keep='first')
+        
+        self.logger.info(f"Merged with existing data: {len(df_posts)} posts, {len(df_comments)} comments")
+        return df_posts, df_comments
+    
     def _generate_report(self, df_posts, df_comments):
         """Generate comprehensive collection report"""
         runtime = datetime.now() - self.start_time
@@ -535,6 +970,10 @@ class RedditScraper:
             'total_posts': len(df_posts),
             'total_comments': len(df_comments),
             'total_errors': self.total_errors,
+            'rate_limit': self._rate_limit_report(),
+            'backoff_sleep_seconds': self.sleep_seconds,
+            'comment_expansion': self._comment_expansion_stats(),
+            'id_index': self.id_index.get_metrics(),
             'subreddits': self.config['data_collection']['subreddits'],
             'keywords': self.config['data_collection']['keywords'],
             'collection_rate': {
@@ -579,6 +1018,392 @@ class RedditScraper:
         self.logger.info("=" * 80)
 
 
+class PooledRedditScraper(RedditScraper):
+    """
+    Reddit scraper that shards the work plan across several OAuth apps
+    
+    Every credential set gets its own praw client, token-bucket rate limiter
+    and comment expander, driven by its own worker thread that pulls the next
+    (subreddit, method, keyword) listing from the shared work plan. Records go
+    into the shared collections and id index, so a post claimed by one client
+    is skipped by the others and the output is one deduplicated dataset.
+    """
+    
+    def __init__(self, config, checkpoint_file='data/raw/checkpoint.json', incremental=False):
+        """
+        Initialize client pool
+        
+        Args:
+            config: Configuration dictionary (extra apps under reddit.credentials)
+            checkpoint_file: Path to checkpoint file for resuming
+            incremental: Only collect content newer than the stored watermarks
+        """
+        self.clients = []
+        super().__init__(config, checkpoint_file=checkpoint_file, incremental=incremental)
+        
+        expansion_config = config['data_collection'].get('comment_expansion', {})
+        for client in self.clients:
+            client['expander'] = CommentTreeExpander(
+                client['reddit'],
+                record_builder=self._comment_to_record,
+                error_handler=self._handle_api_error,
+                logger=self.logger,
+                config=expansion_config,
+                known_filter=lambda ids: self.id_index.filter_new('comment', ids)
+            )
+        self.comment_expander = self.clients[0]['expander']
+    
+    def _initialize_reddit(self):
+        """Connect one client per credential set, each with its own rate limiter"""
+        for i, credentials in enumerate(self._credential_pool()):
+            rate_limiter = self.rate_limiter if i == 0 else self._create_rate_limiter()
+            self.clients.append({
+                'name': f"client_{i + 1}",
+                'reddit': self._connect(rate_limiter, credentials),
+                'rate_limiter': rate_limiter,
+                'listings': 0
+            })
+        self.reddit = self.clients[0]['reddit']
+    
+    def _rate_limit_report(self):
+        """Request and wait totals across the pool plus per-client limiter metrics"""
+        clients = {c['name']: c['rate_limiter'].get_metrics() for c in self.clients}
+        totals = {}
+        for key in ('tokens_used', 'wait_seconds', 'wait_events', 'rate_limited_responses', 'header_updates'):
+            totals[key] = sum(metrics[key] for metrics in clients.values())
+        for name, client in zip(clients, self.clients):
+            clients[name]['listings'] = client['listings']
+        totals['clients'] = clients
+        return totals
+    
+    def _comment_expansion_stats(self):
+        """Comment expander counters summed across the pool"""
+        stats = {}
+        for client in self.clients:
+            for key, value in client['expander'].stats.items():
+                stats[key] = stats.get(key, 0) + value
+        return stats
+    
+    def _log_rate_limit_metrics(self):
+        """Log tokens used versus available for every client"""
+        for client in self.clients:
+            super()._log_rate_limit_metrics(client['rate_limiter'], label=f"[{client['name']}] ")
+    
+    def _run_client(self, client, next_listing, target_posts, max_runtime):
+        """Worker loop: collect listings with one client until the plan or the run ends"""
+        while not self._should_stop_collecting(target_posts, max_runtime):
+            listing = next_listing()
+            if listing is None:
+                return
+            subreddit, method, keyword = listing
+            self._process_listing(subreddit, method, keyword, target_posts,
+                                  reddit=client['reddit'], expander=client['expander'])
+            client['listings'] += 1
+            
+            # Brief pause between batches
+            if not self.should_stop and self.batch_pause_seconds > 0:
+                self._sleep(self.batch_pause_seconds)
+    
+    def collect_data(self, target_posts=10000, max_runtime_hours=8):
+        """
+        Sharded collection with the same stopping conditions as RedditScraper
+        
+        Args:
+            target_posts: Target number of posts to collect
+            max_runtime_hours: Maximum hours to run
+        """
+        self._log_collection_start(target_posts, max_runtime_hours)
+        self.logger.info(f"Client pool: {len(self.clients)} OAuth apps")
+        
+        max_runtime = timedelta(hours=max_runtime_hours)
+        work_plan = self._iter_work_plan()
+        plan_lock = threading.Lock()
+        
+        def next_listing():
+            with plan_lock:
+                return next(work_plan, None)
+        
+        with ThreadPoolExecutor(max_workers=len(self.clients), thread_name_prefix='reddit_client') as pool:
+            pending = {pool.submit(self._run_client, client, next_listing, target_posts, max_runtime)
+                       for client in self.clients}
+            
+            # The main thread keeps handling signals and checkpoints while workers run
+            while pending:
+                done, pending = wait(pending, timeout=5, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future.exception() is not None:
+                        self.logger.error(f"Error in collection worker: {future.exception()}")
+                
+                if (datetime.now() - self.last_save_time).total_seconds() > self.save_interval_minutes * 60:
+                    self._save_checkpoint()
+                    self._print_progress(target_posts)
+        
+        if len(self.posts_collected) >= target_posts:
+            self.logger.info(f"Target reached: {len(self.posts_collected)} posts collected")
+        elif datetime.now() - self.start_time > max_runtime:
+            self.logger.info(f"Max runtime reached: {(datetime.now() - self.start_time).total_seconds() / 3600:.1f} hours")
+        elif self.incremental and not self.should_stop:
+            self.logger.info("Incremental pass complete: all listings are up to date")
+        
+        self._log_collection_end()
+
+
+class AsyncRedditScraper(RedditScraper):
+    """
+    Concurrent Reddit scraper built on asyncpraw
+    
+    Keeps several listing fetches and comment-tree fetches in flight at once
+    instead of serializing every round trip. Every request still draws from
+    the shared token-bucket rate limiter, so the global budget is respected.
+    """
+    
+    def __init__(self, config, checkpoint_file='data/raw/checkpoint.json', incremental=False):
+        """
+        Initialize concurrent scraper
+        
+        Args:
+            config: Configuration dictionary
+            checkpoint_file: Path to checkpoint file for resuming
+            incremental: Only collect content newer than the stored watermarks
+        """
+        if asyncpraw is None:
+            raise ImportError("asyncpraw is required for concurrent collection. "
+                              "Install it with: pip install asyncpraw")
+        
+        super().__init__(config, checkpoint_file=checkpoint_file, incremental=incremental)
+        
+        async_config = config['data_collection'].get('async_collection', {})
+        self.max_concurrent_listings = async_config.get('max_concurrent_listings', 4)
+        self.max_concurrent_comment_fetches = async_config.get('max_concurrent_comment_fetches', 16)
+    
+    def _initialize_reddit(self):
+        """Defer client creation: asyncpraw clients must be created inside the event loop"""
+        self.reddit = None
+    
+    def _create_async_client(self):
+        """Create the asyncpraw client for the running event loop"""
+        return asyncpraw.Reddit(
+            **self._client_settings(),
+            requestor_class=AsyncRateLimitedRequestor,
+            requestor_kwargs={'rate_limiter': self.rate_limiter}
+        )
+    
+    async def _handle_api_error_async(self, error, context=""):
+        """Non-blocking counterpart of _handle_api_error"""
+        wait_time = self._api_error_wait_time(error, context)
+        if wait_time is None:
+            return False
+        if wait_time > 0:
+            await asyncio.sleep(wait_time)
+            self.sleep_seconds += wait_time
+        return True
+    
+    async def _open_listing(self, subreddit_name, keyword, limit, method):
+        """Create the async listing generator for a collection method"""
+        subreddit = await self.reddit.subreddit(subreddit_name)
+        data_config = self.config['data_collection']
+        time_filter = data_config.get('time_filter', 'all')
+        
+        if method == 'search' and keyword:
+            search_kwargs = {'sort': 'new'} if self.incremental else {}
+            return subreddit.search(keyword, time_filter=time_filter, limit=limit, **search_kwargs)
+        elif method == 'top':
+            return subreddit.top(time_filter=time_filter, limit=limit)
+        elif method == 'new':
+            return subreddit.new(limit=limit)
+        else:
+            return subreddit.hot(limit=limit)
+    
+    async def _get_comments_async(self, submission, max_comments=100):
+        """Fetch and flatten a submission's comment tree"""
+        comments = []
+        max_retries = 3
+        
+        for attempt in range(max_retries):
+            try:
+                await submission.load()
+                forest = submission.comments
+                await forest.replace_more(limit=2)
+                
+                for comment in forest.list()[:max_comments]:
+                    try:
+                        if isinstance(comment, asyncpraw.models.Comment):
+                            comments.append(self._comment_to_record(comment, submission.id))
+                    except Exception:
+                        continue
+                
+                if len(comments) > 0:
+                    self.consecutive_errors = 0
+                
+                return comments
+            
+            except Exception as e:
+                if attempt < max_retries - 1:
+                    can_retry = await self._handle_api_error_async(
+                        e, f"getting comments (attempt {attempt + 1})"
+                    )
+                    if not can_retry:
+                        break
+                else:
+                    self.logger.warning(f"Failed to get comments for post {submission.id} after {max_retries} attempts")
+        
+        return comments
+    
+    async def _collect_comments(self, submission, comment_semaphore, delta_only=False):
+        """Comment-tree fetch bounded by the comment concurrency limit"""
+        async with comment_semaphore:
+            if self.should_stop:
+                return
+            if delta_only:
+                submission.comment_sort = 'new'  # Newest comments first
+            comments = await self._get_comments_async(submission, max_comments=100)
+            if delta_only:
+                self._record_comment_delta(submission, comments)
+            elif comments:
+                self._register_comments(comments)
+    
+    async def _collect_listing(self, subreddit_name, method, keyword, target_posts,
+                               max_runtime, comment_semaphore):
+        """
+        Page through one listing and schedule comment fetches for new posts
+        
+        Returns:
+            tuple: (new posts, new comments) collected from this listing
+        """
+        posts_before = len(self.posts_collected)
+        comments_before = len(self.comments_collected)
+        limit = self._listing_limit(target_posts)
+        newer_than = self._listing_cutoff(subreddit_name, method, keyword)
+        comment_tasks = []
+        max_retries = 3
+        complete = False  # Paging reached the watermark or the end of the listing
+        
+        for attempt in range(max_retries):
+            try:
+                listing = await self._open_listing(subreddit_name, keyword, limit, method)
+                
+                seen = 0
+                async for submission in listing:
+                    if self._should_stop_collecting(target_posts, max_runtime):
+                        break
+                    
+                    # Stop paging once we reach content collected by earlier runs
+                    if newer_than is not None and submission.created_utc <= newer_than:
+                        complete = True
+                        break
+                    seen += 1
+                    if self.incremental:
+                        self.watermarks.observe(subreddit_name, method, keyword,
+                                                submission.created_utc, submission.fullname)
+                    
+                    # Posts are indexed immediately so concurrent listings skip them;
+                    # posts held from earlier runs only get comment deltas
+                    known, known_count = self.id_index.get('post', submission.id)
+                    if known:
+                        if self._needs_comment_refresh(submission, known_count):
+                            comment_tasks.append(asyncio.create_task(
+                                self._collect_comments(submission, comment_semaphore, delta_only=True)
+                            ))
+                        continue
+                    
+                    post_data = self.get_post_data(submission)
+                    if post_data:
+                        self._register_post(submission, post_data)
+                        comment_tasks.append(asyncio.create_task(
+                            self._collect_comments(submission, comment_semaphore)
+                        ))
+                else:
+                    # Exhausted: the end of the listing, unless the size cap ended it
+                    complete = seen < limit
+                
+                self.consecutive_errors = 0
+                break
+            
+            except Exception as e:
+                if attempt < max_retries - 1:
+                    can_retry = await self._handle_api_error_async(
+                        e, f"searching r/{subreddit_name} (attempt {attempt + 1})"
+                    )
+                    if not can_retry:
+                        break
+                else:
+                    self.logger.error(f"Failed to search r/{subreddit_name} after {max_retries} attempts")
+        
+        if comment_tasks:
+            await asyncio.gather(*comment_tasks, return_exceptions=True)
+        self._finish_listing(subreddit_name, method, keyword, complete)
+        
+        new_posts = len(self.posts_collected) - posts_before
+        new_comments = len(self.comments_collected) - comments_before
+        self.logger.info(f"r/{subreddit_name} ({method}{f', {keyword!r}' if keyword else ''}): "
+                         f"{new_posts} new posts, {new_comments} new comments")
+        return new_posts, new_comments
+    
+    async def _collect_data_async(self, target_posts, max_runtime_hours):
+        """Event-loop body of collect_data"""
+        self._log_collection_start(target_posts, max_runtime_hours)
+        self.logger.info(f"Concurrency: {self.max_concurrent_listings} listings, "
+                         f"{self.max_concurrent_comment_fetches} comment fetches")
+        
+        max_runtime = timedelta(hours=max_runtime_hours)
+        comment_semaphore = asyncio.Semaphore(self.max_concurrent_comment_fetches)
+        work_plan = self._iter_work_plan()
+        pending = set()
+        
+        self.reddit = self._create_async_client()
+        try:
+            while not self._should_stop_collecting(target_posts, max_runtime):
+                # Keep the listing pipeline full
+                while work_plan is not None and len(pending) < self.max_concurrent_listings:
+                    next_listing = next(work_plan, None)
+                    if next_listing is None:
+                        work_plan = None  # Incremental pass fully scheduled
+                        break
+                    subreddit, method, keyword = next_listing
+                    pending.add(asyncio.create_task(self._collect_listing(
+                        subreddit, method, keyword, target_posts, max_runtime, comment_semaphore
+                    )))
+                
+                if not pending:
+                    self.logger.info("Incremental pass complete: all listings are up to date")
+                    break
+                
+                done, pending = await asyncio.wait(
+                    pending, timeout=30, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is not None:
+                        self.logger.error(f"Error in collection task: {task.exception()}")
+                
+                if (datetime.now() - self.last_save_time).total_seconds() > self.save_interval_minutes * 60:
+                    self._save_checkpoint()
+                    self._print_progress(target_posts)
+            
+            if len(self.posts_collected) >= target_posts:
+                self.logger.info(f"Target reached: {len(self.posts_collected)} posts collected")
+            elif datetime.now() - self.start_time > max_runtime:
+                self.logger.info(f"Max runtime reached: {(datetime.now() - self.start_time).total_seconds() / 3600:.1f} hours")
+            
+            # Let in-flight listings finish their comment fetches
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+        finally:
+            await self.reddit.close()
+            self.reddit = None
+        
+        self._log_collection_end()
+    
+    def collect_data(self, target_posts=10000, max_runtime_hours=8):
+        """
+        Concurrent collection with the same stopping conditions as RedditScraper
+        
+        Args:
+            target_posts: Target number of posts to collect
+            max_runtime_hours: Maximum hours to run
+        """
+        asyncio.run(self._collect_data_async(target_posts, max_runtime_hours))
+
+
 def main():
     """Main execution function"""
     try:
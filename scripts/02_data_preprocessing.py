@@ -4,29 +4,51 @@ Cleans and prepares text data for analysis
 """
 
 import sys
+import copy
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 import pandas as pd
+import numpy as np
 import re
+import shutil
 import nltk
 import spacy
 from nltk.corpus import stopwords
 from nltk.stem import WordNetLemmatizer
+from collections import Counter, deque
+from itertools import chain
 from datetime import datetime
 import logging
 from tqdm import tqdm
-import pickle
+import random
 from utils import (
     setup_logger, 
     load_dataframe, 
     save_dataframe, 
     save_json,
+    iter_dataframe_chunks,
+    PartitionedParquetWriter,
+    merge_parquet_parts,
     clean_text as util_clean_text,
+    clean_texts,
+    hash_usernames,
     calculate_basic_stats
 )
+from token_cache import TokenCache
+from encoded_corpus import EncodedCorpus, EncodedCorpusWriter
+from near_duplicates import NearDuplicateDetector
+from lookup_lemmatizer import LookupLemmatizer
 from config.config_loader import ConfigLoader
 
+try:
+    import resource
+except ImportError:  # Not available on Windows; peak RSS is then not reported
+    resource = None
+
 # Ensure tqdm works with pandas
 tqdm.pandas()
 
@@ -34,15 +56,17 @@ tqdm.pandas()
 class TextPreprocessor:
     """Text preprocessing pipeline for Reddit data"""
     
-    def __init__(self, config):
+    def __init__(self, config, logger=None):
         """
         Initialize preprocessing tools
         
         Args:
             config: Configuration dictionary
+            logger: Logger to use (default: data_preprocessing, also writing a
+                    timestamped log file)
         """
         self.config = config
-        self.logger = setup_logger(
+        self.logger = logger or setup_logger(
             'data_preprocessing',
             f'logs/data_preprocessing_{datetime.now():%Y%m%d_%H%M%S}.log'
         )
@@ -53,10 +77,36 @@ class TextPreprocessor:
         self.max_word_length = self.preproc_config['max_word_length']
         self.min_post_length = self.preproc_config['min_post_length']
         
+        # Batched spaCy (nlp.pipe); n_process > 1 tags in worker processes, -1 uses every core
+        spacy_config = self.preproc_config.get('spacy', {})
+        self.batch_size = spacy_config.get('batch_size', 256)
+        self.n_process = spacy_config.get('n_process', 1)
+        if self.n_process == -1:
+            self.n_process = os.cpu_count() or 1
+        self.min_texts_per_process = spacy_config.get('min_texts_per_process', 5000)
+        
+        # Engine: 'spacy' (full tagger) or 'lookup' (regex tokenizer + lemma table)
+        self.engine = self.preproc_config.get('engine', 'spacy')
+        if self.engine not in ('spacy', 'lookup'):
+            raise ValueError(f"Unknown preprocessing engine: {self.engine}")
+        self.lookup_config = self.preproc_config.get('lookup', {})
+        self.lookup_lemmatizer = None
+        
         # Initialize NLP tools
         self.logger.info("Loading NLP models...")
         self._initialize_nlp_tools()
         self.logger.info("NLP models loaded successfully")
+        
+        # Token cache: only new or changed texts go through spaCy (the lookup engine needs none)
+        cache_config = self.preproc_config.get('token_cache', {})
+        self.token_cache = None
+        if self.engine == 'spacy' and cache_config.get('enabled', True):
+            self.token_cache = TokenCache(
+                cache_config.get('path', 'data/processed/token_cache.sqlite'),
+                fingerprint=TokenCache.make_fingerprint(self._token_settings())
+            )
+            self.logger.info(f"Token cache: {self.token_cache.count():,} entries "
+                             f"({self.token_cache.stats['invalidated_entries']:,} invalidated by settings changes)")
     
     def _initialize_nlp_tools(self):
         """Initialize spaCy and NLTK resources"""
@@ -87,6 +137,18 @@ class TextPreprocessor:
             self.logger.error(f"Error initializing NLP tools: {e}")
             raise
     
+    def _token_settings(self):
+        """Everything besides the text that shapes the tokens, for the token cache"""
+        return {
+            'spacy_version': spacy.__version__,
+            'model': f"{self.nlp.meta.get('lang')}_{self.nlp.meta.get('name')}-{self.nlp.meta.get('version')}",
+            'pipeline': self.nlp.pipe_names,
+            'stop_words': self.stop_words,
+            'medical_terms': self.medical_terms,
+            'min_word_length': self.min_word_length,
+            'max_word_length': self.max_word_length
+        }
+    
     def clean_text(self, text):
         """
         Clean individual text
@@ -97,19 +159,8 @@ class TextPreprocessor:
         Returns:
             str: Cleaned text
         """
-        if not isinstance(text, str) or not text.strip():
-            return ""
-        
-        # Use utility function for basic cleaning
-        text = util_clean_text(text)
-        
-        # Convert to lowercase
-        text = text.lower()
-        
-        # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text)
-        
-        return text.strip()
+        # Utility cleaning already collapses whitespace
+        return util_clean_text(text, lowercase=True)
     
     def tokenize_and_lemmatize(self, text):
         """
@@ -125,36 +176,134 @@ class TextPreprocessor:
             return []
         
         try:
-            doc = self.nlp(text)
-            
-            tokens = []
-            for token in doc:
-                # Skip if not alphabetic (unless it's a medical term with numbers)
-                if not token.is_alpha:
-                    # Check if it's a medical term like "glp1" or dosages
-                    if token.text.lower() in self.medical_terms:
-                        tokens.append(token.text.lower())
-                    continue
-                
-                # Get lemma
-                lemma = token.lemma_.lower()
-                
-                # Skip stopwords (unless medical term)
-                if lemma in self.stop_words and lemma not in self.medical_terms:
-                    continue
-                
-                # Check length
-                if len(lemma) < self.min_word_length or len(lemma) > self.max_word_length:
-                    continue
-                
-                tokens.append(lemma)
-            
-            return tokens
+            return self._filter_tokens(self.nlp(text))
         
         except Exception as e:
             self.logger.warning(f"Error tokenizing text: {e}")
             return []
     
+    def _filter_tokens(self, doc):
+        """Lemmas of a spaCy doc after medical-term, stopword and length filtering"""
+        return self._filter_lemmas((token.text, token.lemma_) for token in doc)
+    
+    def _filter_lemmas(self, pairs):
+        """Apply the medical-term, stopword and length rules to (token text, lemma) pairs"""
+        tokens = []
+        for text, lemma in pairs:
+            # Skip if not alphabetic (unless it's a medical term with numbers)
+            if not text.isalpha():
+                # Check if it's a medical term like "glp1" or dosages
+                if text.lower() in self.medical_terms:
+                    tokens.append(text.lower())
+                continue
+            
+            # Get lemma
+            lemma = lemma.lower()
+            
+            # Skip stopwords (unless medical term)
+            if lemma in self.stop_words and lemma not in self.medical_terms:
+                continue
+            
+            # Check length
+            if len(lemma) < self.min_word_length or len(lemma) > self.max_word_length:
+                continue
+            
+            tokens.append(lemma)
+        
+        return tokens
+    
+    def tokenize_batch(self, texts):
+        """
+        Tokenize and lemmatize cleaned texts with the configured engine
+        
+        Each distinct non-empty text is processed once; results keep the
+        input order.
+        
+        Args:
+            texts: Iterable of cleaned texts
+        
+        Returns:
+            list: List of token lists, one per input text
+        """
+        texts = list(texts)
+        unique_texts = list(dict.fromkeys(text for text in texts if text))
+        
+        if self.engine == 'lookup':
+            tokens_by_text = self._tokenize_lookup(unique_texts)
+        else:
+            tokens_by_text = self._tokenize_spacy(unique_texts)
+        
+        return [list(tokens_by_text[text]) if text else [] for text in texts]
+    
+    def _processes_for(self, num_texts):
+        """nlp.pipe processes for num_texts texts, at most n_process"""
+        # Every process reloads the model, so each needs min_texts_per_process texts to pay off
+        return max(1, min(self.n_process, num_texts // self.min_texts_per_process))
+    
+    def _tokenize_spacy(self, unique_texts):
+        """
+        Token lists from the cache, or from nlp.pipe in batches of batch_size
+        for cache misses (across up to n_process processes, one per
+        min_texts_per_process misses)
+        """
+        tokens_by_text = self.token_cache.get_many(unique_texts) if self.token_cache else {}
+        new_texts = [text for text in unique_texts if text not in tokens_by_text]
+        if self.token_cache:
+            self.logger.info(f"Token cache: {len(tokens_by_text):,} hits, {len(new_texts):,} misses")
+        
+        try:
+            docs = self.nlp.pipe(new_texts, batch_size=self.batch_size,
+                                 n_process=self._processes_for(len(new_texts)))
+            new_tokens = {
+                text: self._filter_tokens(doc)
+                for text, doc in zip(new_texts, tqdm(docs, total=len(new_texts), desc="Tokenizing"))
+            }
+        except Exception as e:
+            self.logger.warning(f"Batched tokenization failed ({e}), tokenizing one document at a time")
+            new_tokens = {text: self.tokenize_and_lemmatize(text) for text in tqdm(new_texts)}
+        
+        if self.token_cache:
+            self.token_cache.put_many(new_tokens)
+        tokens_by_text.update(new_tokens)
+        return tokens_by_text
+    
+    def _tokenize_lookup(self, unique_texts):
+        """Token lists from the regex tokenizer and lemma table"""
+        lemmatizer = self.get_lookup_lemmatizer(unique_texts)
+        return {
+            text: self._filter_lemmas(lemmatizer.lemmatize(text))
+            for text in tqdm(unique_texts, desc="Tokenizing (lookup)")
+        }
+    
+    def get_lookup_lemmatizer(self, texts=()):
+        """
+        Load the lemma table, building it once with spaCy if it does not exist yet
+        
+        Args:
+            texts: Cleaned texts to sample the table from when building it
+        
+        Returns:
+            LookupLemmatizer: Lemmatizer for the lookup engine
+        """
+        if self.lookup_lemmatizer is not None:
+            return self.lookup_lemmatizer
+        
+        table_path = self.lookup_config.get('table_path', 'data/processed/lemma_table.json')
+        if LookupLemmatizer.exists(table_path):
+            self.lookup_lemmatizer = LookupLemmatizer.load(table_path)
+            self.logger.info(f"Loaded lemma table: {len(self.lookup_lemmatizer.table):,} words")
+        else:
+            texts = list(texts)
+            sample_size = min(self.lookup_config.get('build_sample', 20000), len(texts))
+            sample = random.Random(0).sample(texts, sample_size)
+            self.logger.info(f"Building lemma table from {len(sample):,} documents with spaCy...")
+            self.lookup_lemmatizer = LookupLemmatizer.build(
+                self.nlp, sample, batch_size=self.batch_size, n_process=self._processes_for(len(sample))
+            )
+            self.lookup_lemmatizer.save(table_path)
+            self.logger.info(f"Saved lemma table: {len(self.lookup_lemmatizer.table):,} words to {table_path}")
+        return self.lookup_lemmatizer
+    
     def preprocess_document(self, text):
         """
         Full preprocessing pipeline for single document
@@ -165,9 +314,10 @@ class TextPreprocessor:
         Returns:
             tuple: (cleaned_text, tokens)
         """
-        # Clean text
-        cleaned = self.clean_text(text)
-        
+        return self._preprocess_cleaned(self.clean_text(text))
+    
+    def _preprocess_cleaned(self, cleaned):
+        """Tokenize an already cleaned document, see preprocess_document"""
         if not cleaned:
             return "", []
         
@@ -203,13 +353,18 @@ class TextPreprocessor:
             else:
                 raise ValueError("No text column found")
         
-        # Apply preprocessing
-        results = df[text_column].progress_apply(self.preprocess_document)
+        # Clean all documents in one batch, then tokenize
+        cleaned = clean_texts(df[text_column], lowercase=True)
+        if self.engine == 'lookup':
+            self.logger.info("Tokenizing with the lookup engine (regex tokenizer + lemma table)")
+        else:
+            self.logger.info(f"Tokenizing with nlp.pipe (batch_size={self.batch_size}, n_process up to {self.n_process})")
+        tokens = self.tokenize_batch(cleaned)
         
-        # Split results
-        df['cleaned_text'] = results.apply(lambda x: x[0])
-        df['tokens'] = results.apply(lambda x: x[1])
-        df['token_count'] = df['tokens'].apply(len)
+        # Rejoin tokens for cleaned text
+        df['tokens'] = pd.Series(tokens, index=df.index, dtype=object)
+        df['cleaned_text'] = [' '.join(doc_tokens) for doc_tokens in tokens]
+        df['token_count'] = [len(doc_tokens) for doc_tokens in tokens]
         
         # Filter out very short documents
         original_count = len(df)
@@ -236,6 +391,172 @@ class TextPreprocessor:
         return corpus
 
 
+# Columns of combined_processed (plus subreddit, which only posts have)
+COMBINED_COLUMNS = ['doc_id', 'doc_type', 'author', 'score', 'created_utc',
+                    'text', 'cleaned_text', 'tokens', 'token_count']
+
+# Document length buckets of the preprocessing report
+LENGTH_BUCKETS = {
+    'short (10-25 tokens)': (10, 25),
+    'medium (26-100 tokens)': (26, 100),
+    'long (100+ tokens)': (101, None)
+}
+
+# Token ids and shared vocabulary, row-aligned with combined_processed
+ENCODED_CORPUS_PATH = 'data/processed/token_ids'
+
+URL_CHECK_PATTERN = re.compile(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+')
+
+
+def add_document_ids(processed_df, doc_type):
+    """
+    Add doc_type and doc_id columns in place
+    
+    Args:
+        processed_df: Processed posts or comments
+        doc_type: 'post' or 'comment'
+    """
+    processed_df['doc_type'] = doc_type
+    processed_df['doc_id'] = processed_df['post_id' if doc_type == 'post' else 'comment_id']
+
+
+def log_encoded_corpus(encoder, logger):
+    """Log the size of a written encoded corpus"""
+    logger.info(f"Saved encoded corpus: {encoder.num_documents:,} documents, "
+                f"{encoder.num_tokens:,} tokens, {len(encoder.token2id):,} vocabulary "
+                f"to {encoder.directory}")
+
+
+def select_combined_columns(processed_df):
+    """
+    Columns of processed posts or comments that go into combined_processed
+    
+    Args:
+        processed_df: Processed DataFrame with doc_type and doc_id
+    
+    Returns:
+        DataFrame: COMBINED_COLUMNS plus subreddit (None for comments)
+    """
+    combined = processed_df[COMBINED_COLUMNS].copy()
+    if 'subreddit' in processed_df.columns:
+        combined['subreddit'] = processed_df['subreddit']
+    else:
+        combined['subreddit'] = None
+    return combined
+
+
+def _subtract(counter, items):
+    """Subtract occurrences of items from a Counter, deleting keys that reach zero"""
+    for key, count in Counter(items).items():
+        left = counter[key] - count
+        if left > 0:
+            counter[key] = left
+        else:
+            del counter[key]
+
+
+class PreprocessingStats:
+    """
+    Streaming counters behind the preprocessing report and validation
+    
+    Updated once per processed chunk (or once with the whole dataset), so the
+    report and the validation share a single pass over the tokens. Memory
+    grows with the vocabulary and the number of distinct document lengths,
+    not with the number of documents or tokens.
+    """
+    
+    def __init__(self):
+        self.original_documents = 0
+        self.length_histogram = Counter()  # token_count -> documents
+        self.token_frequencies = Counter()
+        self.documents_with_urls = 0
+        self.duplicates_dropped = 0
+        self.columns = set()
+    
+    def update(self, original_count, processed_df):
+        """
+        Add a processed chunk
+        
+        Args:
+            original_count: Documents in the chunk before filtering
+            processed_df: The chunk after preprocessing and filtering
+        """
+        self.original_documents += original_count
+        self.columns.update(processed_df.columns)
+        self.length_histogram.update(processed_df['token_count'].tolist())
+        self.token_frequencies.update(chain.from_iterable(processed_df['tokens']))
+        self.documents_with_urls += sum(
+            1 for text in processed_df['cleaned_text'] if URL_CHECK_PATTERN.search(text)
+        )
+    
+    def remove(self, dropped_df):
+        """
+        Take documents dropped after preprocessing (near duplicates) back out
+        
+        Args:
+            dropped_df: The dropped rows of combined_processed
+        """
+        self.duplicates_dropped += len(dropped_df)
+        _subtract(self.length_histogram, dropped_df['token_count'].tolist())
+        _subtract(self.token_frequencies, chain.from_iterable(dropped_df['tokens']))
+        self.documents_with_urls -= sum(
+            1 for text in dropped_df['cleaned_text'] if URL_CHECK_PATTERN.search(text)
+        )
+    
+    @property
+    def processed_documents(self):
+        return sum(self.length_histogram.values())
+    
+    @property
+    def total_tokens(self):
+        return sum(length * docs for length, docs in self.length_histogram.items())
+    
+    def _length_quantile(self, position):
+        """Document length at a 0-based position in sorted order"""
+        seen = 0
+        for length in sorted(self.length_histogram):
+            seen += self.length_histogram[length]
+            if seen > position:
+                return length
+        return 0
+    
+    def median_tokens(self):
+        """Exact median document length, from the histogram"""
+        n = self.processed_documents
+        if n == 0:
+            return float('nan')
+        return (self._length_quantile((n - 1) // 2) + self._length_quantile(n // 2)) / 2
+    
+    def count_between(self, low, high=None):
+        """Documents with low <= token_count <= high (no upper bound if high is None)"""
+        return sum(docs for length, docs in self.length_histogram.items()
+                   if length >= low and (high is None or length <= high))
+    
+    def to_report(self):
+        """Preprocessing report fields"""
+        n = self.processed_documents
+        total_tokens = self.total_tokens
+        return {
+            'preprocessing_timestamp': datetime.now().isoformat(),
+            'original_document_count': int(self.original_documents),
+            'processed_document_count': int(n),
+            'documents_filtered': int(self.original_documents - n - self.duplicates_dropped),
+            'near_duplicates_dropped': int(self.duplicates_dropped),
+            'token_statistics': {
+                'total_tokens': int(total_tokens),
+                'unique_tokens': int(len(self.token_frequencies)),
+                'avg_tokens_per_doc': float(total_tokens / n) if n else float('nan'),
+                'median_tokens_per_doc': float(self.median_tokens()),
+                'min_tokens': int(min(self.length_histogram)) if n else 0,
+                'max_tokens': int(max(self.length_histogram)) if n else 0
+            },
+            'most_common_tokens': {k: int(v) for k, v in self.token_frequencies.most_common(50)},
+            'document_length_distribution': {
+                name: int(self.count_between(low, high)) for name, (low, high) in LENGTH_BUCKETS.items()
+            }
+        }
+
+
 def combine_posts_and_comments(posts_df, comments_df):
     """
     Combine posts and comments into single dataset
@@ -273,52 +594,34 @@ def combine_posts_and_comments(posts_df, comments_df):
     return combined
 
 
-def generate_preprocessing_report(original_df, processed_df, corpus, output_path):
+def generate_preprocessing_report(stats, output_path, token_cache=None):
     """
     Generate preprocessing report
     
     Args:
-        original_df: Original DataFrame
-        processed_df: Processed DataFrame
-        corpus: Token corpus
+        stats: PreprocessingStats of the run
         output_path: Output file path
+        token_cache: TokenCache used for the run (optional)
+    
+    Returns:
+        dict: Report
     """
-    # Calculate statistics
-    all_tokens = [token for doc in corpus for token in doc]
-    vocabulary = set(all_tokens)
-    
-    report = {
-        'preprocessing_timestamp': datetime.now().isoformat(),
-        'original_document_count': int(len(original_df)),
-        'processed_document_count': int(len(processed_df)),
-        'documents_filtered': int(len(original_df) - len(processed_df)),
-        'token_statistics': {
-            'total_tokens': int(len(all_tokens)),
-            'unique_tokens': int(len(vocabulary)),
-            'avg_tokens_per_doc': float(processed_df['token_count'].mean()),
-            'median_tokens_per_doc': float(processed_df['token_count'].median()),
-            'min_tokens': int(processed_df['token_count'].min()),
-            'max_tokens': int(processed_df['token_count'].max())
-        },
-        'most_common_tokens': {k: int(v) for k, v in pd.Series(all_tokens).value_counts().head(50).to_dict().items()},
-        'document_length_distribution': {
-            'short (10-25 tokens)': int(len(processed_df[processed_df['token_count'].between(10, 25)])),
-            'medium (26-100 tokens)': int(len(processed_df[processed_df['token_count'].between(26, 100)])),
-            'long (100+ tokens)': int(len(processed_df[processed_df['token_count'] > 100]))
-        }
-    }
+    report = stats.to_report()
+    
+    if token_cache is not None:
+        report['token_cache'] = token_cache.get_metrics()
     
     save_json(report, output_path)
     
     return report
 
 
-def validate_preprocessing(df):
+def validate_preprocessing(stats):
     """
-    Validate preprocessed data
+    Validate preprocessed data from the run's counters
     
     Args:
-        df: Processed DataFrame
+        stats: PreprocessingStats of the run
     
     Returns:
         bool: True if valid
@@ -328,44 +631,45 @@ def validate_preprocessing(df):
     print("="*60)
     
     # Check cleaned_text column
-    if 'cleaned_text' in df.columns:
+    if 'cleaned_text' in stats.columns:
         print(f"✓ Cleaned text column present")
     else:
         print(f"✗ Missing cleaned_text column")
         return False
     
     # Check tokens column
-    if 'tokens' in df.columns:
+    if 'tokens' in stats.columns:
         print(f"✓ Tokens column present")
     else:
         print(f"✗ Missing tokens column")
         return False
     
+    if stats.processed_documents == 0:
+        print(f"✗ No documents left after preprocessing")
+        return False
+    
     # Check no URLs remain
-    url_pattern = r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+'
-    urls_found = df['cleaned_text'].str.contains(url_pattern, regex=True).sum()
-    if urls_found == 0:
+    if stats.documents_with_urls == 0:
         print(f"✓ No URLs in cleaned text")
     else:
-        print(f"⚠ Found {urls_found} documents with URLs")
+        print(f"⚠ Found {stats.documents_with_urls} documents with URLs")
     
     # Check token counts
-    avg_tokens = df['token_count'].mean()
+    avg_tokens = stats.total_tokens / stats.processed_documents
     if avg_tokens > 5:
         print(f"✓ Average tokens per document: {avg_tokens:.1f}")
     else:
         print(f"✗ Low average token count: {avg_tokens:.1f}")
     
     # Check no empty documents
-    empty_docs = (df['token_count'] == 0).sum()
+    empty_docs = stats.length_histogram.get(0, 0)
     if empty_docs == 0:
         print(f"✓ No empty documents")
     else:
         print(f"✗ Found {empty_docs} empty documents")
     
     # Check vocabulary size
-    all_tokens = [token for tokens in df['tokens'] for token in tokens]
-    vocab_size = len(set(all_tokens))
+    vocab_size = len(stats.token_frequencies)
     if vocab_size > 100:
         print(f"✓ Vocabulary size: {vocab_size:,} unique tokens")
     else:
@@ -376,6 +680,401 @@ def validate_preprocessing(df):
     return True
 
 
+def run_streaming(preprocessor, chunk_size, logger):
+    """
+    Preprocess the raw data chunk by chunk
+    
+    Each chunk of posts.csv and comments.csv is read, preprocessed and appended
+    as a part file to the processed datasets, so memory stays flat however
+    large the corpus is. Report statistics are accumulated as the chunks go by.
+    
+    Args:
+        preprocessor: TextPreprocessor
+        chunk_size: Raw rows per chunk
+        logger: Logger
+    
+    Returns:
+        tuple: (report dict, PreprocessingStats)
+    """
+    combined_writer = PartitionedParquetWriter('data/processed/combined_processed.parquet')
+    encoder = EncodedCorpusWriter(ENCODED_CORPUS_PATH)
+    stats = PreprocessingStats()
+    
+    for doc_type, raw_path in (('post', 'data/raw/posts.csv'), ('comment', 'data/raw/comments.csv')):
+        logger.info(f"\nProcessing {doc_type}s in chunks of {chunk_size:,} rows...")
+        writer = PartitionedParquetWriter(f'data/processed/{doc_type}s_processed.parquet')
+        
+        for chunk in iter_dataframe_chunks(raw_path, chunk_size):
+            chunk['author'] = hash_usernames(chunk['author'])
+            processed = preprocessor.preprocess_dataframe(chunk, 'text')
+            add_document_ids(processed, doc_type)
+            
+            writer.write(processed)
+            combined_writer.write(select_combined_columns(processed))
+            encoder.add(processed['tokens'])
+            stats.update(len(chunk), processed)
+        
+        logger.info(f"Saved {writer.rows:,} processed {doc_type}s in {writer.parts} part files")
+    
+    logger.info(f"Combined dataset: {combined_writer.rows:,} documents")
+    encoder.close()
+    log_encoded_corpus(encoder, logger)
+    
+    report = generate_preprocessing_report(
+        stats,
+        'data/metadata/preprocessing_report.json',
+        token_cache=preprocessor.token_cache
+    )
+    
+    return report, stats
+
+
+def remove_near_duplicates(dedup_config, chunk_size, stats, logger):
+    """
+    Flag or drop near-duplicate documents in combined_processed
+    
+    Runs after the processed datasets and the encoded corpus are written:
+    clusters come from MinHash LSH over the encoded corpus, then
+    combined_processed is rewritten chunk by chunk, either with a
+    duplicate_of column (doc_id of the cluster's first document) or without
+    the duplicates, in which case the encoded corpus is rewritten too and
+    the dropped documents are taken out of stats. posts_processed and
+    comments_processed are left complete.
+    
+    Args:
+        dedup_config: preprocessing.near_duplicates config
+        chunk_size: Rows rewritten at a time
+        stats: PreprocessingStats of the run
+        logger: Logger
+    
+    Returns:
+        dict: Near-duplicate summary for the preprocessing report
+    """
+    action = dedup_config.get('action', 'flag')
+    if action not in ('flag', 'drop'):
+        raise ValueError(f"Unknown near-duplicate action: {action}")
+    
+    detector = NearDuplicateDetector(
+        threshold=dedup_config.get('threshold', 0.8),
+        num_perm=dedup_config.get('num_perm', 128),
+        bands=dedup_config.get('bands', 32),
+        shingle_size=dedup_config.get('shingle_size', 3)
+    )
+    corpus = EncodedCorpus(ENCODED_CORPUS_PATH)
+    representatives = detector.find_representatives(corpus)
+    summary = detector.summarize(representatives, corpus.lengths())
+    summary['action'] = action
+    del corpus
+    
+    logger.info(f"Near duplicates: {summary['duplicate_documents']:,} documents in "
+                f"{summary['clusters']:,} clusters ({summary['duplicate_token_share']:.1%} of tokens)")
+    if summary['duplicate_documents'] == 0:
+        return summary
+    
+    combined_path = Path('data/processed/combined_processed.parquet')
+    rewritten_path = combined_path.with_name('combined_processed.dedup.parquet')
+    doc_ids = load_dataframe(combined_path, columns=['doc_id'])['doc_id'].to_numpy()
+    writer = PartitionedParquetWriter(rewritten_path)
+    encoder = EncodedCorpusWriter(ENCODED_CORPUS_PATH + '.dedup') if action == 'drop' else None
+    
+    start = 0
+    for chunk in iter_dataframe_chunks(combined_path, chunk_size):
+        rows = np.arange(start, start + len(chunk))
+        chunk_representatives = representatives[rows]
+        duplicate = chunk_representatives != rows
+        if action == 'drop':
+            stats.remove(chunk[duplicate])
+            chunk = chunk[~duplicate]
+            encoder.add(chunk['tokens'])
+        else:
+            chunk['duplicate_of'] = np.where(duplicate, doc_ids[chunk_representatives], None)
+        writer.write(chunk)
+        start += len(rows)
+    
+    # Swap the rewritten outputs in, keeping a single file where there was one
+    if combined_path.is_dir():
+        shutil.rmtree(combined_path)
+        rewritten_path.rename(combined_path)
+    else:
+        merge_parquet_parts(rewritten_path, combined_path, batch_size=chunk_size)
+        shutil.rmtree(rewritten_path)
+    if encoder is not None:
+        encoder.close()
+        shutil.rmtree(ENCODED_CORPUS_PATH)
+        Path(ENCODED_CORPUS_PATH + '.dedup').rename(ENCODED_CORPUS_PATH)
+    
+    verb = 'Dropped' if action == 'drop' else 'Flagged'
+    logger.info(f"{verb} {summary['duplicate_documents']:,} near-duplicate documents in combined_processed")
+    return summary
+
+
+# Per-process preprocessor of the parallel mode, set by _init_worker
+_worker_preprocessor = None
+
+
+def _peak_rss_mb():
+    """Peak resident set size of this process in MB (None where unavailable)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == 'darwin' else peak / 2**10  # bytes on macOS, KiB elsewhere
+
+
+def _init_worker(config):
+    """Pool initializer: load the spaCy model and stopword sets once per worker"""
+    global _worker_preprocessor
+    config = copy.deepcopy(config)
+    config['preprocessing'].setdefault('spacy', {})['n_process'] = 1  # The pool is the parallelism
+    # Warnings only, to the console: the main process logs progress and owns the log file
+    logging.getLogger('data_preprocessing_worker').handlers.clear()  # Inherited from the parent when forked
+    logger = setup_logger('data_preprocessing_worker', None, level=logging.WARNING)
+    _worker_preprocessor = TextPreprocessor(config, logger=logger)
+
+
+def _preprocess_shard(doc_type, shard):
+    """
+    Preprocess one shard of posts or comments in a worker
+    
+    Returns:
+        tuple: (processed shard with doc ids, worker metrics)
+    """
+    start = time.perf_counter()
+    cache = _worker_preprocessor.token_cache
+    cache_before = dict(cache.stats) if cache else None
+    
+    processed = _worker_preprocessor.preprocess_dataframe(shard, 'text')
+    add_document_ids(processed, doc_type)
+    
+    metrics = {
+        'pid': os.getpid(),
+        'seconds': time.perf_counter() - start,
+        'peak_rss_mb': _peak_rss_mb()
+    }
+    if cache:
+        metrics['cache_hits'] = cache.stats['hits'] - cache_before['hits']
+        metrics['cache_misses'] = cache.stats['misses'] - cache_before['misses']
+    return processed, metrics
+
+
+def _iter_raw_shards(shard_size):
+    """Shards of posts.csv, then comments.csv, as (doc_type, shard) with authors hashed"""
+    for doc_type, raw_path in (('post', 'data/raw/posts.csv'), ('comment', 'data/raw/comments.csv')):
+        for shard in iter_dataframe_chunks(raw_path, shard_size):
+            shard['author'] = hash_usernames(shard['author'])
+            yield doc_type, shard
+
+
+def _sample_cleaned_texts(sample_size, shard_size):
+    """
+    Uniform random sample of the cleaned raw texts, in one chunked pass
+    
+    Args:
+        sample_size: Texts to keep
+        shard_size: Raw rows read at a time
+    
+    Returns:
+        list: Cleaned, lowercased non-empty texts
+    """
+    rng = random.Random(0)
+    sample = []
+    seen = 0
+    for doc_type, shard in _iter_raw_shards(shard_size):
+        if doc_type == 'post':
+            texts = shard['title'].fillna('') + ' ' + shard['selftext'].fillna('')
+        else:
+            texts = shard['body'].fillna('')
+        for text in clean_texts(texts, lowercase=True):
+            if not text:
+                continue
+            seen += 1
+            if len(sample) < sample_size:
+                sample.append(text)
+            else:
+                slot = rng.randrange(seen)  # Reservoir sampling
+                if slot < sample_size:
+                    sample[slot] = text
+    return sample
+
+
+def run_parallel(preprocessor, workers, shard_size, logger):
+    """
+    Preprocess posts and comments across a process pool
+    
+    The raw posts and comments are read shard by shard and handed to worker
+    processes that each load the NLP models once. At most two shards per
+    worker are in flight; results are taken in order and written straight
+    to the part files of the processed datasets, the encoded corpus and the
+    report counters, as in streaming mode, so memory stays flat.
+    
+    Args:
+        preprocessor: TextPreprocessor of the main process (builds the lemma
+                      table before workers start, owns the token cache)
+        workers: Worker processes
+        shard_size: Rows per shard
+        logger: Logger
+    
+    Returns:
+        tuple: (report dict, PreprocessingStats)
+    """
+    start = time.perf_counter()
+    
+    # The lookup engine's lemma table is built once here, not by every worker
+    if preprocessor.engine == 'lookup':
+        table_path = preprocessor.lookup_config.get('table_path', 'data/processed/lemma_table.json')
+        if not LookupLemmatizer.exists(table_path):
+            sample_size = preprocessor.lookup_config.get('build_sample', 20000)
+            preprocessor.get_lookup_lemmatizer(_sample_cleaned_texts(sample_size, shard_size))
+    
+    logger.info(f"\nPreprocessing shards of up to {shard_size:,} rows with {workers} workers...")
+    
+    writers = {
+        doc_type: PartitionedParquetWriter(f'data/processed/{doc_type}s_processed.parquet')
+        for doc_type in ('post', 'comment')
+    }
+    combined_writer = PartitionedParquetWriter('data/processed/combined_processed.parquet')
+    encoder = EncodedCorpusWriter(ENCODED_CORPUS_PATH)
+    stats = PreprocessingStats()
+    worker_metrics = {}
+    cache_counts = {'hits': 0, 'misses': 0}
+    
+    def collect(doc_type, original_count, future):
+        processed, metrics = future.result()
+        writers[doc_type].write(processed)
+        combined_writer.write(select_combined_columns(processed))
+        encoder.add(processed['tokens'])
+        stats.update(original_count, processed)
+        
+        worker = worker_metrics.setdefault(metrics['pid'], {'shards': 0, 'seconds': 0.0})
+        worker['shards'] += 1
+        worker['seconds'] += metrics['seconds']
+        worker['peak_rss_mb'] = metrics['peak_rss_mb']
+        cache_counts['hits'] += metrics.get('cache_hits', 0)
+        cache_counts['misses'] += metrics.get('cache_misses', 0)
+    
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(preprocessor.config,)
+    ) as pool:
+        in_flight = deque()
+        for doc_type, shard in _iter_raw_shards(shard_size):
+            in_flight.append((doc_type, len(shard), pool.submit(_preprocess_shard, doc_type, shard)))
+            if len(in_flight) >= 2 * workers:
+                collect(*in_flight.popleft())
+        while in_flight:
+            collect(*in_flight.popleft())
+    seconds = time.perf_counter() - start
+    
+    for doc_type, writer in writers.items():
+        logger.info(f"Saved {writer.rows:,} processed {doc_type}s in {writer.parts} part files")
+    logger.info(f"Combined dataset: {combined_writer.rows:,} documents in {seconds:.1f}s")
+    for pid, worker in sorted(worker_metrics.items()):
+        rss = f"{worker['peak_rss_mb']:.0f} MB" if worker['peak_rss_mb'] is not None else "n/a"
+        logger.info(f"  Worker {pid}: {worker['shards']} shards, {worker['seconds']:.1f}s, peak RSS {rss}")
+    encoder.close()
+    log_encoded_corpus(encoder, logger)
+    
+    report = stats.to_report()
+    report['parallel'] = {
+        'workers': workers,
+        'shards': sum(worker['shards'] for worker in worker_metrics.values()),
+        'shard_size': shard_size,
+        'seconds_to_result': seconds,
+        'main_peak_rss_mb': _peak_rss_mb(),
+        'worker_metrics': {str(pid): worker for pid, worker in worker_metrics.items()}
+    }
+    if preprocessor.token_cache is not None:
+        lookups = cache_counts['hits'] + cache_counts['misses']
+        report['token_cache'] = {
+            'hits': cache_counts['hits'],
+            'misses': cache_counts['misses'],
+            'invalidated_entries': preprocessor.token_cache.stats['invalidated_entries'],
+            'hit_rate': cache_counts['hits'] / lookups if lookups else 0.0,
+            'entries': preprocessor.token_cache.count()
+        }
+    save_json(report, 'data/metadata/preprocessing_report.json')
+    
+    return report, stats
+
+
+def run_in_memory(preprocessor, logger):
+    """
+    Preprocess the raw data in one pass over fully loaded dataframes
+    
+    Args:
+        preprocessor: TextPreprocessor
+        logger: Logger
+    
+    Returns:
+        tuple: (report dict, PreprocessingStats)
+    """
+    # Load raw data
+    logger.info("Loading raw data...")
+    posts_df = load_dataframe('data/raw/posts.csv')
+    comments_df = load_dataframe('data/raw/comments.csv')
+    
+    logger.info(f"Loaded {len(posts_df)} posts and {len(comments_df)} comments")
+    
+    # Pseudonymize authors (hashed once per distinct username)
+    posts_df['author'] = hash_usernames(posts_df['author'])
+    comments_df['author'] = hash_usernames(comments_df['author'])
+    
+    # Process posts
+    logger.info("\nProcessing posts...")
+    posts_df['text'] = posts_df['title'].fillna('') + ' ' + posts_df['selftext'].fillna('')
+    posts_processed = preprocessor.preprocess_dataframe(posts_df.copy(), 'text')
+    
+    # Process comments
+    logger.info("\nProcessing comments...")
+    comments_df['text'] = comments_df['body'].fillna('')
+    comments_processed = preprocessor.preprocess_dataframe(comments_df.copy(), 'text')
+    
+    # Combine datasets
+    logger.info("\nCombining posts and comments...")
+    
+    # Add document type
+    add_document_ids(posts_processed, 'post')
+    add_document_ids(comments_processed, 'comment')
+    
+    # Combine
+    combined_processed = pd.concat(
+        [select_combined_columns(posts_processed), select_combined_columns(comments_processed)],
+        ignore_index=True
+    )
+    
+    logger.info(f"Combined dataset: {len(combined_processed)} documents")
+    
+    # Save processed data
+    logger.info("\nSaving processed data...")
+    save_dataframe(posts_processed, 'data/processed/posts_processed.parquet', format='parquet')
+    save_dataframe(comments_processed, 'data/processed/comments_processed.parquet', format='parquet')
+    save_dataframe(combined_processed, 'data/processed/combined_processed.parquet', format='parquet')
+    
+    logger.info("Saved processed dataframes")
+    
+    # Create corpus
+    logger.info("\nCreating corpus for topic modeling...")
+    corpus = preprocessor.create_corpus(combined_processed)
+    
+    # Save corpus as token ids over a shared vocabulary
+    encoder = EncodedCorpusWriter(ENCODED_CORPUS_PATH)
+    encoder.add(corpus)
+    encoder.close()
+    log_encoded_corpus(encoder, logger)
+    
+    # Generate preprocessing report (one pass, shared with validation)
+    logger.info("\nGenerating preprocessing report...")
+    stats = PreprocessingStats()
+    stats.update(len(posts_df) + len(comments_df), combined_processed)
+    report = generate_preprocessing_report(
+        stats,
+        'data/metadata/preprocessing_report.json',
+        token_cache=preprocessor.token_cache
+    )
+    
+    return report, stats
+
+
 def main():
     """Main execution function"""
     try:
@@ -392,82 +1091,33 @@ def main():
         logger.info("Starting Data Preprocessing")
         logger.info("="*60)
         
-        # Load raw data
-        logger.info("Loading raw data...")
-        posts_df = load_dataframe('data/raw/posts.csv')
-        comments_df = load_dataframe('data/raw/comments.csv')
-        
-        logger.info(f"Loaded {len(posts_df)} posts and {len(comments_df)} comments")
-        
-        # Initialize preprocessor
         preprocessor = TextPreprocessor(config)
         
-        # Process posts
-        logger.info("\nProcessing posts...")
-        posts_df['text'] = posts_df['title'].fillna('') + ' ' + posts_df['selftext'].fillna('')
-        posts_processed = preprocessor.preprocess_dataframe(posts_df.copy(), 'text')
-        
-        # Process comments
-        logger.info("\nProcessing comments...")
-        comments_df['text'] = comments_df['body'].fillna('')
-        comments_processed = preprocessor.preprocess_dataframe(comments_df.copy(), 'text')
-        
-        # Combine datasets
-        logger.info("\nCombining posts and comments...")
-        
-        # Add document type
-        posts_processed['doc_type'] = 'post'
-        posts_processed['doc_id'] = posts_processed['post_id']
-        comments_processed['doc_type'] = 'comment'
-        comments_processed['doc_id'] = comments_processed['comment_id']
-        
-        # Select columns to keep (without subreddit first)
-        keep_cols = ['doc_id', 'doc_type', 'author', 'score', 'created_utc', 
-                     'text', 'cleaned_text', 'tokens', 'token_count']
-        
-        posts_keep = posts_processed[keep_cols].copy()
-        comments_keep = comments_processed[keep_cols].copy()
-        
-        # Add subreddit column
-        if 'subreddit' in posts_processed.columns:
-            posts_keep['subreddit'] = posts_processed['subreddit']
+        # Streaming mode reads, processes and writes the raw data chunk by chunk
+        streaming_config = config['preprocessing'].get('streaming', {})
+        streaming = streaming_config.get('enabled', False)
+        parallel_config = config['preprocessing'].get('parallel', {})
+        if streaming:
+            report, stats = run_streaming(preprocessor, streaming_config.get('chunk_size', 20000), logger)
+        elif parallel_config.get('enabled', False):
+            report, stats = run_parallel(
+                preprocessor,
+                parallel_config.get('workers') or os.cpu_count() or 1,
+                parallel_config.get('shard_size', 5000),
+                logger
+            )
         else:
-            posts_keep['subreddit'] = None
-        
-        # Comments don't have subreddit directly
-        comments_keep['subreddit'] = None
-        
-        # Combine
-        combined_processed = pd.concat([posts_keep, comments_keep], ignore_index=True)
+            report, stats = run_in_memory(preprocessor, logger)
         
-        logger.info(f"Combined dataset: {len(combined_processed)} documents")
-        
-        # Save processed data
-        logger.info("\nSaving processed data...")
-        save_dataframe(posts_processed, 'data/processed/posts_processed.csv')
-        save_dataframe(comments_processed, 'data/processed/comments_processed.csv')
-        save_dataframe(combined_processed, 'data/processed/combined_processed.csv')
-        
-        logger.info("Saved processed dataframes")
-        
-        # Create corpus
-        logger.info("\nCreating corpus for topic modeling...")
-        corpus = preprocessor.create_corpus(combined_processed)
-        
-        # Save corpus
-        with open('data/processed/corpus.pkl', 'wb') as f:
-            pickle.dump(corpus, f)
-        
-        logger.info(f"Saved corpus: {len(corpus)} documents")
-        
-        # Generate preprocessing report
-        logger.info("\nGenerating preprocessing report...")
-        report = generate_preprocessing_report(
-            pd.concat([posts_df, comments_df], ignore_index=True),
-            combined_processed,
-            corpus,
-            'data/metadata/preprocessing_report.json'
-        )
+        # Near-duplicate documents (reposts, copy-pasted comments)
+        dedup_config = config['preprocessing'].get('near_duplicates', {})
+        if dedup_config.get('enabled', False):
+            logger.info("\nDetecting near-duplicate documents...")
+            report['near_duplicates'] = remove_near_duplicates(
+                dedup_config, streaming_config.get('chunk_size', 20000), stats, logger
+            )
+            report.update(stats.to_report())  # Counts without dropped duplicates
+            save_json(report, 'data/metadata/preprocessing_report.json')
         
         # Log summary
         logger.info("\n" + "="*60)
@@ -476,13 +1126,22 @@ def main():
         logger.info(f"Original documents: {report['original_document_count']:,}")
         logger.info(f"Processed documents: {report['processed_document_count']:,}")
         logger.info(f"Filtered out: {report['documents_filtered']:,}")
+        if report['near_duplicates_dropped']:
+            logger.info(f"Near duplicates dropped: {report['near_duplicates_dropped']:,}")
         logger.info(f"Total tokens: {report['token_statistics']['total_tokens']:,}")
         logger.info(f"Vocabulary size: {report['token_statistics']['unique_tokens']:,}")
         logger.info(f"Avg tokens/doc: {report['token_statistics']['avg_tokens_per_doc']:.1f}")
+        if 'near_duplicates' in report:
+            logger.info(f"Near duplicates ({report['near_duplicates']['action']}): "
+                        f"{report['near_duplicates']['duplicate_documents']:,} documents, "
+                        f"{report['near_duplicates']['duplicate_token_share']:.1%} of tokens")
+        if 'token_cache' in report:
+            logger.info(f"Token cache hit rate: {report['token_cache']['hit_rate']:.1%} "
+                        f"({report['token_cache']['hits']:,} hits, {report['token_cache']['misses']:,} misses)")
         logger.info("="*60)
         
         # Validate
-        success = validate_preprocessing(combined_processed)
+        success = validate_preprocessing(stats)
         
         if success:
             print("\n✓ MODULE 2 COMPLETE: Data preprocessing successful!")
@@ -7,15 +7,16 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
-from collections import Counter
 from wordcloud import WordCloud
 import json
 from datetime import datetime
 import os
-import ast
 from pathlib import Path
 import logging
-from utils import setup_logger, load_config, save_json
+from utils import setup_logger, load_config, save_json, count_rows
+from encoded_corpus import EncodedCorpus
+from eda_engine import EDAAggregates
+from eda_cache import EDACache, fingerprint, fingerprint_files
 
 # Setup
 plt.style.use('seaborn-v0_8-darkgrid')
@@ -42,42 +43,78 @@ class ExploratoryAnalysis:
         self.eda_viz_path = os.path.join(self.viz_path, 'eda')
         os.makedirs(self.eda_viz_path, exist_ok=True)
         
+        # Documents aggregated per chunk in the single pass over the corpus
+        eda_config = self.config.get('eda', {})
+        self.chunk_size = eda_config.get('chunk_size', 50000)
+        
+        # Optional document sample for the length plots (statistics stay exact)
+        sampling_config = eda_config.get('plot_sampling', {})
+        self.sample = None
+        if sampling_config.get('enabled', False):
+            self.sample = {
+                'method': sampling_config.get('method', 'stratified'),
+                'per_stratum': sampling_config.get('per_stratum', 2000),
+                'sample_size': sampling_config.get('sample_size', 100000),
+                'seed': sampling_config.get('seed', 42)
+            }
+        
+        # Results of earlier runs, reused while their inputs are unchanged
+        cache_config = eda_config.get('cache', {})
+        self.cache = None
+        if cache_config.get('enabled', True):
+            self.cache = EDACache(cache_config.get('directory', os.path.join(self.metadata_path, 'eda_cache')))
+        
+        # Optional fixed-memory n-gram sketches (approximate counts with error bounds)
+        sketch_config = eda_config.get('ngram_sketch', {})
+        self.sketch = None
+        if sketch_config.get('enabled', False):
+            self.sketch = {
+                'capacity': sketch_config.get('capacity', 10000),
+                'width': sketch_config.get('width', 1 << 20),
+                'depth': sketch_config.get('depth', 4)
+            }
+        
         # Data containers
-        self.df = None
-        self.posts_df = None
-        self.comments_df = None
+        self.corpus = None  # EncodedCorpus, row-aligned with combined_processed
+        self.agg = None  # EDAAggregates over combined_processed and the corpus
+        self._vocabulary_fingerprint = None
+        self.total_posts = 0
+        self.total_comments = 0
         self.stats = {}
         
         self.logger.info("EDA Analyzer initialized")
     
     def load_data(self):
-        """Load all processed data"""
+        """Aggregate all processed data in one chunked pass"""
         self.logger.info("Loading processed data...")
         
         try:
-            # Load combined dataset
-            combined_path = os.path.join(self.processed_path, 'combined_processed.csv')
-            self.df = pd.read_csv(combined_path)
-            
-            # Parse tokens column (stored as string representation of list)
-            self.df['tokens'] = self.df['tokens'].apply(ast.literal_eval)
+            # Metadata comes from combined_processed, tokens from the encoded corpus
+            combined_path = os.path.join(self.processed_path, 'combined_processed.parquet')
+            corpus_path = os.path.join(self.processed_path, 'token_ids')
+            self.corpus = EncodedCorpus(corpus_path)
             
-            # Convert timestamp to datetime
-            self.df['created_utc'] = pd.to_datetime(self.df['created_utc'])
+            # Posts and comments are only counted
+            self.total_posts = count_rows(os.path.join(self.processed_path, 'posts_processed.parquet'))
+            self.total_comments = count_rows(os.path.join(self.processed_path, 'comments_processed.parquet'))
             
-            # Load separate posts and comments for specific analyses
-            posts_path = os.path.join(self.processed_path, 'posts_processed.csv')
-            comments_path = os.path.join(self.processed_path, 'comments_processed.csv')
+            # Aggregates of unchanged inputs come from the cache
+            inputs = None
+            if self.cache:
+                inputs = fingerprint_files([combined_path, corpus_path],
+                                           {'sketch': self.sketch, 'sample': self.sample})
+                self.agg = self.cache.load_aggregates(inputs)
+            if self.agg is not None:
+                self.logger.info("Inputs unchanged; reusing cached aggregates")
+            else:
+                self.agg = EDAAggregates.from_corpus(combined_path, self.corpus, self.chunk_size,
+                                                     self.sketch, self.sample)
+                if self.cache:
+                    self.cache.save_aggregates(inputs, self.agg)
             
-            self.posts_df = pd.read_csv(posts_path)
-            self.posts_df['created_utc'] = pd.to_datetime(self.posts_df['created_utc'])
-            
-            self.comments_df = pd.read_csv(comments_path)
-            self.comments_df['created_utc'] = pd.to_datetime(self.comments_df['created_utc'])
-            
-            self.logger.info(f"Loaded {len(self.df)} documents successfully")
-            self.logger.info(f"  - Posts: {len(self.posts_df)}")
-            self.logger.info(f"  - Comments: {len(self.comments_df)}")
+            self.logger.info(f"Loaded {self.agg.documents} documents successfully")
+            self.logger.info(f"  - Posts: {self.total_posts}")
+            self.logger.info(f"  - Comments: {self.total_comments}")
             
             return True
             
@@ -89,40 +126,36 @@ class ExploratoryAnalysis:
         """Calculate comprehensive basic statistics"""
         self.logger.info("Calculating basic statistics...")
         
+        agg = self.agg
         stats = {
-            'total_documents': int(len(self.df)),
-            'total_posts': int(len(self.posts_df)),
-            'total_comments': int(len(self.comments_df)),
+            'total_documents': int(agg.documents),
+            'total_posts': int(self.total_posts),
+            'total_comments': int(self.total_comments),
             'date_range': {
-                'earliest': str(self.df['created_utc'].min()),
-                'latest': str(self.df['created_utc'].max()),
-                'span_days': int((self.df['created_utc'].max() - self.df['created_utc'].min()).days)
+                'earliest': str(agg.earliest),
+                'latest': str(agg.latest),
+                'span_days': int((agg.latest - agg.earliest).days)
             },
-            'subreddit_distribution': self.df['subreddit'].value_counts().to_dict(),
-            'document_type_distribution': self.df['doc_type'].value_counts().to_dict(),
+            'subreddit_distribution': dict(agg.subreddits.most_common()),
+            'document_type_distribution': dict(agg.doc_types.most_common()),
             'token_statistics': {
-                'total_tokens': int(self.df['token_count'].sum()),
-                'mean_tokens': float(self.df['token_count'].mean()),
-                'median_tokens': float(self.df['token_count'].median()),
-                'min_tokens': int(self.df['token_count'].min()),
-                'max_tokens': int(self.df['token_count'].max()),
-                'std_tokens': float(self.df['token_count'].std())
+                'total_tokens': int(agg.lengths.sum()),
+                'mean_tokens': float(agg.lengths.mean()),
+                'median_tokens': float(agg.lengths.median()),
+                'min_tokens': int(min(agg.lengths.counts)),
+                'max_tokens': int(max(agg.lengths.counts)),
+                'std_tokens': float(agg.lengths.std())
             },
             'score_statistics': {
-                'mean_score': float(self.df['score'].mean()),
-                'median_score': float(self.df['score'].median()),
-                'max_score': int(self.df['score'].max()),
-                'posts_with_positive_score': int((self.df['score'] > 0).sum())
+                'mean_score': float(agg.scores.mean()),
+                'median_score': float(agg.scores.median()),
+                'max_score': int(max(agg.scores.counts)),
+                'posts_with_positive_score': int(agg.scores.count_where(lambda score: score > 0))
             }
         }
         
         # Document length categories
-        self.df['length_category'] = pd.cut(
-            self.df['token_count'],
-            bins=[0, 25, 50, 100, float('inf')],
-            labels=['Very Short (10-25)', 'Short (26-50)', 'Medium (51-100)', 'Long (100+)']
-        )
-        stats['length_distribution'] = self.df['length_category'].value_counts().to_dict()
+        stats['length_distribution'] = agg.length_categories().to_dict()
         
         self.stats.update(stats)
         
@@ -136,9 +169,8 @@ class ExploratoryAnalysis:
         """Analyze posting patterns over time"""
         self.logger.info("Performing temporal analysis...")
         
-        # Aggregate by month
-        self.df['year_month'] = self.df['created_utc'].dt.to_period('M')
-        temporal_dist = self.df.groupby('year_month').size()
+        # Documents by month
+        temporal_dist = self.agg.month_series()
         
         # Convert to dict with string keys for JSON serialization
         temporal_dict = {str(k): int(v) for k, v in temporal_dist.items()}
@@ -165,7 +197,7 @@ class ExploratoryAnalysis:
         
         # Posts by document type over time
         ax2 = axes[1]
-        temporal_by_type = self.df.groupby(['year_month', 'doc_type']).size().unstack(fill_value=0)
+        temporal_by_type = self.agg.month_type_frame()
         temporal_by_type.index = temporal_by_type.index.to_timestamp()
         temporal_by_type.plot(ax=ax2, linewidth=2, marker='o', markersize=3)
         ax2.set_title('Posts vs Comments Over Time', fontsize=14, fontweight='bold')
@@ -190,24 +222,24 @@ class ExploratoryAnalysis:
         """Comprehensive vocabulary analysis"""
         self.logger.info("Performing vocabulary analysis...")
         
-        # Flatten all tokens
-        all_tokens = [token for tokens in self.df['tokens'] for token in tokens]
-        token_freq = Counter(all_tokens)
-        
-        # Get top N words
-        top_50 = token_freq.most_common(50)
-        top_100 = token_freq.most_common(100)
+        # Token id counts (ties in order of first occurrence, like Counter.most_common)
+        frequencies = self.agg.term_frequencies
+        ranked = self.agg.ranked_terms()
+        vocabulary = self.corpus.vocabulary
+        top_100 = [(vocabulary[i], int(frequencies[i])) for i in ranked[:100]]
+        top_50 = top_100[:50]
+        total_tokens = int(frequencies.sum())
         
         # Vocabulary statistics
         vocab_stats = {
-            'total_tokens': len(all_tokens),
-            'unique_tokens': len(token_freq),
-            'vocabulary_richness': len(token_freq) / len(all_tokens),  # Type-token ratio
-            'top_50_words': [(word, int(count)) for word, count in top_50],
-            'top_100_words': [(word, int(count)) for word, count in top_100],
-            'singleton_words': sum(1 for count in token_freq.values() if count == 1),
-            'words_appearing_more_than_10_times': sum(1 for count in token_freq.values() if count > 10),
-            'words_appearing_more_than_100_times': sum(1 for count in token_freq.values() if count > 100)
+            'total_tokens': total_tokens,
+            'unique_tokens': len(frequencies),
+            'vocabulary_richness': len(frequencies) / total_tokens,  # Type-token ratio
+            'top_50_words': top_50,
+            'top_100_words': top_100,
+            'singleton_words': int((frequencies == 1).sum()),
+            'words_appearing_more_than_10_times': int((frequencies > 10).sum()),
+            'words_appearing_more_than_100_times': int((frequencies > 100).sum())
         }
         
         self.stats['vocabulary'] = vocab_stats
@@ -217,8 +249,7 @@ class ExploratoryAnalysis:
         
         # Top 30 words bar chart
         ax1 = axes[0]
-        top_30 = token_freq.most_common(30)
-        words, counts = zip(*top_30)
+        words, counts = zip(*top_100[:30])
         y_pos = np.arange(len(words))
         
         ax1.barh(y_pos, counts, color='steelblue', alpha=0.8)
@@ -231,8 +262,7 @@ class ExploratoryAnalysis:
         
         # Word frequency distribution (log scale)
         ax2 = axes[1]
-        frequencies = sorted(token_freq.values(), reverse=True)
-        ax2.plot(range(1, len(frequencies) + 1), frequencies, linewidth=2)
+        ax2.plot(range(1, len(frequencies) + 1), frequencies[ranked], linewidth=2)
         ax2.set_xscale('log')
         ax2.set_yscale('log')
         ax2.set_xlabel('Word Rank (log scale)', fontsize=12)
@@ -258,30 +288,39 @@ class ExploratoryAnalysis:
         """Analyze bigrams and trigrams"""
         self.logger.info("Performing n-gram analysis...")
         
-        # Extract bigrams and trigrams
-        bigrams = []
-        trigrams = []
-        
-        for tokens in self.df['tokens']:
-            if len(tokens) >= 2:
-                bigrams.extend([' '.join(tokens[i:i+2]) for i in range(len(tokens)-1)])
-            if len(tokens) >= 3:
-                trigrams.extend([' '.join(tokens[i:i+3]) for i in range(len(tokens)-2)])
-        
-        bigram_freq = Counter(bigrams)
-        trigram_freq = Counter(trigrams)
-        
-        top_bigrams = bigram_freq.most_common(30)
-        top_trigrams = trigram_freq.most_common(20)
-        
-        self.stats['ngrams'] = {
-            'top_bigrams': [(bg, int(count)) for bg, count in top_bigrams],
-            'top_trigrams': [(tg, int(count)) for tg, count in top_trigrams],
-            'total_bigrams': len(bigrams),
-            'unique_bigrams': len(bigram_freq),
-            'total_trigrams': len(trigrams),
-            'unique_trigrams': len(trigram_freq)
-        }
+        # Bigrams and trigrams were counted as packed token ids during aggregation
+        vocabulary = self.corpus.vocabulary
+        top_bigrams = self.agg.top_ngrams(2, 30, vocabulary)
+        top_trigrams = self.agg.top_ngrams(3, 20, vocabulary)
+        
+        if self.agg.approximate:
+            # Sketches bound each count but do not know the number of distinct n-grams
+            self.stats['ngrams'] = {
+                'mode': 'sketch',
+                'top_bigrams': top_bigrams,
+                'top_trigrams': top_trigrams,
+                'top_bigram_bounds': self.agg.ngram_bounds(2, 30, vocabulary),
+                'top_trigram_bounds': self.agg.ngram_bounds(3, 20, vocabulary),
+                'total_bigrams': self.agg.ngrams[2].total,
+                'unique_bigrams': None,
+                'total_trigrams': self.agg.ngrams[3].total,
+                'unique_trigrams': None,
+                'error_bounds': {
+                    'bigrams': self.agg.ngrams[2].error_bounds(),
+                    'trigrams': self.agg.ngrams[3].error_bounds()
+                }
+            }
+            self.logger.info(f"  - Sketch mode: n-gram counts are upper bounds "
+                             f"(see ngrams.error_bounds in the report)")
+        else:
+            self.stats['ngrams'] = {
+                'top_bigrams': top_bigrams,
+                'top_trigrams': top_trigrams,
+                'total_bigrams': self.agg.ngrams[2].total,
+                'unique_bigrams': len(self.agg.ngrams[2]),
+                'total_trigrams': self.agg.ngrams[3].total,
+                'unique_trigrams': len(self.agg.ngrams[3])
+            }
         
         # Visualize top bigrams and trigrams
         fig, axes = plt.subplots(1, 2, figsize=(16, 8))
@@ -326,8 +365,10 @@ class ExploratoryAnalysis:
         """Create overall word cloud"""
         self.logger.info("Generating word cloud...")
         
-        # Combine all tokens
-        all_text = ' '.join([' '.join(tokens) for tokens in self.df['tokens']])
+        # Token frequencies from the aggregates
+        frequencies = self.agg.term_frequencies
+        vocabulary = self.corpus.vocabulary
+        word_frequencies = {vocabulary[i]: int(frequencies[i]) for i in self.agg.ranked_terms()}
         
         # Generate word cloud
         wordcloud = WordCloud(
@@ -338,7 +379,7 @@ class ExploratoryAnalysis:
             max_words=150,
             relative_scaling=0.5,
             min_font_size=10
-        ).generate(all_text)
+        ).generate_from_frequencies(word_frequencies)
         
         # Plot
         fig, ax = plt.subplots(figsize=(16, 8))
@@ -362,18 +403,18 @@ class ExploratoryAnalysis:
         """Analyze subreddit-specific patterns"""
         self.logger.info("Analyzing subreddit patterns...")
         
+        agg = self.agg
         subreddit_stats = {}
         
-        for subreddit in self.df['subreddit'].unique():
-            sub_df = self.df[self.df['subreddit'] == subreddit]
-            
+        for subreddit, count in agg.subreddits.items():
+            earliest, latest = agg.subreddit_dates[subreddit]
             subreddit_stats[subreddit] = {
-                'document_count': int(len(sub_df)),
-                'avg_tokens': float(sub_df['token_count'].mean()),
-                'avg_score': float(sub_df['score'].mean()),
+                'document_count': int(count),
+                'avg_tokens': agg.subreddit_tokens[subreddit] / count,
+                'avg_score': float(agg.subreddit_scores[subreddit] / count),
                 'date_range': {
-                    'earliest': str(sub_df['created_utc'].min()),
-                    'latest': str(sub_df['created_utc'].max())
+                    'earliest': str(earliest),
+                    'latest': str(latest)
                 }
             }
         
@@ -384,7 +425,7 @@ class ExploratoryAnalysis:
         
         # Document count by subreddit
         ax1 = axes[0]
-        subreddit_counts = self.df['subreddit'].value_counts()
+        subreddit_counts = pd.Series(dict(agg.subreddits.most_common()), dtype=np.int64)
         subreddit_counts.plot(kind='bar', ax=ax1, color='skyblue', alpha=0.8)
         ax1.set_title('Documents by Subreddit', fontsize=14, fontweight='bold')
         ax1.set_xlabel('Subreddit', fontsize=12)
@@ -394,7 +435,10 @@ class ExploratoryAnalysis:
         
         # Average token count by subreddit
         ax2 = axes[1]
-        avg_tokens = self.df.groupby('subreddit')['token_count'].mean().sort_values(ascending=False)
+        avg_tokens = pd.Series(
+            {subreddit: stats['avg_tokens'] for subreddit, stats in sorted(subreddit_stats.items())},
+            dtype=np.float64
+        ).sort_values(ascending=False)
         avg_tokens.plot(kind='bar', ax=ax2, color='lightcoral', alpha=0.8)
         ax2.set_title('Average Token Count by Subreddit', fontsize=14, fontweight='bold')
         ax2.set_xlabel('Subreddit', fontsize=12)
@@ -418,22 +462,32 @@ class ExploratoryAnalysis:
         """Analyze document length distributions"""
         self.logger.info("Analyzing document lengths...")
         
+        # Panels are drawn from the exact length histograms, or from the weighted
+        # sample in sampling mode; the mean and categories are always exact
+        if self.agg.sample is not None:
+            lengths, lengths_by_type = self.agg.sample.length_histograms()
+            self.logger.info(f"  - Plotting a {self.agg.sample.method} sample of "
+                             f"{len(self.agg.sample):,} documents")
+        else:
+            lengths, lengths_by_type = self.agg.lengths, self.agg.lengths_by_type
         fig, axes = plt.subplots(2, 2, figsize=(14, 10))
         
         # Overall distribution
         ax1 = axes[0, 0]
-        self.df['token_count'].hist(bins=50, ax=ax1, color='steelblue', alpha=0.7, edgecolor='black')
+        values, counts = lengths.arrays()
+        ax1.hist(values, bins=50, weights=counts, color='steelblue', alpha=0.7, edgecolor='black')
         ax1.set_title('Token Count Distribution', fontsize=12, fontweight='bold')
         ax1.set_xlabel('Token Count', fontsize=10)
         ax1.set_ylabel('Frequency', fontsize=10)
-        ax1.axvline(self.df['token_count'].mean(), color='red', linestyle='--', 
-                   linewidth=2, label=f'Mean: {self.df["token_count"].mean():.1f}')
+        ax1.axvline(self.agg.lengths.mean(), color='red', linestyle='--', 
+                   linewidth=2, label=f'Mean: {self.agg.lengths.mean():.1f}')
         ax1.legend()
         ax1.grid(alpha=0.3)
         
         # Box plot by document type
         ax2 = axes[0, 1]
-        self.df.boxplot(column='token_count', by='doc_type', ax=ax2)
+        by_type = sorted(lengths_by_type.items())
+        ax2.bxp([histogram.box_stats(doc_type) for doc_type, histogram in by_type])
         ax2.set_title('Token Count by Document Type', fontsize=12, fontweight='bold')
         ax2.set_xlabel('Document Type', fontsize=10)
         ax2.set_ylabel('Token Count', fontsize=10)
@@ -442,7 +496,7 @@ class ExploratoryAnalysis:
         
         # Length category distribution
         ax3 = axes[1, 0]
-        length_dist = self.df['length_category'].value_counts()
+        length_dist = self.agg.length_categories()
         length_dist.plot(kind='bar', ax=ax3, color='lightgreen', alpha=0.8, edgecolor='black')
         ax3.set_title('Document Length Categories', fontsize=12, fontweight='bold')
         ax3.set_xlabel('Length Category', fontsize=10)
@@ -452,8 +506,7 @@ class ExploratoryAnalysis:
         
         # Cumulative distribution
         ax4 = axes[1, 1]
-        sorted_tokens = np.sort(self.df['token_count'])
-        cumulative = np.arange(1, len(sorted_tokens) + 1) / len(sorted_tokens) * 100
+        sorted_tokens, cumulative = lengths.cdf_points()
         ax4.plot(sorted_tokens, cumulative, linewidth=2, color='purple')
         ax4.set_title('Cumulative Distribution of Token Counts', fontsize=12, fontweight='bold')
         ax4.set_xlabel('Token Count', fontsize=10)
@@ -477,14 +530,16 @@ class ExploratoryAnalysis:
         report = {
             'report_metadata': {
                 'generated_at': datetime.now().isoformat(),
-                'data_source': 'combined_processed.csv',
-                'total_documents_analyzed': int(len(self.df))
+                'data_source': 'combined_processed.parquet',
+                'total_documents_analyzed': int(self.agg.documents),
+                'cache': self.cache.stats if self.cache else None
             },
             'basic_statistics': self.stats.get('basic_statistics', {}),
             'temporal_analysis': self.stats.get('temporal_distribution', {}),
             'vocabulary': self.stats.get('vocabulary', {}),
             'ngrams': self.stats.get('ngrams', {}),
             'subreddit_analysis': self.stats.get('subreddit_analysis', {}),
+            'plotting': self._plotting_summary(),
             'key_findings': self._generate_key_findings()
         }
         
@@ -499,12 +554,29 @@ class ExploratoryAnalysis:
         
         return report
     
+    def _plotting_summary(self):
+        """Which plots were drawn from exact aggregates and which from a sample"""
+        sampled = self.agg.sample is not None
+        summary = {
+            'statistics': 'exact',
+            'plots': {
+                'document_length_analysis': 'sampled' if sampled else 'exact',
+                'temporal_analysis': 'exact',  # One point per month either way
+                'vocabulary_analysis': 'exact',
+                'ngram_analysis': 'sketch' if self.agg.approximate else 'exact',
+                'subreddit_analysis': 'exact'
+            }
+        }
+        if sampled:
+            summary['sample'] = self.agg.sample.summary()
+        return summary
+    
     def _generate_key_findings(self):
         """Generate key findings from EDA"""
         findings = []
         
         # Data coverage
-        findings.append(f"Dataset contains {len(self.df):,} documents spanning "
+        findings.append(f"Dataset contains {self.agg.documents:,} documents spanning "
                        f"{self.stats.get('date_range', {}).get('span_days', 0)} days")
         
         # Top topics from vocabulary
@@ -530,6 +602,55 @@ class ExploratoryAnalysis:
         
         return findings
     
+    def _section_inputs(self, name):
+        """Everything a section's stats and figures are derived from"""
+        agg = self.agg
+        if self._vocabulary_fingerprint is None:
+            self._vocabulary_fingerprint = fingerprint(self.corpus.vocabulary)
+        return {
+            'basic_statistics': lambda: (
+                agg.documents, self.total_posts, self.total_comments, agg.earliest, agg.latest,
+                agg.subreddits, agg.doc_types, agg.lengths.counts, agg.scores.counts
+            ),
+            'temporal_analysis': lambda: (agg.months, agg.months_by_type),
+            'vocabulary_analysis': lambda: (self._vocabulary_fingerprint, agg.term_frequencies, agg.first_seen),
+            'ngram_analysis': lambda: (self._vocabulary_fingerprint, agg.ngrams),
+            'generate_initial_wordcloud': lambda: (
+                self._vocabulary_fingerprint, agg.term_frequencies, agg.first_seen
+            ),
+            'subreddit_analysis': lambda: (
+                agg.subreddits, agg.subreddit_tokens, agg.subreddit_scores, agg.subreddit_dates
+            ),
+            'document_length_analysis': lambda: (agg.lengths.counts, agg.lengths_by_type, agg.sample)
+        }[name]()
+    
+    def _run_section(self, name, figures=()):
+        """
+        Run an analysis section, or reuse its cached results
+        
+        Args:
+            name: Analysis method name
+            figures: File names of the figures it saves in the EDA directory
+        """
+        analysis = getattr(self, name)
+        if self.cache is None:
+            analysis()
+            return
+        
+        figure_paths = [os.path.join(self.eda_viz_path, figure) for figure in figures]
+        section_fingerprint = fingerprint(self._section_inputs(name))
+        cached = self.cache.load_section(name, section_fingerprint, figure_paths)
+        if cached is not None:
+            self.stats.update(cached)
+            self.logger.info(f"{name}: inputs unchanged; reusing cached results")
+            return
+        
+        before = dict(self.stats)
+        analysis()
+        added = {key: value for key, value in self.stats.items()
+                 if key not in before or before[key] is not value}
+        self.cache.save_section(name, section_fingerprint, added, figure_paths)
+    
     def run_full_analysis(self):
         """Run complete EDA pipeline"""
         self.logger.info("="*60)
@@ -543,13 +664,13 @@ class ExploratoryAnalysis:
         
         # Run all analyses
         try:
-            self.basic_statistics()
-            self.temporal_analysis()
-            self.vocabulary_analysis()
-            self.ngram_analysis()
-            self.generate_initial_wordcloud()
-            self.subreddit_analysis()
-            self.document_length_analysis()
+            self._run_section('basic_statistics')
+            self._run_section('temporal_analysis', ['temporal_analysis.png'])
+            self._run_section('vocabulary_analysis', ['vocabulary_analysis.png'])
+            self._run_section('ngram_analysis', ['ngram_analysis.png'])
+            self._run_section('generate_initial_wordcloud', ['overall_wordcloud.png'])
+            self._run_section('subreddit_analysis', ['subreddit_analysis.png'])
+            self._run_section('document_length_analysis', ['document_length_analysis.png'])
             
             # Generate final report
             report = self.create_eda_report()
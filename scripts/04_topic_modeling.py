@@ -18,7 +18,8 @@ from gensim import corpora
 from gensim.models import LdaModel, CoherenceModel
 from gensim.models.ldamulticore import LdaMulticore
 
-from utils import setup_logger, load_config, save_json
+from utils import setup_logger, load_config, save_json, load_dataframe, save_dataframe
+from encoded_corpus import EncodedCorpus
 
 
 class TopicModeler:
@@ -47,7 +48,8 @@ class TopicModeler:
         self.df = None
         self.corpus = None
         self.dictionary = None
-        self.texts = None
+        self.encoded = None  # EncodedCorpus, row-aligned with self.df
+        self.texts = None  # Token lists, decoded on demand for coherence
         self.models = {}
         self.coherence_scores = {}
         self.best_model = None
@@ -61,18 +63,16 @@ class TopicModeler:
         
         try:
             # Load processed dataframe
-            df_path = os.path.join(self.processed_path, 'combined_processed.csv')
-            self.df = pd.read_csv(df_path)
+            df_path = os.path.join(self.processed_path, 'combined_processed.parquet')
+            self.df = load_dataframe(df_path, exclude=['tokens'])
             
-            # Parse tokens column
-            import ast
-            self.df['tokens'] = self.df['tokens'].apply(ast.literal_eval)
+            # Token ids and vocabulary written by preprocessing
+            self.encoded = EncodedCorpus(os.path.join(self.processed_path, 'token_ids'))
+            if not np.array_equal(self.encoded.lengths(), self.df['token_count'].to_numpy()):
+                raise ValueError("Encoded corpus does not match combined_processed; rerun preprocessing")
             
-            # Extract token lists
-            self.texts = self.df['tokens'].tolist()
-            
-            self.logger.info(f"Loaded {len(self.texts)} documents")
-            self.logger.info(f"Sample text: {self.texts[0][:10]}...")
+            self.logger.info(f"Loaded {len(self.encoded)} documents")
+            self.logger.info(f"Sample text: {self.encoded.tokens(0)[:10]}...")
             
             return True
             
@@ -86,7 +86,7 @@ class TopicModeler:
         
         try:
             # Create dictionary
-            self.dictionary = corpora.Dictionary(self.texts)
+            self.dictionary = self.build_dictionary()
             
             self.logger.info(f"Initial dictionary size: {len(self.dictionary)}")
             
@@ -102,11 +102,16 @@ class TopicModeler:
             
             self.logger.info(f"Filtered dictionary size: {len(self.dictionary)}")
             
-            # Create corpus (bag of words)
-            self.corpus = [self.dictionary.doc2bow(text) for text in tqdm(
-                self.texts, 
-                desc="Creating corpus"
-            )]
+            # Create corpus (bag of words), mapping encoded ids to dictionary ids
+            id_map = np.full(len(self.encoded.vocabulary), -1, dtype=np.int64)
+            for token, token_id in self.dictionary.token2id.items():
+                id_map[self.encoded.token2id[token]] = token_id
+            
+            self.corpus = []
+            for i in tqdm(range(len(self.encoded)), desc="Creating corpus"):
+                doc = id_map[self.encoded.doc(i)]
+                ids, counts = np.unique(doc[doc >= 0], return_counts=True)
+                self.corpus.append(list(zip(ids.tolist(), counts.tolist())))
             
             self.logger.info(f"Corpus created with {len(self.corpus)} documents")
             
@@ -126,6 +131,28 @@ class TopicModeler:
             self.logger.error(f"Error preparing corpus: {e}", exc_info=True)
             return False
     
+    def build_dictionary(self):
+        """
+        Gensim dictionary from the encoded corpus
+        
+        The encoded vocabulary uses gensim's id assignment, so this matches
+        corpora.Dictionary(texts) without decoding a single document.
+        
+        Returns:
+            Dictionary: Unfiltered dictionary
+        """
+        dfs, num_nnz = self.encoded.document_frequencies()
+        cfs = self.encoded.term_frequencies()
+        
+        dictionary = corpora.Dictionary()
+        dictionary.token2id = dict(self.encoded.token2id)
+        dictionary.dfs = dict(enumerate(dfs.tolist()))
+        dictionary.cfs = dict(enumerate(cfs.tolist()))
+        dictionary.num_docs = len(self.encoded)
+        dictionary.num_pos = self.encoded.num_tokens
+        dictionary.num_nnz = int(num_nnz)
+        return dictionary
+    
     def train_lda_model(self, num_topics):
         """Train LDA model with specified number of topics"""
         self.logger.info(f"Training LDA model with {num_topics} topics...")
@@ -166,6 +193,9 @@ class TopicModeler:
         self.logger.info(f"Calculating coherence for {num_topics} topics...")
         
         try:
+            if self.texts is None:
+                self.texts = list(self.encoded)
+            
             coherence_model = CoherenceModel(
                 model=model,
                 texts=self.texts,
@@ -311,8 +341,8 @@ class TopicModeler:
                 self.logger.info(f"  Topic {topic_id}: {count} docs ({percentage:.1f}%)")
             
             # Save documents with topics
-            output_path = os.path.join(self.processed_path, 'documents_with_topics.csv')
-            self.df.to_csv(output_path, index=False)
+            output_path = os.path.join(self.processed_path, 'documents_with_topics.parquet')
+            save_dataframe(self.df, output_path, format='parquet')
             
             self.logger.info(f"Documents with topics saved to {output_path}")
             
@@ -476,7 +506,7 @@ def main():
     
     print(f"\nFiles saved:")
     print(f"  - Model: models/lda/lda_model_best.model")
-    print(f"  - Documents with topics: data/processed/documents_with_topics.csv")
+    print(f"  - Documents with topics: data/processed/documents_with_topics.parquet")
     print(f"  - Report: data/metadata/topic_modeling_report.json")
     print(f"  - Coherence comparison: models/evaluation/topic_coherence_comparison.csv")
     
@@ -14,7 +14,7 @@ from tqdm import tqdm
 
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 
-from utils import setup_logger, load_config, save_json
+from utils import setup_logger, load_config, save_json, load_dataframe, save_dataframe
 
 
 class SentimentAnalyzer:
@@ -51,8 +51,8 @@ class SentimentAnalyzer:
         self.logger.info("Loading documents with topics...")
         
         try:
-            df_path = os.path.join(self.processed_path, 'documents_with_topics.csv')
-            self.df = pd.read_csv(df_path)
+            df_path = os.path.join(self.processed_path, 'documents_with_topics.parquet')
+            self.df = load_dataframe(df_path)
             
             # Convert timestamp to datetime
             self.df['created_utc'] = pd.to_datetime(self.df['created_utc'])
@@ -125,8 +125,8 @@ class SentimentAnalyzer:
                 self.logger.info(f"  {sentiment}: {count} ({pct:.1f}%)")
             
             # Save documents with sentiment
-            output_path = os.path.join(self.processed_path, 'documents_with_sentiment.csv')
-            self.df.to_csv(output_path, index=False)
+            output_path = os.path.join(self.processed_path, 'documents_with_sentiment.parquet')
+            save_dataframe(self.df, output_path, format='parquet')
             
             self.logger.info(f"Documents with sentiment saved to {output_path}")
             
@@ -440,7 +440,7 @@ def main():
             print(f"  Topic {topic_id}: {mean:.4f}")
     
     print(f"\nFiles saved:")
-    print(f"  - Documents with sentiment: data/processed/documents_with_sentiment.csv")
+    print(f"  - Documents with sentiment: data/processed/documents_with_sentiment.parquet")
     print(f"  - Sentiment by topic: data/processed/sentiment_by_topic.csv")
     print(f"  - Temporal sentiment: data/processed/sentiment_temporal.csv")
     print(f"  - Topic-temporal sentiment: data/processed/sentiment_topic_temporal.csv")
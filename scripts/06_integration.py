@@ -13,7 +13,8 @@ import logging
 from scipy import stats
 from collections import Counter
 
-from utils import setup_logger, load_config, save_json
+from utils import setup_logger, load_config, save_json, load_dataframe
+from encoded_corpus import EncodedCorpus
 
 
 class IntegrationAnalyzer:
@@ -34,6 +35,8 @@ class IntegrationAnalyzer:
         
         # Data containers
         self.df = None
+        self.encoded = None  # EncodedCorpus of combined_processed
+        self.corpus_rows = None  # Row of each document of self.df in the encoded corpus (-1 if absent)
         self.topic_names = {}
         
         self.logger.info("Integration Analyzer initialized")
@@ -43,16 +46,19 @@ class IntegrationAnalyzer:
         self.logger.info("Loading integrated dataset...")
         
         try:
-            df_path = os.path.join(self.processed_path, 'documents_with_sentiment.csv')
-            self.df = pd.read_csv(df_path)
+            df_path = os.path.join(self.processed_path, 'documents_with_sentiment.parquet')
+            self.df = load_dataframe(df_path)
             
             # Convert timestamp
             self.df['created_utc'] = pd.to_datetime(self.df['created_utc'])
             
-            # Parse tokens if needed
-            if isinstance(self.df['tokens'].iloc[0], str):
-                import ast
-                self.df['tokens'] = self.df['tokens'].apply(ast.literal_eval)
+            # Token ids for keyword analysis, located through combined_processed doc ids
+            self.encoded = EncodedCorpus(os.path.join(self.processed_path, 'token_ids'))
+            corpus_doc_ids = load_dataframe(
+                os.path.join(self.processed_path, 'combined_processed.parquet'),
+                columns=['doc_id']
+            )['doc_id']
+            self.corpus_rows = pd.Index(corpus_doc_ids).get_indexer(self.df['doc_id'])
             
             self.logger.info(f"Loaded {len(self.df)} documents with all features")
             self.logger.info(f"Columns: {list(self.df.columns)}")
@@ -255,29 +261,34 @@ class IntegrationAnalyzer:
                 'doctor', 'prescribe', 'dose', 'injection'
             ]
             
+            # Documents containing each keyword as a token, aligned with self.df
+            in_corpus = self.corpus_rows >= 0
+            keyword_masks = {}
+            for keyword in keywords:
+                mask = np.zeros(len(self.df), dtype=bool)
+                mask[in_corpus] = self.encoded.documents_containing(keyword)[self.corpus_rows[in_corpus]]
+                keyword_masks[keyword] = mask
+            
             for topic_id in sorted(self.df['dominant_topic'].unique()):
                 topic_name = self.topic_names[topic_id]
-                topic_df = self.df[self.df['dominant_topic'] == topic_id]
+                topic_mask = (self.df['dominant_topic'] == topic_id).to_numpy()
                 
                 keyword_analysis[topic_name] = {}
                 
                 for sentiment in ['positive', 'negative', 'neutral']:
-                    sent_df = topic_df[topic_df['sentiment_class'] == sentiment]
+                    sent_mask = topic_mask & (self.df['sentiment_class'] == sentiment).to_numpy()
+                    sent_count = int(sent_mask.sum())
                     
-                    if len(sent_df) == 0:
+                    if sent_count == 0:
                         continue
                     
-                    # Count keyword mentions
+                    # Count documents mentioning each keyword
                     keyword_counts = {}
                     for keyword in keywords:
-                        count = sent_df['cleaned_text'].str.contains(
-                            keyword, 
-                            case=False, 
-                            na=False
-                        ).sum()
+                        count = int((keyword_masks[keyword] & sent_mask).sum())
                         
                         if count > 0:
-                            percentage = (count / len(sent_df)) * 100
+                            percentage = (count / sent_count) * 100
                             keyword_counts[keyword] = {
                                 'count': int(count),
                                 'percentage': float(percentage)
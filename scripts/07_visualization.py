@@ -14,7 +14,7 @@ from datetime import datetime
 import pickle
 import logging
 
-from utils import setup_logger, load_config
+from utils import setup_logger, load_config, load_dataframe
 
 
 class Visualizer:
@@ -69,9 +69,12 @@ class Visualizer:
         self.logger.info("Loading data...")
         
         try:
-            # Load final dataset
-            df_path = os.path.join(self.processed_path, 'documents_with_sentiment.csv')
-            self.df = pd.read_csv(df_path)
+            # Load final dataset (only the columns the charts use)
+            df_path = os.path.join(self.processed_path, 'documents_with_sentiment.parquet')
+            self.df = load_dataframe(df_path, columns=[
+                'doc_id', 'created_utc', 'cleaned_text',
+                'dominant_topic', 'compound', 'sentiment_class'
+            ])
             
             # Add topic names
             self.df['topic_name'] = self.df['dominant_topic'].map(self.topic_names)
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Collection Benchmark
+Runs the collectors against the local mock Reddit API and reports throughput,
+requests issued and time spent sleeping
+"""
+
+import argparse
+import copy
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config.config_loader import ConfigLoader
+from mock_reddit_server import MockRedditServer, SyntheticCorpus
+
+# Import the scraper classes
+import importlib.util
+spec = importlib.util.spec_from_file_location("data_collection",
+                                               Path(__file__).parent / "01_data_collection.py")
+collection_module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(collection_module)
+RedditScraper = collection_module.RedditScraper
+PooledRedditScraper = collection_module.PooledRedditScraper
+AsyncRedditScraper = collection_module.AsyncRedditScraper
+
+
+def build_config(base_config, server_url, args):
+    """Point a copy of the project config at the mock server"""
+    config = copy.deepcopy(base_config)
+    config['reddit'] = {
+        'client_id': 'mock_client_id',
+        'client_secret': 'mock_client_secret',
+        'user_agent': 'semaglutide_research_benchmark',
+        'oauth_url': server_url,
+        'reddit_url': server_url,
+        # Extra apps, used by the pool mode only
+        'credentials': [
+            {'client_id': f'mock_client_id_{i + 2}', 'client_secret': 'mock_client_secret'}
+            for i in range(args.clients - 1)
+        ]
+    }
+
+    collection = config['data_collection']
+    if args.batch_pause is not None:
+        collection['batch_pause_seconds'] = args.batch_pause
+    if args.requests_per_minute is not None:
+        collection.setdefault('rate_limit', {})['requests_per_minute'] = args.requests_per_minute
+    return config
+
+
+def run_mode(mode, config, server, args):
+    """
+    Run one collector in a scratch working directory
+
+    Returns:
+        dict: Benchmark results for the mode
+    """
+    scraper_classes = {'sync': RedditScraper, 'pool': PooledRedditScraper, 'async': AsyncRedditScraper}
+    scraper_class = scraper_classes[mode]
+    if mode != 'pool':
+        config = {**config, 'reddit': {**config['reddit'], 'credentials': []}}
+    server.reset_counts()
+
+    original_cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix=f'collection_benchmark_{mode}_') as workdir:
+        os.chdir(workdir)
+        try:
+            scraper = scraper_class(config, incremental=args.incremental)
+
+            start = time.perf_counter()
+            scraper.collect_data(target_posts=args.target, max_runtime_hours=args.hours)
+            collect_seconds = time.perf_counter() - start
+
+            start = time.perf_counter()
+            scraper.save_final_data()
+            save_seconds = time.perf_counter() - start
+        finally:
+            os.chdir(original_cwd)
+
+    limiter = scraper._rate_limit_report()
+    requests = dict(server.counts)
+    posts = len(scraper.posts_collected)
+    comments = len(scraper.comments_collected)
+
+    return {
+        'mode': mode,
+        'posts': posts,
+        'comments': comments,
+        'collect_seconds': collect_seconds,
+        'save_seconds': save_seconds,
+        'posts_per_second': posts / max(collect_seconds, 1e-9),
+        'comments_per_second': comments / max(collect_seconds, 1e-9),
+        'requests': {
+            'total': sum(v for k, v in requests.items() if k not in ('429', '5xx')),
+            'by_endpoint': requests,
+            'rate_limiter_tokens_used': limiter['tokens_used']
+        },
+        'sleep_seconds': {
+            # Summed over concurrent waiters in pool and async modes
+            'rate_limiter': limiter['wait_seconds'],
+            'backoff_and_pauses': scraper.sleep_seconds
+        },
+        'comment_expansion': scraper._comment_expansion_stats(),
+        'total_errors': scraper.total_errors
+    }
+
+
+def print_results(results):
+    """Print a comparison table"""
+    print("\n" + "=" * 80)
+    print("COLLECTION BENCHMARK")
+    print("=" * 80)
+    print(f"{'Mode':<8}{'Posts':>8}{'Comments':>10}{'Seconds':>10}{'Posts/s':>10}"
+          f"{'Comments/s':>12}{'Requests':>10}{'Slept (s)':>11}")
+    for r in results:
+        slept = r['sleep_seconds']['rate_limiter'] + r['sleep_seconds']['backoff_and_pauses']
+        print(f"{r['mode']:<8}{r['posts']:>8,}{r['comments']:>10,}{r['collect_seconds']:>10.1f}"
+              f"{r['posts_per_second']:>10.2f}{r['comments_per_second']:>12.2f}"
+              f"{r['requests']['total']:>10,}{slept:>11.1f}")
+    print("=" * 80)
+
+
+def main():
+    """Main execution"""
+    parser = argparse.ArgumentParser(
+        description='Benchmark the collectors against a local mock Reddit API',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Compare the sequential, sharded (3 apps) and concurrent collectors:
+  python scripts/benchmark_collection.py --clients 3
+
+  # Slow, flaky API with Reddit's real quota:
+  python scripts/benchmark_collection.py --latency 0.3 --error-rate 0.02 --quota 1000 --window 600
+        """
+    )
+    parser.add_argument('--modes', nargs='+', choices=['sync', 'pool', 'async'],
+                        default=['sync', 'pool', 'async'])
+    parser.add_argument('--clients', type=int, default=3, help='OAuth apps in pool mode (default: 3)')
+    parser.add_argument('--target', type=int, default=200, help='Target posts per run (default: 200)')
+    parser.add_argument('--hours', type=float, default=0.25, help='Maximum runtime per run in hours')
+    parser.add_argument('--incremental', action='store_true', help='Benchmark incremental mode')
+    parser.add_argument('--latency', type=float, default=0.05, help='Mean mock latency per request (seconds)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Probability of a 503 response')
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help='Probability of a spurious 429')
+    parser.add_argument('--quota', type=int, default=6000, help='Mock requests per rate-limit window')
+    parser.add_argument('--window', type=int, default=60, help='Mock rate-limit window (seconds)')
+    parser.add_argument('--posts-per-subreddit', type=int, default=500)
+    parser.add_argument('--batch-pause', type=float, default=None,
+                        help='Override data_collection.batch_pause_seconds')
+    parser.add_argument('--requests-per-minute', type=float, default=None,
+                        help='Override the rate limiter rate used before quota headers arrive')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', default='data/metadata/collection_benchmark.json')
+    args = parser.parse_args()
+
+    base_config = ConfigLoader().load()
+
+    corpus = SyntheticCorpus(
+        keywords=base_config['data_collection']['keywords'],
+        posts_per_subreddit=args.posts_per_subreddit,
+        seed=args.seed
+    )
+    server = MockRedditServer(
+        corpus=corpus, latency=args.latency, error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate, quota=args.quota, window_seconds=args.window
+    ).start()
+    print(f"Mock Reddit API listening on {server.url}")
+
+    config = build_config(base_config, server.url, args)
+    results = []
+    try:
+        for mode in args.modes:
+            if mode == 'async' and collection_module.asyncpraw is None:
+                print("Skipping async mode: asyncpraw is not installed")
+                continue
+            print(f"\nRunning {mode} collector (target: {args.target} posts)...")
+            results.append(run_mode(mode, config, server, args))
+    finally:
+        server.stop()
+
+    print_results(results)
+
+    report = {
+        'timestamp': datetime.now().isoformat(),
+        'settings': {k: v for k, v in vars(args).items() if k != 'output'},
+        'results': results
+    }
+    output_path = Path(args.output)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nSaved benchmark report to {output_path}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Preprocessing Benchmark
+Compares the spaCy and lookup tokenization engines on collected documents:
+throughput and how closely the lookup tokens agree with spaCy's
+"""
+
+import argparse
+import copy
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+import pandas as pd
+from config.config_loader import ConfigLoader
+from utils import load_dataframe, save_json, clean_texts
+
+# Import the preprocessor class
+import importlib.util
+spec = importlib.util.spec_from_file_location("data_preprocessing",
+                                               Path(__file__).parent / "02_data_preprocessing.py")
+preprocessing_module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(preprocessing_module)
+TextPreprocessor = preprocessing_module.TextPreprocessor
+
+
+def load_documents(args):
+    """
+    Cleaned, lowercased texts of a random sample of posts and comments
+
+    Without --table, a further table_sample documents are drawn to build the
+    lemma table, so agreement is measured on documents the table never saw.
+
+    Returns:
+        tuple: (evaluation texts, lemma table build texts)
+    """
+    posts = load_dataframe(args.posts)
+    comments = load_dataframe(args.comments)
+    texts = pd.concat([
+        posts['title'].fillna('') + ' ' + posts['selftext'].fillna(''),
+        comments['body'].fillna('')
+    ], ignore_index=True)
+    build_size = 0 if args.table else args.table_sample
+    texts = texts.sample(n=min(args.docs + build_size, len(texts)), random_state=args.seed)
+    cleaned = [text for text in clean_texts(texts, lowercase=True) if text]
+    build_texts = cleaned[:build_size]
+    seen = set(build_texts)  # Reposted texts would leak into the evaluation
+    return [text for text in cleaned[build_size:] if text not in seen], build_texts
+
+
+def build_config(base_config, engine, table_path, args):
+    """Preprocessing config for one engine, without the token cache"""
+    config = copy.deepcopy(base_config)
+    preproc = config['preprocessing']
+    preproc['engine'] = engine
+    preproc['token_cache'] = {'enabled': False}
+    preproc.setdefault('spacy', {}).update({'batch_size': args.batch_size, 'n_process': args.n_process})
+    preproc['lookup'] = {'table_path': table_path, 'build_sample': args.table_sample}
+    return config
+
+
+def token_agreement(spacy_tokens, lookup_tokens):
+    """
+    Agreement of the lookup tokens with the spaCy tokens
+
+    Returns:
+        dict: Share of documents with identical token lists, token overlap
+              (shared tokens over the longer list, summed over documents)
+              and vocabulary overlap (Jaccard)
+    """
+    identical = 0
+    shared = 0
+    longer = 0
+    for a, b in zip(spacy_tokens, lookup_tokens):
+        identical += a == b
+        shared += sum((Counter(a) & Counter(b)).values())
+        longer += max(len(a), len(b))
+    vocab_a = {t for doc in spacy_tokens for t in doc}
+    vocab_b = {t for doc in lookup_tokens for t in doc}
+    return {
+        'identical_documents': identical / max(len(spacy_tokens), 1),
+        'token_overlap': shared / max(longer, 1),
+        'vocabulary_jaccard': len(vocab_a & vocab_b) / max(len(vocab_a | vocab_b), 1),
+        'spacy_vocabulary': len(vocab_a),
+        'lookup_vocabulary': len(vocab_b)
+    }
+
+
+def print_results(results):
+    """Print a comparison table"""
+    print("\n" + "=" * 80)
+    print("PREPROCESSING BENCHMARK")
+    print("=" * 80)
+    print(f"{'Engine':<10}{'Docs':>10}{'Seconds':>10}{'Docs/s':>12}{'Tokens':>12}")
+    for engine in ('spacy', 'lookup'):
+        r = results[engine]
+        print(f"{engine:<10}{results['documents']:>10,}{r['seconds']:>10.2f}"
+              f"{r['docs_per_second']:>12,.0f}{r['tokens']:>12,}")
+    agreement = results['agreement']
+    print("-" * 80)
+    print(f"Speedup: {results['speedup']:.1f}x  (lemma table build: {results['table_build_seconds']:.1f}s, one-off)")
+    print(f"Identical documents: {agreement['identical_documents']:.1%}  "
+          f"Token overlap: {agreement['token_overlap']:.1%}  "
+          f"Vocabulary Jaccard: {agreement['vocabulary_jaccard']:.1%}")
+    print("=" * 80)
+
+
+def main():
+    """Main execution"""
+    parser = argparse.ArgumentParser(
+        description='Benchmark the spaCy and lookup preprocessing engines',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # 5,000 documents, lemma table built from a 2,000-document sample:
+  python scripts/benchmark_preprocessing.py --docs 5000 --table-sample 2000
+
+  # Evaluate the table 02_data_preprocessing.py uses:
+  python scripts/benchmark_preprocessing.py --table data/processed/lemma_table.json
+        """
+    )
+    parser.add_argument('--posts', default='data/raw/posts.csv')
+    parser.add_argument('--comments', default='data/raw/comments.csv')
+    parser.add_argument('--docs', type=int, default=5000, help='Documents to tokenize (default: 5000)')
+    parser.add_argument('--table', default=None,
+                        help='Existing lemma table to evaluate (default: build a fresh one)')
+    parser.add_argument('--table-sample', type=int, default=2000,
+                        help='Documents (not among the benchmarked ones) spaCy lemmatizes '
+                             'to build a fresh table (default: 2000)')
+    parser.add_argument('--batch-size', type=int, default=256)
+    parser.add_argument('--n-process', type=int, default=1, help='spaCy worker processes (default: 1)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', default='data/metadata/preprocessing_benchmark.json')
+    args = parser.parse_args()
+
+    base_config = ConfigLoader().load()
+    texts, build_texts = load_documents(args)
+    print(f"Benchmarking {len(texts):,} documents"
+          + (f" (lemma table built from {len(build_texts):,} others)" if build_texts else ""))
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        table_path = args.table or str(Path(tmp_dir) / 'lemma_table.json')
+
+        spacy_preprocessor = TextPreprocessor(build_config(base_config, 'spacy', table_path, args))
+        start = time.perf_counter()
+        spacy_tokens = spacy_preprocessor.tokenize_batch(texts)
+        spacy_seconds = time.perf_counter() - start
+
+        lookup_preprocessor = TextPreprocessor(build_config(base_config, 'lookup', table_path, args))
+        start = time.perf_counter()
+        lookup_preprocessor.get_lookup_lemmatizer(build_texts)
+        table_build_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        lookup_tokens = lookup_preprocessor.tokenize_batch(texts)
+        lookup_seconds = time.perf_counter() - start
+        table_words = len(lookup_preprocessor.lookup_lemmatizer.table)
+
+    results = {
+        'documents': len(texts),
+        'table_build_documents': len(build_texts),
+        'spacy': {
+            'seconds': spacy_seconds,
+            'docs_per_second': len(texts) / max(spacy_seconds, 1e-9),
+            'tokens': sum(len(t) for t in spacy_tokens)
+        },
+        'lookup': {
+            'seconds': lookup_seconds,
+            'docs_per_second': len(texts) / max(lookup_seconds, 1e-9),
+            'tokens': sum(len(t) for t in lookup_tokens),
+            'table_words': table_words
+        },
+        'table_build_seconds': table_build_seconds,
+        'speedup': spacy_seconds / max(lookup_seconds, 1e-9),
+        'agreement': token_agreement(spacy_tokens, lookup_tokens)
+    }
+    print_results(results)
+
+    report = {
+        'timestamp': datetime.now().isoformat(),
+        'settings': {k: v for k, v in vars(args).items() if k != 'output'},
+        'results': results
+    }
+    save_json(report, args.output)
+    print(f"\nSaved benchmark report to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,450 @@
+#!/usr/bin/env python3
+"""
+Bulk Ingestion from Reddit/Pushshift NDJSON Dumps
+Streams compressed submission and comment dumps into the same raw schema
+produced by the live collector (data/raw/posts.csv, data/raw/comments.csv)
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import argparse
+import csv
+import gzip
+import io
+import json
+import os
+import tempfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from utils import setup_logger, save_json
+from id_index import IdIndex
+from config.config_loader import ConfigLoader
+
+try:
+    import zstandard
+except ImportError:  # Only needed for .zst dumps
+    zstandard = None
+
+
+POST_COLUMNS = [
+    'post_id', 'author', 'title', 'selftext', 'score', 'num_comments', 'created_utc',
+    'subreddit', 'url', 'upvote_ratio', 'is_self', 'permalink', 'collected_at'
+]
+COMMENT_COLUMNS = [
+    'comment_id', 'post_id', 'author', 'body', 'score', 'created_utc', 'parent_id', 'collected_at'
+]
+
+# Raw lines per batch sent from a file's reader to the parsing workers
+PARSE_BATCH_SIZE = 10000
+
+# Per-process filter state, set by _init_worker
+_subreddits = None
+_keywords = None
+_post_index = None  # IdIndex of the ingested posts, when comments are matched to them
+
+
+def open_dump(path):
+    """
+    Open a (possibly compressed) NDJSON dump as a text stream
+
+    Args:
+        path: Path to a .zst, .gz or plain NDJSON file
+
+    Returns:
+        Text stream yielding one JSON record per line
+    """
+    path = str(path)
+    if path.endswith('.zst'):
+        if zstandard is None:
+            raise ImportError("zstandard is required for .zst dumps. Install it with: pip install zstandard")
+        # Pushshift dumps are compressed with a long window
+        dctx = zstandard.ZstdDecompressor(max_window_size=2 ** 31)
+        raw = dctx.stream_reader(open(path, 'rb'), closefd=True)
+        return io.TextIOWrapper(io.BufferedReader(raw), encoding='utf-8', errors='replace')
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8', errors='replace')
+    return open(path, 'r', encoding='utf-8', errors='replace')
+
+
+def _timestamp(value):
+    """Convert a dump epoch value (int, float or str) to the collector's ISO format"""
+    return datetime.fromtimestamp(float(value)).isoformat()
+
+
+def _author(record):
+    author = record.get('author')
+    return author if author else '[deleted]'
+
+
+def _collected_at(record):
+    retrieved = record.get('retrieved_on') or record.get('retrieved_utc')
+    return _timestamp(retrieved) if retrieved else datetime.now().isoformat()
+
+
+def map_submission(record):
+    """Map a dump submission to the get_post_data() schema"""
+    return {
+        'post_id': record['id'],
+        'author': _author(record),
+        'title': record.get('title', ''),
+        'selftext': record.get('selftext', ''),
+        'score': record.get('score') or 0,
+        'num_comments': record.get('num_comments') or 0,  # Missing or null in some dumps
+        'created_utc': _timestamp(record['created_utc']),
+        'subreddit': record.get('subreddit', ''),
+        'url': record.get('url', ''),
+        'upvote_ratio': record.get('upvote_ratio'),
+        'is_self': record.get('is_self', False),
+        'permalink': record.get('permalink', ''),
+        'collected_at': _collected_at(record)
+    }
+
+
+def map_comment(record):
+    """Map a dump comment to the get_comments() schema"""
+    link_id = record.get('link_id', '')
+    return {
+        'comment_id': record['id'],
+        'post_id': link_id.split('_', 1)[-1],
+        'author': _author(record),
+        'body': record.get('body', ''),
+        'score': record.get('score') or 0,
+        'created_utc': _timestamp(record['created_utc']),
+        'parent_id': record.get('parent_id', ''),
+        'collected_at': _collected_at(record)
+    }
+
+
+def _init_worker(subreddits, keywords, post_index_path):
+    """Pool initializer: share filter state once per worker process"""
+    global _subreddits, _keywords, _post_index
+    _subreddits = subreddits
+    _keywords = keywords
+    # The kept post ids stay on disk and are looked up per batch
+    _post_index = IdIndex(post_index_path, use_bloom=False) if post_index_path else None
+
+
+def _keep_submission(record):
+    if _subreddits and (record.get('subreddit') or '').lower() not in _subreddits:
+        return False
+    if _keywords:
+        text = f"{record.get('title') or ''} {record.get('selftext') or ''}".lower()
+        return any(keyword in text for keyword in _keywords)
+    return True
+
+
+def _keep_comment(record):
+    return not _subreddits or (record.get('subreddit') or '').lower() in _subreddits
+
+
+def _comment_post_id(record):
+    return (record.get('link_id') or '').split('_', 1)[-1]
+
+
+def iter_line_batches(path, batch_size=PARSE_BATCH_SIZE):
+    """
+    Decompress a dump and yield its raw lines in batches
+
+    Args:
+        path: Dump file path
+        batch_size: Lines per batch
+
+    Yields:
+        list: Next batch of raw NDJSON lines
+    """
+    with open_dump(path) as stream:
+        batch = []
+        for line in stream:
+            batch.append(line)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+
+def process_batch(kind, lines, part_path):
+    """
+    Parse, filter and map a batch of raw dump lines into a CSV part file
+
+    Runs in a worker process, so JSON parsing of one dump is spread over
+    every worker while its reader keeps decompressing.
+
+    Args:
+        kind: 'submissions' or 'comments'
+        lines: Raw NDJSON lines
+        part_path: Output CSV part path
+
+    Returns:
+        dict: Counts for this batch
+    """
+    keep, mapper = ((_keep_submission, map_submission) if kind == 'submissions'
+                    else (_keep_comment, map_comment))
+    stats = {'records_read': len(lines), 'records_kept': 0, 'parse_errors': 0}
+
+    records = []
+    for line in lines:
+        try:
+            record = json.loads(line)
+            if keep(record):
+                records.append(record)
+        except (ValueError, TypeError, AttributeError):
+            stats['parse_errors'] += 1
+
+    if kind == 'comments' and _post_index is not None:
+        # Match comments to the ingested posts, one index lookup per distinct post
+        post_ids = {_comment_post_id(record) for record in records}
+        known = post_ids - set(_post_index.filter_new('post', post_ids))
+        records = [record for record in records if _comment_post_id(record) in known]
+
+    rows = []
+    for record in records:
+        try:
+            rows.append(mapper(record))
+        except (ValueError, KeyError, TypeError):
+            stats['parse_errors'] += 1
+
+    with open(part_path, 'w', newline='', encoding='utf-8') as out:
+        csv.DictWriter(out, fieldnames=POST_COLUMNS if kind == 'submissions' else COMMENT_COLUMNS).writerows(rows)
+    stats['records_kept'] = len(rows)
+    return stats
+
+
+def merge_parts(part_paths, columns, output_path, key, index, kind):
+    """
+    Concatenate CSV parts into one file with a single header, dropping duplicate ids
+
+    Ids already written are tracked in an on-disk IdIndex, so memory does not
+    grow with the output.
+
+    Args:
+        part_paths: Part files in order
+        columns: Output column order
+        output_path: Destination CSV
+        key: Id column used to drop duplicates across and within parts
+        index: IdIndex receiving the written ids
+        kind: Index kind of the ids ('post' or 'comment')
+
+    Returns:
+        int: Rows written
+    """
+    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+    written = 0
+
+    with open(output_path, 'w', newline='', encoding='utf-8') as out:
+        writer = csv.DictWriter(out, fieldnames=columns)
+        writer.writeheader()
+        for part_path in part_paths:
+            with open(part_path, 'r', newline='', encoding='utf-8') as part:
+                rows = list(csv.DictReader(part, fieldnames=columns))
+            new_ids = set(index.filter_new(kind, (row[key] for row in rows)))
+            for row in rows:
+                if row[key] in new_ids:
+                    new_ids.discard(row[key])  # Later copies in the same part are duplicates
+                    writer.writerow(row)
+                    written += 1
+            index.add(kind, (row[key] for row in rows))
+            index.commit()
+            os.remove(part_path)
+
+    return written
+
+
+class BulkIngestor:
+    """Parallel streaming ingestion of submission and comment dumps"""
+
+    def __init__(self, config, workers=None, require_keywords=True, batch_size=PARSE_BATCH_SIZE):
+        """
+        Initialize ingestor
+
+        Args:
+            config: Configuration dictionary
+            workers: Worker processes (defaults to CPU count)
+            require_keywords: Keep only submissions mentioning a configured keyword
+            batch_size: Raw lines per parsing batch
+        """
+        self.config = config
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.logger = setup_logger(
+            'bulk_ingest',
+            f'logs/bulk_ingest_{datetime.now():%Y%m%d_%H%M%S}.log'
+        )
+
+        data_config = config['data_collection']
+        self.subreddits = frozenset(s.lower() for s in data_config.get('subreddits', []))
+        self.keywords = (tuple(k.lower() for k in data_config.get('keywords', []))
+                         if require_keywords else ())
+
+    def _run_files(self, files, kind, tmp_dir, post_index_path=None):
+        """
+        Stream dump files through the worker pool
+
+        Each file is decompressed by a single reader (here) that sends batches
+        of raw lines to the workers for JSON parsing, filtering and mapping.
+        At most two batches per worker are in flight, so memory stays constant.
+
+        Returns:
+            tuple: (part paths in input order, per-file counts)
+        """
+        part_paths = []
+        results = []
+        max_in_flight = 2 * self.workers
+
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(self.subreddits, self.keywords, post_index_path)
+        ) as pool:
+            for path in files:
+                stats = {'file': str(path), 'records_read': 0, 'records_kept': 0, 'parse_errors': 0}
+                in_flight = deque()
+
+                def collect(future):
+                    for name, value in future.result().items():
+                        stats[name] += value
+
+                for lines in iter_line_batches(path, self.batch_size):
+                    part_path = os.path.join(tmp_dir, f"{kind}-{len(part_paths):06d}.csv")
+                    part_paths.append(part_path)
+                    in_flight.append(pool.submit(process_batch, kind, lines, part_path))
+                    if len(in_flight) >= max_in_flight:
+                        collect(in_flight.popleft())
+                while in_flight:
+                    collect(in_flight.popleft())
+
+                self.logger.info(f"  {stats['file']}: kept {stats['records_kept']:,} of "
+                                 f"{stats['records_read']:,} records ({stats['parse_errors']} unparseable)")
+                results.append(stats)
+
+        return part_paths, results
+
+    def _warn_if_overwriting(self, path):
+        """Warn before replacing a raw file, e.g. one written by a live collection"""
+        if os.path.exists(path):
+            self.logger.warning(f"Overwriting existing {path} "
+                                f"({os.path.getsize(path):,} bytes; back it up to keep live-collected data)")
+
+    def ingest(self, submission_files, comment_files, output_dir='data/raw'):
+        """
+        Ingest dump files into posts.csv and comments.csv
+
+        Args:
+            submission_files: Submission dump paths
+            comment_files: Comment dump paths
+            output_dir: Directory for posts.csv and comments.csv
+
+        Returns:
+            dict: Ingestion report
+        """
+        start = datetime.now()
+        self.logger.info("=" * 80)
+        self.logger.info("BULK DUMP INGESTION")
+        self.logger.info("=" * 80)
+        self.logger.info(f"Submission files: {len(submission_files)}, comment files: {len(comment_files)}")
+        self.logger.info(f"Subreddits: {sorted(self.subreddits)}")
+        self.logger.info(f"Keyword filter: {list(self.keywords) or 'disabled'}")
+        self.logger.info(f"Workers: {self.workers}")
+
+        report = {
+            'ingest_timestamp': start.isoformat(),
+            'submission_files': [str(f) for f in submission_files],
+            'comment_files': [str(f) for f in comment_files]
+        }
+
+        with tempfile.TemporaryDirectory(dir=output_dir) as tmp_dir:
+            # Ids written so far live on disk; this is separate from the live collector's index
+            index_path = os.path.join(tmp_dir, 'ingested_ids.sqlite')
+            index = IdIndex(index_path, use_bloom=False)
+            post_index_path = None
+
+            if submission_files:
+                self.logger.info("Ingesting submissions...")
+                posts_path = os.path.join(output_dir, 'posts.csv')
+                self._warn_if_overwriting(posts_path)
+                parts, results = self._run_files(submission_files, 'submissions', tmp_dir)
+                report['total_posts'] = merge_parts(parts, POST_COLUMNS, posts_path,
+                                                    key='post_id', index=index, kind='post')
+                report['submission_records_read'] = sum(r['records_read'] for r in results)
+                post_index_path = index_path
+                self.logger.info(f"Saved {report['total_posts']:,} posts to {posts_path}")
+
+            if comment_files:
+                # Comments are matched to the ingested posts when submissions were given
+                self.logger.info("Ingesting comments...")
+                comments_path = os.path.join(output_dir, 'comments.csv')
+                self._warn_if_overwriting(comments_path)
+                parts, results = self._run_files(comment_files, 'comments', tmp_dir, post_index_path)
+                report['total_comments'] = merge_parts(parts, COMMENT_COLUMNS, comments_path,
+                                                       key='comment_id', index=index, kind='comment')
+                report['comment_records_read'] = sum(r['records_read'] for r in results)
+                self.logger.info(f"Saved {report['total_comments']:,} comments to {comments_path}")
+
+            index.close()
+
+        runtime = (datetime.now() - start).total_seconds()
+        records_read = report.get('submission_records_read', 0) + report.get('comment_records_read', 0)
+        report['runtime_seconds'] = runtime
+        report['records_per_second'] = records_read / max(runtime, 1e-6)
+
+        report_path = 'data/metadata/bulk_ingest_report.json'
+        save_json(report, report_path)
+        self.logger.info(f"Ingested {records_read:,} records in {runtime:.1f}s "
+                         f"({report['records_per_second']:,.0f} records/s)")
+        self.logger.info(f"Saved ingestion report to {report_path}")
+
+        return report
+
+
+def main():
+    """Main execution"""
+    parser = argparse.ArgumentParser(
+        description='Ingest Reddit/Pushshift NDJSON dumps (.zst, .gz or plain)',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Subreddit dumps:
+  python scripts/bulk_ingest.py --submissions dumps/Ozempic_submissions.zst \\
+                                --comments dumps/Ozempic_comments.zst
+
+  # Monthly dumps, 8 worker processes:
+  python scripts/bulk_ingest.py --submissions dumps/RS_2024-*.zst \\
+                                --comments dumps/RC_2024-*.zst --workers 8
+        """
+    )
+    parser.add_argument('--submissions', nargs='*', default=[], help='Submission dump files')
+    parser.add_argument('--comments', nargs='*', default=[], help='Comment dump files')
+    parser.add_argument('--output-dir', default='data/raw', help='Output directory (default: data/raw)')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    parser.add_argument('--batch-size', type=int, default=PARSE_BATCH_SIZE,
+                        help=f'Raw lines per parsing batch (default: {PARSE_BATCH_SIZE})')
+    parser.add_argument(
+        '--all-posts',
+        action='store_true',
+        help='Keep every submission from the configured subreddits, not only keyword matches'
+    )
+    args = parser.parse_args()
+
+    if not args.submissions and not args.comments:
+        parser.error("Provide at least one --submissions or --comments file")
+
+    loader = ConfigLoader()
+    config = loader.load()
+
+    Path(args.output_dir).mkdir(parents=True, exist_ok=True)
+    ingestor = BulkIngestor(config, workers=args.workers, require_keywords=not args.all_posts,
+                            batch_size=args.batch_size)
+    report = ingestor.ingest(args.submissions, args.comments, output_dir=args.output_dir)
+
+    print("\n✓ Bulk ingestion complete")
+    print(f"✓ Posts:    {report.get('total_posts', 0):,}")
+    print(f"✓ Comments: {report.get('total_comments', 0):,}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
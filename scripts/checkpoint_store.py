@@ -0,0 +1,177 @@
+"""
+Append-Only Checkpoint Store
+Segment-based JSONL log with a small manifest for resumable collection
+"""
+
+import json
+import os
+from pathlib import Path
+
+
+class CheckpointStore:
+    """
+    Append-only checkpoint log
+
+    Each flush writes only the records collected since the previous flush to a
+    new JSONL segment, then atomically rewrites a small manifest listing the
+    segments. Segments that are not referenced by the manifest (e.g. from a
+    crash mid-flush) are ignored on replay and overwritten by the next flush.
+    """
+
+    MANIFEST_VERSION = 1
+
+    def __init__(self, manifest_path='data/raw/checkpoint.json', segment_dir=None):
+        """
+        Initialize checkpoint store
+
+        Args:
+            manifest_path: Path to the manifest JSON file
+            segment_dir: Directory for segment files (defaults to <manifest>_segments/)
+        """
+        self.manifest_path = Path(manifest_path)
+        if segment_dir is None:
+            segment_dir = self.manifest_path.with_name(f"{self.manifest_path.stem}_segments")
+        self.segment_dir = Path(segment_dir)
+        self.manifest = self._read_manifest()
+
+    def _empty_manifest(self):
+        return {
+            'version': self.MANIFEST_VERSION,
+            'next_segment': 0,
+            'streams': {},
+            'metadata': {}
+        }
+
+    def _read_manifest(self):
+        """Load the manifest, ignoring files written by older checkpoint formats"""
+        if self.manifest_path.exists():
+            with open(self.manifest_path, 'r') as f:
+                manifest = json.load(f)
+            if manifest.get('version') == self.MANIFEST_VERSION:
+                return manifest
+        return self._empty_manifest()
+
+    def _write_manifest(self):
+        """Atomically replace the manifest"""
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.manifest_path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(self.manifest, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.manifest_path)
+
+    def _write_segment(self, stream, records):
+        """Write records to a new segment file and return its manifest entry"""
+        self.segment_dir.mkdir(parents=True, exist_ok=True)
+        name = f"{stream}-{self.manifest['next_segment']:06d}.jsonl"
+        self.manifest['next_segment'] += 1
+
+        with open(self.segment_dir / name, 'w') as f:
+            for record in records:
+                f.write(json.dumps(record, default=str))
+                f.write('\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+        return {'file': name, 'records': len(records)}
+
+    def exists(self):
+        """Check whether any segments have been committed"""
+        return any(self.manifest['streams'].values())
+
+    def append(self, stream, records):
+        """
+        Stage new records for a stream
+
+        The segment is written immediately but only becomes part of the
+        checkpoint once commit() rewrites the manifest.
+
+        Args:
+            stream: Stream name (e.g. 'posts', 'comments')
+            records: List of dict records collected since the last flush
+        """
+        if not records:
+            return
+        entry = self._write_segment(stream, records)
+        self.manifest['streams'].setdefault(stream, []).append(entry)
+
+    def commit(self, **metadata):
+        """
+        Persist the manifest, making all appended segments durable
+
+        Args:
+            **metadata: Run metadata to store alongside the segment list
+        """
+        self.manifest['metadata'].update(metadata)
+        self._write_manifest()
+
+    @property
+    def metadata(self):
+        return self.manifest['metadata']
+
+    def record_count(self, stream):
+        """Number of committed records in a stream"""
+        return sum(entry['records'] for entry in self.manifest['streams'].get(stream, []))
+
+    def replay(self, stream):
+        """
+        Yield committed records of a stream in write order
+
+        Args:
+            stream: Stream name
+
+        Yields:
+            dict: Checkpointed record
+        """
+        for entry in self.manifest['streams'].get(stream, []):
+            with open(self.segment_dir / entry['file'], 'r') as f:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+
+    def compact(self, stream, key=None):
+        """
+        Merge all segments of a stream into a single segment
+
+        Args:
+            stream: Stream name
+            key: Optional record field used to drop duplicates (first occurrence wins)
+
+        Returns:
+            list: Compacted records
+        """
+        old_entries = self.manifest['streams'].get(stream, [])
+
+        records = []
+        seen = set()
+        for record in self.replay(stream):
+            if key is not None:
+                if record.get(key) in seen:
+                    continue
+                seen.add(record.get(key))
+            records.append(record)
+
+        if len(old_entries) <= 1 and len(records) == self.record_count(stream):
+            return records
+
+        self.manifest['streams'][stream] = []
+        self.append(stream, records)
+        self._write_manifest()
+
+        for entry in old_entries:
+            (self.segment_dir / entry['file']).unlink(missing_ok=True)
+
+        return records
+
+    def clear(self):
+        """Remove the manifest and all segment files"""
+        if self.segment_dir.exists():
+            for path in self.segment_dir.glob('*.jsonl'):
+                path.unlink()
+            try:
+                self.segment_dir.rmdir()
+            except OSError:
+                pass
+        self.manifest_path.unlink(missing_ok=True)
+        self.manifest = self._empty_manifest()
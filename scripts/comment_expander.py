@@ -0,0 +1,303 @@
+"""
+Batched Comment-Tree Expansion
+Fetches comment trees for many submissions with a worker pool and spends a
+global MoreComments budget on the threads expected to yield the most comments
+"""
+
+import heapq
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from praw.const import API_PATH
+from praw.models import Comment, MoreComments
+
+
+# Reddit's /api/morechildren accepts at most 100 comment ids per call
+MORECHILDREN_BATCH_SIZE = 100
+
+
+class ExpansionPlanner:
+    """
+    Priority queue of /api/morechildren batches ordered by expected yield
+
+    A batch's expected yield is the number of comments it can still add to its
+    submission (bounded by the per-post cap and by the submission's reported
+    num_comments), weighted by the submission's score. Batches are handed out
+    highest-yield first until the request budget runs out. Comment ids that
+    were already requested are never planned again, and batches below
+    min_batch_yield are dropped instead of spending a request on them.
+    """
+
+    def __init__(self, request_budget, max_comments_per_post=100, min_batch_yield=1,
+                 known_filter=None):
+        """
+        Initialize planner
+
+        Args:
+            request_budget: Number of morechildren requests that may be issued
+            max_comments_per_post: Cap on comments collected per submission
+            min_batch_yield: Minimum expected new comments for a batch to be worth a request
+            known_filter: Optional callable (ids) -> ids not collected yet
+        """
+        self.request_budget = request_budget
+        self.max_comments_per_post = max_comments_per_post
+        self.min_batch_yield = min_batch_yield
+        self.known_filter = known_filter
+
+        self.requested_ids = set()
+        self.threads = {}  # post_id -> {'submission', 'collected', 'in_flight', 'weight'}
+        self._heap = []
+        self._counter = 0
+        self.requests_planned = 0
+        self.batches_dropped = 0
+        self.known_ids_skipped = 0
+
+    def register(self, submission, collected):
+        """Track a submission whose top-level tree has been fetched"""
+        self.threads[submission.id] = {
+            'submission': submission,
+            'collected': collected,
+            'in_flight': 0,
+            'weight': 1.0 + math.log1p(max(submission.score or 0, 0))
+        }
+
+    def record_collected(self, post_id, count, reserved):
+        """
+        Update a submission after one of its batches returned
+
+        Args:
+            post_id: Submission id
+            count: Comments the batch actually added
+            reserved: Expected yield reserved for the batch by next_batch()
+        """
+        thread = self.threads[post_id]
+        thread['collected'] += count
+        thread['in_flight'] -= reserved
+
+    def room(self, post_id):
+        """Comments a submission may still add, counting batches already in flight"""
+        thread = self.threads[post_id]
+        expected_total = min(self.max_comments_per_post, thread['submission'].num_comments or 0)
+        return max(expected_total - thread['collected'] - thread['in_flight'], 0)
+
+    def _expected_yield(self, post_id, batch_size):
+        return min(batch_size, self.room(post_id)) * self.threads[post_id]['weight']
+
+    def add(self, post_id, more_items):
+        """
+        Queue the MoreComments stubs of a submission
+
+        Args:
+            post_id: Submission id
+            more_items: MoreComments instances found in the submission's tree
+        """
+        children = []
+        for more in more_items:
+            # "Continue this thread" stubs (count 0) cost a request for one branch
+            if more.count == 0:
+                continue
+            children.extend(c for c in more.children if c not in self.requested_ids)
+
+        # Deduplicate while keeping Reddit's ordering (best comments first)
+        children = list(dict.fromkeys(children))
+
+        # Never request comments that earlier runs already hold
+        if self.known_filter is not None and children:
+            new_children = self.known_filter(children)
+            self.known_ids_skipped += len(children) - len(new_children)
+            children = new_children
+
+        for start in range(0, len(children), MORECHILDREN_BATCH_SIZE):
+            batch = children[start:start + MORECHILDREN_BATCH_SIZE]
+            priority = self._expected_yield(post_id, len(batch))
+            if priority < self.min_batch_yield:
+                self.batches_dropped += 1
+                continue
+            self._counter += 1
+            heapq.heappush(self._heap, (-priority, self._counter, post_id, batch))
+
+    def next_batch(self):
+        """
+        Pop the highest-yield batch that is still worth a request
+
+        Returns:
+            tuple: (post_id, list of comment ids, reserved yield) or None when done
+        """
+        while self._heap and self.requests_planned < self.request_budget:
+            _, _, post_id, batch = heapq.heappop(self._heap)
+            batch = [c for c in batch if c not in self.requested_ids]
+
+            # Priorities go stale as comments arrive; re-check before spending
+            if not batch or self._expected_yield(post_id, len(batch)) < self.min_batch_yield:
+                self.batches_dropped += 1
+                continue
+
+            reserved = min(len(batch), self.room(post_id))
+            self.threads[post_id]['in_flight'] += reserved
+            self.requested_ids.update(batch)
+            self.requests_planned += 1
+            return post_id, batch, reserved
+
+        return None
+
+
+class CommentTreeExpander:
+    """
+    Comment fetching subsystem for a batch of submissions
+
+    Phase 1 loads each submission's top-level comment tree in a worker pool
+    (one request per submission). Phase 2 gathers every MoreComments stub
+    across the whole batch and expands them through /api/morechildren in
+    100-id batches, highest expected yield first, within a request budget
+    proportional to the number of submissions.
+    """
+
+    def __init__(self, reddit, record_builder, error_handler, logger, config=None, known_filter=None):
+        """
+        Initialize expander
+
+        Args:
+            reddit: praw.Reddit instance
+            record_builder: Callable (comment, post_id) -> dict record
+            error_handler: Callable (error, context) -> bool, True if the call may be retried
+            logger: Logger instance
+            config: The data_collection.comment_expansion config section
+            known_filter: Optional callable (comment ids) -> ids not collected yet
+        """
+        config = config or {}
+        self.reddit = reddit
+        self.record_builder = record_builder
+        self.error_handler = error_handler
+        self.logger = logger
+        self.known_filter = known_filter
+
+        self.max_comments_per_post = config.get('max_comments_per_post', 100)
+        self.requests_per_post = config.get('requests_per_post', 2)
+        self.min_batch_yield = config.get('min_batch_yield', 5)
+        self.workers = config.get('workers', 4)
+        self.max_retries = 3
+
+        # Comment ids requested through morechildren over the whole run
+        self.requested_ids = set()
+        self.stats = {'tree_requests': 0, 'morechildren_requests': 0, 'batches_dropped': 0,
+                      'known_comments_skipped': 0}
+        self._stats_lock = threading.Lock()  # Requests are counted from pool threads
+
+    def _count(self, key, amount=1):
+        """Add to a stats counter (thread-safe)"""
+        with self._stats_lock:
+            self.stats[key] += amount
+
+    def _with_retries(self, func, context):
+        """Call func, retrying through the scraper's error handler"""
+        for attempt in range(self.max_retries):
+            try:
+                return func()
+            except Exception as e:
+                if attempt < self.max_retries - 1:
+                    if not self.error_handler(e, f"{context} (attempt {attempt + 1})"):
+                        break
+                else:
+                    self.logger.warning(f"Failed {context} after {self.max_retries} attempts")
+        return None
+
+    def _load_tree(self, submission):
+        """Fetch a submission's tree and split it into comments and MoreComments stubs"""
+        def load():
+            self._count('tree_requests')
+            return submission.comments.list()
+
+        items = self._with_retries(load, f"getting comments for {submission.id}") or []
+        comments = [c for c in items if isinstance(c, Comment)]
+        more_items = [c for c in items if isinstance(c, MoreComments)]
+        return comments[:self.max_comments_per_post], more_items
+
+    def _morechildren(self, submission, children):
+        """Expand up to 100 comment ids of one submission in a single request"""
+        def fetch():
+            self._count('morechildren_requests')
+            return self.reddit.post(API_PATH['morechildren'], data={
+                'children': ','.join(children),
+                'link_id': submission.fullname,
+                'sort': submission.comment_sort
+            })
+
+        items = self._with_retries(fetch, f"expanding comments for {submission.id}") or []
+        comments = [c for c in items if isinstance(c, Comment)]
+        more_items = [c for c in items if isinstance(c, MoreComments)]
+        return comments, more_items
+
+    def fetch(self, submissions, should_stop=lambda: False):
+        """
+        Fetch comments for a batch of submissions
+
+        Args:
+            submissions: List of praw Submission objects
+            should_stop: Callable checked between requests for graceful shutdown
+
+        Returns:
+            dict: post_id -> list of comment records
+        """
+        if not submissions:
+            return {}
+
+        by_id = {s.id: s for s in submissions}
+        records = {s.id: [] for s in submissions}
+        seen_ids = {s.id: set() for s in submissions}
+
+        def add_comments(post_id, comments):
+            if self.known_filter is not None and comments:
+                new_ids = set(self.known_filter([c.id for c in comments]))
+                self._count('known_comments_skipped', len(comments) - len(new_ids))
+                comments = [c for c in comments if c.id in new_ids]
+
+            room = self.max_comments_per_post - len(records[post_id])
+            added = 0
+            for comment in comments:
+                if added >= room:
+                    break
+                if comment.id in seen_ids[post_id]:
+                    continue
+                try:
+                    records[post_id].append(self.record_builder(comment, post_id))
+                    seen_ids[post_id].add(comment.id)
+                    added += 1
+                except Exception:
+                    continue
+            return added
+
+        planner = ExpansionPlanner(
+            request_budget=self.requests_per_post * len(submissions),
+            max_comments_per_post=self.max_comments_per_post,
+            min_batch_yield=self.min_batch_yield,
+            known_filter=self.known_filter
+        )
+        planner.requested_ids = self.requested_ids
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            # Phase 1: top-level trees
+            for submission, (comments, more_items) in zip(submissions, pool.map(self._load_tree, submissions)):
+                added = add_comments(submission.id, comments)
+                planner.register(submission, added)
+                planner.add(submission.id, more_items)
+
+            # Phase 2: morechildren batches, highest expected yield first
+            while not should_stop():
+                wave = []
+                while len(wave) < self.workers:
+                    batch = planner.next_batch()
+                    if batch is None:
+                        break
+                    wave.append(batch)
+                if not wave:
+                    break
+
+                results = pool.map(lambda item: self._morechildren(by_id[item[0]], item[1]), wave)
+                for (post_id, _, reserved), (comments, more_items) in zip(wave, results):
+                    planner.record_collected(post_id, add_comments(post_id, comments), reserved)
+                    planner.add(post_id, more_items)
+
+        self._count('batches_dropped', planner.batches_dropped)
+        self._count('known_comments_skipped', planner.known_ids_skipped)
+        return records
@@ -0,0 +1,150 @@
+"""
+EDA Cache
+Fingerprinted cache of EDA aggregates, section results and figures
+"""
+
+import hashlib
+import json
+import pickle
+import shutil
+from pathlib import Path
+
+from utils import save_json, load_json
+
+# Bump when analysis or plotting code changes what a section produces
+CACHE_VERSION = 2
+
+
+def fingerprint(*parts):
+    """
+    Digest of Python objects (pickled; dicts should have stable order)
+
+    Returns:
+        str: Hex digest
+    """
+    digest = hashlib.blake2b(str(CACHE_VERSION).encode('ascii'), digest_size=16)
+    for part in parts:
+        digest.update(pickle.dumps(part, protocol=4))
+    return digest.hexdigest()
+
+
+def fingerprint_files(paths, settings=None, block_size=1 << 24):
+    """
+    Digest of the contents of files and settings
+
+    Args:
+        paths: Files or directories (all files below are included, in name order)
+        settings: JSON-serializable settings that shape the results
+        block_size: Bytes read at a time
+
+    Returns:
+        str: Hex digest
+    """
+    digest = hashlib.blake2b(str(CACHE_VERSION).encode('ascii'), digest_size=16)
+    digest.update(json.dumps(settings, sort_keys=True).encode('utf-8'))
+    for path in paths:
+        path = Path(path)
+        files = sorted(p for p in path.rglob('*') if p.is_file()) if path.is_dir() else [path]
+        for file in files:
+            digest.update(f"\0{file.relative_to(path) if path.is_dir() else file.name}\0".encode('utf-8'))
+            with open(file, 'rb') as f:
+                while block := f.read(block_size):
+                    digest.update(block)
+    return digest.hexdigest()
+
+
+class EDACache:
+    """
+    Results of earlier EDA runs, reused while their inputs are unchanged
+
+    aggregates.pkl holds the single-pass aggregates under the fingerprint of
+    the input files and aggregation settings. Each analysis section is
+    stored under the fingerprint of the aggregates it reads, with the stats
+    it added and copies of its figures, so a section is only recomputed and
+    re-rendered when its own inputs change. manifest.json lists the
+    fingerprints.
+    """
+
+    def __init__(self, directory='data/metadata/eda_cache'):
+        """
+        Open (or create) a cache directory
+
+        Args:
+            directory: Cache directory
+        """
+        self.directory = Path(directory)
+        (self.directory / 'figures').mkdir(parents=True, exist_ok=True)
+        self.manifest_path = self.directory / 'manifest.json'
+        self.manifest = {'inputs': None, 'sections': {}}
+        if self.manifest_path.exists():
+            self.manifest = load_json(self.manifest_path)
+        self.stats = {'aggregates': 'miss', 'sections_reused': [], 'sections_computed': []}
+
+    def load_aggregates(self, inputs):
+        """
+        Cached aggregates of unchanged inputs
+
+        Args:
+            inputs: Fingerprint of the input files and settings
+
+        Returns:
+            object: What save_aggregates() stored, or None on a miss
+        """
+        path = self.directory / 'aggregates.pkl'
+        if self.manifest.get('inputs') != inputs or not path.exists():
+            return None
+        with open(path, 'rb') as f:
+            cached = pickle.load(f)
+        self.stats['aggregates'] = 'hit'
+        return cached
+
+    def save_aggregates(self, inputs, aggregates):
+        """Store aggregates under the input fingerprint"""
+        with open(self.directory / 'aggregates.pkl', 'wb') as f:
+            pickle.dump(aggregates, f, protocol=4)
+        self.manifest['inputs'] = inputs
+        self._save_manifest()
+
+    def load_section(self, name, section_fingerprint, figure_paths):
+        """
+        Reuse a section computed from the same inputs
+
+        Cached figures are copied back to figure_paths.
+
+        Args:
+            name: Section name
+            section_fingerprint: Fingerprint of the section's inputs
+            figure_paths: Figures the section writes
+
+        Returns:
+            dict: Stats the section added, or None on a miss
+        """
+        entry = self.manifest['sections'].get(name)
+        stats_path = self.directory / f'{name}.pkl'
+        copies = [self.directory / 'figures' / Path(p).name for p in figure_paths]
+        if (entry is None or entry['fingerprint'] != section_fingerprint
+                or not stats_path.exists() or not all(c.exists() for c in copies)):
+            self.stats['sections_computed'].append(name)
+            return None
+
+        for copy, path in zip(copies, figure_paths):
+            shutil.copyfile(copy, path)
+        with open(stats_path, 'rb') as f:
+            section_stats = pickle.load(f)
+        self.stats['sections_reused'].append(name)
+        return section_stats
+
+    def save_section(self, name, section_fingerprint, section_stats, figure_paths):
+        """Store a section's stats and copies of its figures"""
+        with open(self.directory / f'{name}.pkl', 'wb') as f:
+            pickle.dump(section_stats, f, protocol=4)
+        for path in figure_paths:
+            shutil.copyfile(path, self.directory / 'figures' / Path(path).name)
+        self.manifest['sections'][name] = {
+            'fingerprint': section_fingerprint,
+            'figures': [str(p) for p in figure_paths]
+        }
+        self._save_manifest()
+
+    def _save_manifest(self):
+        save_json(self.manifest, self.manifest_path)
@@ -0,0 +1,452 @@
+"""
+EDA Engine
+Single-pass, chunked aggregation of everything the exploratory analysis reports and plots
+"""
+
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from ngram_counter import NgramCounter
+from sketches import NgramSketch
+from utils import iter_dataframe_chunks
+
+# combined_processed columns the aggregates need (tokens come from the encoded corpus)
+EDA_COLUMNS = ['doc_type', 'subreddit', 'created_utc', 'token_count', 'score']
+
+# first_seen of token ids that have not occurred
+NOT_SEEN = np.iinfo(np.int64).max
+
+# Document length categories (right-closed bins, as pd.cut)
+LENGTH_CATEGORIES = [
+    ('Very Short (10-25)', 0, 25),
+    ('Short (26-50)', 25, 50),
+    ('Medium (51-100)', 50, 100),
+    ('Long (100+)', 100, float('inf'))
+]
+
+
+class Histogram:
+    """
+    Exact distribution of integer values as value -> count
+
+    Quantiles, moments and plots come from the counts, so memory grows with
+    the number of distinct values rather than the number of observations.
+    """
+
+    def __init__(self):
+        self.counts = Counter()
+
+    def update(self, values, weights=None):
+        if weights is None:
+            self.counts.update(values)
+        else:
+            # Weighted observations, e.g. sampled documents standing for several
+            for value, weight in pd.Series(weights).groupby(np.asarray(values)).sum().items():
+                self.counts[value] += weight
+
+    def merge(self, other):
+        self.counts.update(other.counts)
+
+    @property
+    def n(self):
+        return sum(self.counts.values())
+
+    def arrays(self):
+        """Sorted distinct values and their counts"""
+        values = np.array(sorted(self.counts), dtype=np.float64)
+        counts = np.array([self.counts[v] for v in sorted(self.counts)])
+        return values, counts
+
+    def sum(self):
+        return sum(value * count for value, count in self.counts.items())
+
+    def mean(self):
+        return self.sum() / self.n if self.n else float('nan')
+
+    def std(self):
+        """Sample standard deviation (ddof=1, as pandas)"""
+        n = self.n
+        if n < 2:
+            return float('nan')
+        total = self.sum()
+        squares = sum(value * value * count for value, count in self.counts.items())
+        return float(np.sqrt(max(n * squares - total * total, 0) / (n * (n - 1))))
+
+    def quantile(self, q):
+        """Quantile with linear interpolation between ranks (numpy/pandas default)"""
+        values, counts = self.arrays()
+        if not len(values):
+            return float('nan')
+        if counts.dtype.kind == 'f':
+            # Weighted counts have no ranks; use the first value reaching each fraction
+            cumulative = np.cumsum(counts)
+            return float(values[np.searchsorted(cumulative, q * cumulative[-1], side='left')])
+        position = q * (counts.sum() - 1)
+        cumulative = np.cumsum(counts)
+        low = values[np.searchsorted(cumulative, np.floor(position), side='right')]
+        high = values[np.searchsorted(cumulative, np.ceil(position), side='right')]
+        return float(low + (high - low) * (position - np.floor(position)))
+
+    def median(self):
+        return self.quantile(0.5)
+
+    def count_where(self, condition):
+        return sum(count for value, count in self.counts.items() if condition(value))
+
+    def box_stats(self, label, whis=1.5):
+        """Boxplot statistics for Axes.bxp, matching Axes.boxplot on the raw values"""
+        values, _ = self.arrays()
+        q1, median, q3 = self.quantile(0.25), self.quantile(0.5), self.quantile(0.75)
+        iqr = q3 - q1
+        inside = values[(values >= q1 - whis * iqr) & (values <= q3 + whis * iqr)]
+        whislo = inside.min() if len(inside) else q1
+        whishi = inside.max() if len(inside) else q3
+        return {
+            'label': label, 'med': median, 'q1': q1, 'q3': q3,
+            'whislo': whislo, 'whishi': whishi,
+            'fliers': values[(values < whislo) | (values > whishi)]
+        }
+
+    def cdf_points(self):
+        """
+        (value, cumulative %) points tracing the empirical CDF
+
+        Each distinct value contributes its first and last rank, which draws
+        the same line as plotting every sorted observation.
+        """
+        values, counts = self.arrays()
+        n = counts.sum()
+        cumulative = np.cumsum(counts)
+        first = (cumulative - counts + (1 if counts.dtype.kind == 'i' else 0)) / n * 100
+        last = cumulative / n * 100
+        return np.repeat(values, 2), np.column_stack([first, last]).ravel()
+
+
+class StratifiedSample:
+    """
+    Fixed-size random sample of documents for plotting
+
+    Every document gets a uniform random key and each stratum keeps the
+    documents with the smallest keys, a reservoir sample that is updated
+    chunk by chunk and merges across shards. Strata are (subreddit,
+    doc_type, month) for "stratified" sampling and a single stratum for
+    "reservoir" sampling. Sampled documents carry the weight
+    stratum size / sampled from stratum, so weighted plots estimate the
+    full corpus.
+    """
+
+    def __init__(self, method='stratified', per_stratum=2000, sample_size=100000, seed=42):
+        """
+        Initialize an empty sample
+
+        Args:
+            method: "stratified" or "reservoir"
+            per_stratum: Documents kept per stratum (stratified)
+            sample_size: Documents kept (reservoir)
+            seed: Random seed
+        """
+        if method not in ('stratified', 'reservoir'):
+            raise ValueError(f"Unknown sampling method: {method}")
+        self.method = method
+        self.capacity = per_stratum if method == 'stratified' else sample_size
+        self.rng = np.random.default_rng(seed)
+        self.strata = {}  # stratum -> code
+        self.population = Counter()  # code -> documents
+        self.keys = np.zeros(0)
+        self.stratum = np.zeros(0, dtype=np.int64)
+        self.token_count = np.zeros(0, dtype=np.int64)
+        self.doc_type = np.zeros(0, dtype=object)
+
+    def update(self, chunk, months):
+        """
+        Offer a chunk of documents
+
+        Args:
+            chunk: DataFrame with doc_type, subreddit and token_count
+            months: Month of each document (Period)
+        """
+        if self.method == 'stratified':
+            # Comments have no subreddit; they form their own strata per month
+            labels = zip(chunk['subreddit'].fillna('').astype(str), chunk['doc_type'], months.astype(str))
+            codes = np.array([self.strata.setdefault(label, len(self.strata)) for label in labels], dtype=np.int64)
+        else:
+            codes = np.zeros(len(chunk), dtype=np.int64)
+        self.population.update(codes.tolist())
+        self._keep_smallest(
+            np.concatenate([self.keys, self.rng.random(len(chunk))]),
+            np.concatenate([self.stratum, codes]),
+            np.concatenate([self.token_count, chunk['token_count'].to_numpy(dtype=np.int64)]),
+            np.concatenate([self.doc_type, chunk['doc_type'].to_numpy(dtype=object)])
+        )
+
+    def merge(self, other):
+        """Add the sample of another shard (same method and capacity)"""
+        codes = {code: self.strata.setdefault(label, len(self.strata)) for label, code in other.strata.items()}
+        if self.method == 'reservoir':
+            codes = {0: 0}
+        recode = np.vectorize(codes.get, otypes=[np.int64])
+        other_stratum = recode(other.stratum) if len(other.stratum) else other.stratum
+        self.population.update({codes[code]: count for code, count in other.population.items()})
+        self._keep_smallest(
+            np.concatenate([self.keys, other.keys]),
+            np.concatenate([self.stratum, other_stratum]),
+            np.concatenate([self.token_count, other.token_count]),
+            np.concatenate([self.doc_type, other.doc_type])
+        )
+
+    def _keep_smallest(self, keys, stratum, token_count, doc_type):
+        """Keep the capacity smallest keys of each stratum"""
+        order = np.lexsort((keys, stratum))
+        stratum = stratum[order]
+        group_start = np.r_[0, np.flatnonzero(stratum[1:] != stratum[:-1]) + 1]
+        rank = np.arange(len(order)) - np.repeat(group_start, np.diff(np.r_[group_start, len(order)]))
+        keep = order[rank < self.capacity]
+        self.keys, self.stratum = keys[keep], stratum[rank < self.capacity]
+        self.token_count, self.doc_type = token_count[keep], doc_type[keep]
+
+    def __len__(self):
+        return len(self.keys)
+
+    def weights(self):
+        """Documents each sampled document stands for"""
+        sampled = np.bincount(self.stratum, minlength=len(self.population) or 1)
+        population = np.array([self.population[code] for code in range(len(sampled))], dtype=np.float64)
+        return population[self.stratum] / sampled[self.stratum]
+
+    def length_histograms(self):
+        """
+        Weighted token count histograms of the sample
+
+        Returns:
+            tuple: (overall Histogram, {doc_type: Histogram})
+        """
+        weights = self.weights()
+        overall = Histogram()
+        overall.update(self.token_count, weights)
+        by_type = {}
+        for doc_type in sorted(set(self.doc_type.tolist())):
+            mask = self.doc_type == doc_type
+            by_type[doc_type] = Histogram()
+            by_type[doc_type].update(self.token_count[mask], weights[mask])
+        return overall, by_type
+
+    def summary(self):
+        """Sampling settings and sizes, for reports"""
+        return {
+            'method': self.method,
+            'capacity': int(self.capacity),
+            'strata': int(len(self.population)),
+            'sampled_documents': int(len(self)),
+            'population_documents': int(sum(self.population.values()))
+        }
+
+
+class EDAAggregates:
+    """
+    All exploratory statistics, accumulated in one pass over the corpus
+
+    Each chunk of combined_processed metadata is aggregated together with the
+    token ids of the same rows. Memory is proportional to the vocabulary,
+    the n-grams and the distinct months, subreddits and lengths, not to the
+    number of documents.
+    """
+
+    def __init__(self, vocabulary_size, ngram_sizes=(2, 3), sketch=None):
+        """
+        Initialize empty aggregates
+
+        Args:
+            vocabulary_size: Size of the encoded corpus vocabulary
+            ngram_sizes: n-gram lengths to count
+            sketch: NgramSketch parameters (capacity, width, depth) to count
+                    n-grams approximately in fixed memory; exact when None
+        """
+        self.documents = 0
+        self.doc_types = Counter()
+        self.subreddits = Counter()
+        self.subreddit_tokens = Counter()
+        self.subreddit_scores = Counter()
+        self.subreddit_dates = {}  # subreddit -> [earliest, latest]
+        self.earliest = None
+        self.latest = None
+        self.months = Counter()  # Period -> documents
+        self.months_by_type = Counter()  # (Period, doc_type) -> documents
+        self.lengths = Histogram()
+        self.lengths_by_type = {}
+        self.scores = Histogram()
+        self.term_frequencies = np.zeros(vocabulary_size, dtype=np.int64)
+        # Position of each token id's first occurrence in the token stream, for ties
+        self.first_seen = np.full(vocabulary_size, NOT_SEEN, dtype=np.int64)
+        self.tokens_seen = 0
+        self.approximate = sketch is not None
+        if self.approximate:
+            self.ngrams = {n: NgramSketch(n, vocabulary_size, **sketch) for n in ngram_sizes}
+        else:
+            self.ngrams = {n: NgramCounter(n, vocabulary_size) for n in ngram_sizes}
+        self.sample = None  # StratifiedSample, when plots are drawn from a sample
+
+    @classmethod
+    def from_corpus(cls, combined_path, corpus, chunk_size=50000, sketch=None, sample=None):
+        """
+        Aggregate combined_processed and its encoded corpus in one pass
+
+        Args:
+            combined_path: combined_processed.parquet (file or part directory)
+            corpus: EncodedCorpus row-aligned with combined_processed
+            chunk_size: Documents per chunk
+            sketch: NgramSketch parameters, or None for exact n-gram counts
+            sample: StratifiedSample parameters to also sample documents for plots
+
+        Returns:
+            EDAAggregates: Filled aggregates
+        """
+        aggregates = cls(len(corpus.vocabulary), sketch=sketch)
+        if sample is not None:
+            aggregates.sample = StratifiedSample(**sample)
+        start = 0
+        for chunk in iter_dataframe_chunks(combined_path, chunk_size, columns=EDA_COLUMNS):
+            offsets = np.asarray(corpus.offsets[start:start + len(chunk) + 1])
+            if len(offsets) != len(chunk) + 1 or not np.array_equal(np.diff(offsets), chunk['token_count'].to_numpy()):
+                raise ValueError("Encoded corpus does not match combined_processed; rerun preprocessing")
+            aggregates.update(chunk, np.asarray(corpus.ids[offsets[0]:offsets[-1]]), offsets - offsets[0])
+            start += len(chunk)
+        if start != len(corpus):
+            raise ValueError("Encoded corpus does not match combined_processed; rerun preprocessing")
+        return aggregates
+
+    def update(self, chunk, ids, offsets):
+        """
+        Add a chunk of documents
+
+        Args:
+            chunk: DataFrame with EDA_COLUMNS
+            ids: Token ids of the chunk's documents, concatenated
+            offsets: Chunk-relative offsets into ids (len(chunk) + 1)
+        """
+        created = pd.to_datetime(chunk['created_utc'])
+        self.documents += len(chunk)
+        self.doc_types.update(chunk['doc_type'].tolist())
+
+        # Dates and months
+        if created.notna().any():
+            earliest, latest = created.min(), created.max()
+            self.earliest = earliest if self.earliest is None else min(self.earliest, earliest)
+            self.latest = latest if self.latest is None else max(self.latest, latest)
+        months = created.dt.to_period('M')
+        self.months.update(months.dropna().tolist())
+        by_type = pd.DataFrame({'month': months, 'doc_type': chunk['doc_type']}).dropna()
+        self.months_by_type.update(zip(by_type['month'], by_type['doc_type']))
+        if self.sample is not None:
+            self.sample.update(chunk, months)
+
+        # Subreddits (comments have none)
+        has_subreddit = chunk['subreddit'].notna()
+        by_subreddit = pd.DataFrame({
+            'subreddit': chunk['subreddit'][has_subreddit],
+            'token_count': chunk['token_count'][has_subreddit],
+            'score': chunk['score'][has_subreddit],
+            'created_utc': created[has_subreddit]
+        }).groupby('subreddit', sort=False).agg(
+            documents=('token_count', 'size'),
+            tokens=('token_count', 'sum'),
+            score=('score', 'sum'),
+            earliest=('created_utc', 'min'),
+            latest=('created_utc', 'max')
+        )
+        for subreddit, row in by_subreddit.iterrows():
+            self.subreddits[subreddit] += int(row['documents'])
+            self.subreddit_tokens[subreddit] += int(row['tokens'])
+            self.subreddit_scores[subreddit] += row['score']
+            dates = self.subreddit_dates.setdefault(subreddit, [row['earliest'], row['latest']])
+            dates[0] = min(dates[0], row['earliest'])
+            dates[1] = max(dates[1], row['latest'])
+
+        # Lengths and scores
+        self.lengths.update(chunk['token_count'].tolist())
+        for doc_type, lengths in chunk.groupby('doc_type', sort=False)['token_count']:
+            self.lengths_by_type.setdefault(doc_type, Histogram()).update(lengths.tolist())
+        self.scores.update(chunk['score'].tolist())
+
+        # Vocabulary and n-grams
+        self.term_frequencies += np.bincount(ids, minlength=len(self.term_frequencies))
+        tokens, positions = np.unique(ids, return_index=True)
+        self.first_seen[tokens] = np.minimum(self.first_seen[tokens], positions + self.tokens_seen)
+        self.tokens_seen += len(ids)
+        for counter in self.ngrams.values():
+            counter.update(ids, offsets)
+
+    def merge(self, other):
+        """
+        Add the aggregates of another shard of later documents
+
+        Args:
+            other: EDAAggregates over the same vocabulary and n-gram settings
+        """
+        self.documents += other.documents
+        self.doc_types.update(other.doc_types)
+        self.subreddits.update(other.subreddits)
+        self.subreddit_tokens.update(other.subreddit_tokens)
+        self.subreddit_scores.update(other.subreddit_scores)
+        for subreddit, (earliest, latest) in other.subreddit_dates.items():
+            dates = self.subreddit_dates.setdefault(subreddit, [earliest, latest])
+            dates[0] = min(dates[0], earliest)
+            dates[1] = max(dates[1], latest)
+        if other.earliest is not None:
+            self.earliest = other.earliest if self.earliest is None else min(self.earliest, other.earliest)
+            self.latest = other.latest if self.latest is None else max(self.latest, other.latest)
+        self.months.update(other.months)
+        self.months_by_type.update(other.months_by_type)
+        self.lengths.merge(other.lengths)
+        for doc_type, histogram in other.lengths_by_type.items():
+            self.lengths_by_type.setdefault(doc_type, Histogram()).merge(histogram)
+        self.scores.merge(other.scores)
+        self.term_frequencies += other.term_frequencies
+        seen = other.first_seen != NOT_SEEN
+        self.first_seen[seen] = np.minimum(self.first_seen[seen], other.first_seen[seen] + self.tokens_seen)
+        self.tokens_seen += other.tokens_seen
+        for n, counter in self.ngrams.items():
+            counter.merge(other.ngrams[n])
+        if self.sample is not None:
+            self.sample.merge(other.sample)
+
+    def month_series(self):
+        """Documents per month, in month order"""
+        return pd.Series(self.months).sort_index()
+
+    def month_type_frame(self):
+        """Documents per month and document type, in month order"""
+        series = pd.Series(self.months_by_type)
+        return series.unstack(fill_value=0).sort_index() if len(series) else pd.DataFrame()
+
+    def length_categories(self):
+        """Documents per length category, most common first (as value_counts)"""
+        counts = {
+            label: self.lengths.count_where(lambda v, low=low, high=high: low < v <= high)
+            for label, low, high in LENGTH_CATEGORIES
+        }
+        return pd.Series(counts).sort_values(ascending=False, kind='stable')
+
+    def ranked_terms(self):
+        """
+        Token ids that occur, most frequent first
+
+        Ties keep the order in which the tokens first occur, as
+        Counter.most_common over the token stream does.
+
+        Returns:
+            numpy.ndarray: Token ids
+        """
+        seen = np.flatnonzero(self.term_frequencies)
+        return seen[np.lexsort((self.first_seen[seen], -self.term_frequencies[seen]))]
+
+    def top_ngrams(self, n, k, vocabulary):
+        """k most frequent n-grams as (joined tokens, count); counts are upper bounds when approximate"""
+        return [(' '.join(vocabulary[i] for i in ngram), int(count))
+                for ngram, count, *_ in self.ngrams[n].most_common(k)]
+
+    def ngram_bounds(self, n, k, vocabulary):
+        """k most frequent n-grams as [joined tokens, lower bound, upper bound] (approximate mode)"""
+        return [[' '.join(vocabulary[i] for i in ngram), int(lower), int(upper)]
+                for ngram, upper, lower in self.ngrams[n].most_common(k)]
@@ -0,0 +1,192 @@
+"""
+Encoded Corpus
+Shared vocabulary and integer token ids (CSR layout) for the processed corpus
+"""
+
+import shutil
+from pathlib import Path
+
+import numpy as np
+
+from utils import save_json, load_json
+
+
+class EncodedCorpusWriter:
+    """
+    Encode token lists into a shared vocabulary and flat arrays of token ids
+
+    The output directory holds vocabulary.json (id -> token), ids.npy (int32
+    token ids of all documents, concatenated) and offsets.npy (int64; the ids
+    of document i are ids[offsets[i]:offsets[i + 1]]). Rows are in the order
+    documents are added, i.e. the row order of combined_processed.
+
+    Ids are assigned the way gensim's Dictionary assigns them (new tokens of
+    each document in sorted order), so the vocabulary doubles as the LDA
+    dictionary. Ids and offsets are appended to disk as they are encoded,
+    so only the vocabulary is kept in memory.
+    """
+
+    def __init__(self, directory):
+        """
+        Initialize writer
+
+        Args:
+            directory: Output directory (replaced if it exists)
+        """
+        self.directory = Path(directory)
+        if self.directory.exists():
+            shutil.rmtree(self.directory)
+        self.directory.mkdir(parents=True)
+
+        self.token2id = {}
+        self.num_documents = 0
+        self.num_tokens = 0
+
+        self._ids_file = open(self.directory / 'ids.tmp', 'wb')
+        self._offsets_file = open(self.directory / 'offsets.tmp', 'wb')
+        np.zeros(1, dtype=np.int64).tofile(self._offsets_file)
+
+    def add(self, token_lists):
+        """
+        Encode and append documents
+
+        Args:
+            token_lists: Iterable of token lists, one per document
+        """
+        token2id = self.token2id
+        ids = []
+        offsets = []
+        for tokens in token_lists:
+            new_tokens = {token for token in tokens if token not in token2id}
+            for token in sorted(new_tokens):
+                token2id[token] = len(token2id)
+            ids.extend(token2id[token] for token in tokens)
+            offsets.append(self.num_tokens + len(ids))
+
+        np.asarray(ids, dtype=np.int32).tofile(self._ids_file)
+        np.asarray(offsets, dtype=np.int64).tofile(self._offsets_file)
+        self.num_documents += len(offsets)
+        self.num_tokens += len(ids)
+
+    def close(self):
+        """Write the vocabulary and convert the id and offset streams to .npy files"""
+        self._ids_file.close()
+        self._offsets_file.close()
+        _raw_to_npy(self.directory / 'ids.tmp', self.directory / 'ids.npy', np.int32)
+        _raw_to_npy(self.directory / 'offsets.tmp', self.directory / 'offsets.npy', np.int64)
+
+        vocabulary = [None] * len(self.token2id)
+        for token, token_id in self.token2id.items():
+            vocabulary[token_id] = token
+        save_json({
+            'documents': self.num_documents,
+            'tokens': self.num_tokens,
+            'vocabulary': vocabulary
+        }, self.directory / 'vocabulary.json')
+
+
+def _raw_to_npy(raw_path, npy_path, dtype, block_size=1 << 24):
+    """Copy a raw binary array into a .npy file block by block, then remove it"""
+    raw = np.memmap(raw_path, dtype=dtype, mode='r') if raw_path.stat().st_size else np.zeros(0, dtype)
+    out = np.lib.format.open_memmap(npy_path, mode='w+', dtype=dtype, shape=(len(raw),))
+    for start in range(0, len(raw), block_size):
+        out[start:start + block_size] = raw[start:start + block_size]
+    out.flush()
+    del raw, out
+    raw_path.unlink()
+
+
+class EncodedCorpus:
+    """
+    Read-only view of an encoded corpus written by EncodedCorpusWriter
+
+    Token ids and offsets are memory-mapped, so opening the corpus costs
+    little more than loading the vocabulary.
+    """
+
+    def __init__(self, directory):
+        """
+        Open an encoded corpus
+
+        Args:
+            directory: Directory written by EncodedCorpusWriter
+        """
+        self.directory = Path(directory)
+        data = load_json(self.directory / 'vocabulary.json')
+        self.vocabulary = data['vocabulary']
+        self.token2id = {token: token_id for token_id, token in enumerate(self.vocabulary)}
+        self.ids = np.load(self.directory / 'ids.npy', mmap_mode='r')
+        self.offsets = np.load(self.directory / 'offsets.npy', mmap_mode='r')
+
+    @staticmethod
+    def exists(directory):
+        return (Path(directory) / 'vocabulary.json').exists()
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    @property
+    def num_tokens(self):
+        return int(self.offsets[-1])
+
+    def lengths(self):
+        """Tokens per document"""
+        return np.diff(self.offsets)
+
+    def doc(self, i):
+        """Token ids of document i"""
+        return self.ids[self.offsets[i]:self.offsets[i + 1]]
+
+    def tokens(self, i):
+        """Tokens of document i"""
+        vocabulary = self.vocabulary
+        return [vocabulary[token_id] for token_id in self.doc(i).tolist()]
+
+    def __iter__(self):
+        """Token lists of all documents, decoded one at a time"""
+        for i in range(len(self)):
+            yield self.tokens(i)
+
+    def term_frequencies(self):
+        """Occurrences of each token id"""
+        return np.bincount(self.ids, minlength=len(self.vocabulary))
+
+    def document_frequencies(self, block_size=1 << 22):
+        """
+        Documents containing each token id
+
+        Returns:
+            tuple: (document frequencies, number of distinct (document, token) pairs)
+        """
+        size = len(self.vocabulary)
+        dfs = np.zeros(size, dtype=np.int64)
+        nnz = 0
+        doc_start = 0
+        while doc_start < len(self):
+            # Whole documents, about block_size tokens at a time
+            doc_end = int(np.searchsorted(self.offsets, self.offsets[doc_start] + block_size, side='right')) - 1
+            doc_end = min(max(doc_end, doc_start + 1), len(self))
+            ids = self.ids[self.offsets[doc_start]:self.offsets[doc_end]]
+            docs = np.repeat(np.arange(doc_end - doc_start, dtype=np.int64), np.diff(self.offsets[doc_start:doc_end + 1]))
+            pairs = np.unique(docs * size + ids)
+            dfs += np.bincount(pairs % size, minlength=size)
+            nnz += len(pairs)
+            doc_start = doc_end
+        return dfs, nnz
+
+    def documents_containing(self, token):
+        """
+        Documents that contain a token
+
+        Args:
+            token: Token string
+
+        Returns:
+            numpy.ndarray: Boolean mask over documents
+        """
+        mask = np.zeros(len(self), dtype=bool)
+        token_id = self.token2id.get(token)
+        if token_id is not None:
+            positions = np.flatnonzero(self.ids == token_id)
+            mask[np.searchsorted(self.offsets, positions, side='right') - 1] = True
+        return mask
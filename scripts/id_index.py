@@ -0,0 +1,238 @@
+"""
+Persistent ID Index
+SQLite-backed set of collected post and comment ids with a Bloom filter in front
+"""
+
+import hashlib
+import math
+import sqlite3
+import threading
+from pathlib import Path
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over string keys
+
+    Uses double hashing of a single 128-bit BLAKE2b digest to derive the bit
+    positions, so each lookup costs one hash regardless of the number of
+    hash functions.
+    """
+
+    def __init__(self, capacity, false_positive_rate=0.01):
+        """
+        Initialize filter
+
+        Args:
+            capacity: Number of keys the filter is sized for
+            false_positive_rate: Target false positive rate at capacity
+        """
+        self.capacity = max(int(capacity), 1)
+        self.false_positive_rate = false_positive_rate
+        self.num_bits = max(int(-self.capacity * math.log(false_positive_rate) / math.log(2) ** 2), 8)
+        self.num_hashes = max(int(round(self.num_bits / self.capacity * math.log(2))), 1)
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, key):
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, key):
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+class IdIndex:
+    """
+    Persistent, run-spanning index of collected ids
+
+    Ids live in a SQLite table keyed by (kind, id), with an optional integer
+    value per id (the num_comments a post had when it was collected). A Bloom
+    filter per kind, rebuilt from the table on open, answers most lookups for
+    unseen ids without touching SQLite.
+
+    Additions are visible to lookups immediately but only become durable on
+    commit(), which the collector calls right after each checkpoint commit, so
+    ids whose records never reached disk are rolled back after a crash.
+    """
+
+    KINDS = ('post', 'comment')
+    SQL_BATCH_SIZE = 500  # Stay below SQLite's bound-parameter limit
+
+    def __init__(self, path='data/raw/id_index.sqlite', expected_items=1_000_000,
+                 false_positive_rate=0.01, use_bloom=True):
+        """
+        Initialize index
+
+        Args:
+            path: Path to the SQLite database
+            expected_items: Initial Bloom filter capacity per kind
+            false_positive_rate: Bloom filter false positive rate
+            use_bloom: Keep Bloom filters in front of SQLite; without them nothing
+                       is loaded on open and every lookup queries SQLite (better
+                       for bulk batches where most ids are known)
+        """
+        self.path = Path(path)
+        self.expected_items = expected_items
+        self.false_positive_rate = false_positive_rate
+        self.use_bloom = use_bloom
+        self._lock = threading.RLock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS ids ('
+            ' kind TEXT NOT NULL, id TEXT NOT NULL, value INTEGER,'
+            ' PRIMARY KEY (kind, id)) WITHOUT ROWID'
+        )
+        self.conn.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)')
+        self.conn.commit()
+
+        self.stats = {'lookups': 0, 'bloom_negatives': 0, 'bloom_false_positives': 0}
+        self.blooms = {}
+        for kind in self.KINDS:
+            self._rebuild_bloom(kind)
+
+    def _rebuild_bloom(self, kind, capacity=None):
+        """Size a fresh Bloom filter for a kind and load every stored id into it"""
+        if not self.use_bloom:
+            return
+        count = self.count(kind)
+        capacity = capacity or max(self.expected_items, 2 * count)
+        bloom = BloomFilter(capacity, self.false_positive_rate)
+        for (item_id,) in self.conn.execute('SELECT id FROM ids WHERE kind = ?', (kind,)):
+            bloom.add(item_id)
+        self.blooms[kind] = bloom
+
+    def count(self, kind):
+        """Number of ids of a kind (including uncommitted additions)"""
+        with self._lock:
+            return self.conn.execute('SELECT COUNT(*) FROM ids WHERE kind = ?', (kind,)).fetchone()[0]
+
+    def add(self, kind, items):
+        """
+        Add ids of a kind
+
+        Args:
+            kind: 'post' or 'comment'
+            items: Iterable of ids, or dict of id -> value (values are overwritten)
+        """
+        with self._lock:
+            if isinstance(items, dict):
+                rows = [(kind, str(k), None if v is None else int(v)) for k, v in items.items()]
+                self.conn.executemany('INSERT OR REPLACE INTO ids VALUES (?, ?, ?)', rows)
+            else:
+                rows = [(kind, str(k), None) for k in items]
+                self.conn.executemany('INSERT OR IGNORE INTO ids VALUES (?, ?, ?)', rows)
+
+            if self.use_bloom:
+                bloom = self.blooms[kind]
+                for _, item_id, _ in rows:
+                    bloom.add(item_id)
+                if bloom.count > bloom.capacity:
+                    self._rebuild_bloom(kind, capacity=2 * bloom.capacity)
+
+    def get(self, kind, item_id):
+        """
+        Look up an id
+
+        Returns:
+            tuple: (found, value); value is None for ids stored without one
+        """
+        with self._lock:
+            self.stats['lookups'] += 1
+            if self.use_bloom and item_id not in self.blooms[kind]:
+                self.stats['bloom_negatives'] += 1
+                return False, None
+            row = self.conn.execute(
+                'SELECT value FROM ids WHERE kind = ? AND id = ?', (kind, item_id)
+            ).fetchone()
+            if row is None:
+                self.stats['bloom_false_positives'] += 1
+                return False, None
+            return True, row[0]
+
+    def contains(self, kind, item_id):
+        return self.get(kind, item_id)[0]
+
+    def filter_new(self, kind, ids):
+        """
+        Keep the ids that are not in the index, preserving order
+
+        Args:
+            kind: 'post' or 'comment'
+            ids: Iterable of ids
+
+        Returns:
+            list: Ids not collected yet
+        """
+        with self._lock:
+            ids = list(ids)
+            if self.use_bloom:
+                bloom = self.blooms[kind]
+                maybe_known = [i for i in ids if i in bloom]
+            else:
+                maybe_known = list(set(ids))
+            self.stats['lookups'] += len(ids)
+            self.stats['bloom_negatives'] += len(ids) - len(maybe_known)
+
+            known = set()
+            for start in range(0, len(maybe_known), self.SQL_BATCH_SIZE):
+                batch = maybe_known[start:start + self.SQL_BATCH_SIZE]
+                placeholders = ','.join('?' * len(batch))
+                known.update(row[0] for row in self.conn.execute(
+                    f'SELECT id FROM ids WHERE kind = ? AND id IN ({placeholders})', (kind, *batch)
+                ))
+            self.stats['bloom_false_positives'] += len(set(maybe_known) - known)
+
+            return [i for i in ids if i not in known]
+
+    def get_meta(self, key):
+        with self._lock:
+            row = self.conn.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+            return row[0] if row else None
+
+    def set_meta(self, key, value):
+        with self._lock:
+            self.conn.execute('INSERT OR REPLACE INTO meta VALUES (?, ?)', (key, value))
+
+    def commit(self):
+        """Make all additions since the last commit durable"""
+        with self._lock:
+            self.conn.commit()
+
+    def rollback(self):
+        """Discard additions since the last commit"""
+        with self._lock:
+            self.conn.rollback()
+            for kind in self.KINDS:
+                self._rebuild_bloom(kind)
+
+    def reset(self):
+        """Remove every id and all metadata"""
+        with self._lock:
+            self.conn.execute('DELETE FROM ids')
+            self.conn.execute('DELETE FROM meta')
+            self.conn.commit()
+            for kind in self.KINDS:
+                self._rebuild_bloom(kind)
+
+    def get_metrics(self):
+        """Index sizes and lookup counters"""
+        metrics = {f'{kind}_ids': self.count(kind) for kind in self.KINDS}
+        metrics.update(self.stats)
+        return metrics
+
+    def close(self):
+        with self._lock:
+            self.conn.commit()
+            self.conn.close()
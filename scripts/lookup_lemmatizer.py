@@ -0,0 +1,92 @@
+"""
+Lookup Lemmatizer
+Regex tokenizer plus a word -> lemma table, a fast stand-in for the spaCy tagger
+"""
+
+import re
+from collections import Counter, defaultdict
+from datetime import datetime
+from pathlib import Path
+
+from utils import save_json, load_json
+
+
+class LookupLemmatizer:
+    """
+    Rule-based tokenization and table-driven lemmatization
+
+    The table maps each lowercase word to the lemma spaCy assigns it most
+    often in the corpus, so lemmas only differ from the spaCy path where a
+    word's lemma depends on its part of speech. Words missing from the table
+    are kept as they are.
+    """
+
+    # Words (hyphenated only before a digit, as spaCy's infix rules do) or single symbols
+    TOKEN_PATTERN = re.compile(r"\w+(?:-(?![^\W\d_])\w+)*|[^\w\s]")
+
+    def __init__(self, table=None, metadata=None):
+        """
+        Initialize lemmatizer
+
+        Args:
+            table: dict of lowercase word -> lemma
+            metadata: Where the table came from (model, documents, build time)
+        """
+        self.table = table or {}
+        self.metadata = metadata or {}
+
+    @classmethod
+    def build(cls, nlp, texts, batch_size=256, n_process=1):
+        """
+        Build the table by running spaCy over texts
+
+        Args:
+            nlp: Loaded spaCy pipeline with a lemmatizer
+            texts: Iterable of cleaned texts, e.g. a sample of the corpus
+            batch_size: nlp.pipe batch size
+            n_process: nlp.pipe worker processes
+
+        Returns:
+            LookupLemmatizer: Lemmatizer with the built table
+        """
+        lemma_counts = defaultdict(Counter)
+        num_docs = 0
+        for doc in nlp.pipe(texts, batch_size=batch_size, n_process=n_process):
+            num_docs += 1
+            for token in doc:
+                if token.is_alpha:
+                    lemma_counts[token.lower_][token.lemma_.lower()] += 1
+
+        table = {word: counts.most_common(1)[0][0] for word, counts in lemma_counts.items()}
+        metadata = {
+            'model': f"{nlp.meta.get('lang')}_{nlp.meta.get('name')}-{nlp.meta.get('version')}",
+            'documents': num_docs,
+            'words': len(table),
+            'built_at': datetime.now().isoformat()
+        }
+        return cls(table, metadata)
+
+    @classmethod
+    def load(cls, path):
+        data = load_json(path)
+        return cls(data['table'], data.get('metadata'))
+
+    def save(self, path):
+        save_json({'metadata': self.metadata, 'table': self.table}, path)
+
+    @staticmethod
+    def exists(path):
+        return Path(path).exists()
+
+    def lemmatize(self, text):
+        """
+        Tokenize text and look up lemmas
+
+        Args:
+            text: Cleaned, lowercased text
+
+        Returns:
+            list: (token text, lemma) pairs in document order
+        """
+        table = self.table
+        return [(word, table.get(word, word)) for word in self.TOKEN_PATTERN.findall(text.lower())]
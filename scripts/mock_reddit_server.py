@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+"""
+Mock Reddit API Server
+Local stand-in for the Reddit OAuth API serving synthetic listings, comment
+trees and MoreComments, with configurable latency, server errors and 429s
+"""
+
+import argparse
+import base64
+import json
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+def _base36(number):
+    digits = '0123456789abcdefghijklmnopqrstuvwxyz'
+    out = ''
+    while True:
+        number, rem = divmod(number, 36)
+        out = digits[rem] + out
+        if number == 0:
+            return out
+
+
+class SyntheticCorpus:
+    """Deterministic synthetic subreddits, submissions and comments"""
+
+    def __init__(self, keywords, posts_per_subreddit=500, max_comments_per_post=200,
+                 tree_size=20, seed=42):
+        """
+        Initialize corpus
+
+        Args:
+            keywords: Words mixed into titles so search listings have hits
+            posts_per_subreddit: Submissions generated per subreddit
+            max_comments_per_post: Upper bound on num_comments per submission
+            tree_size: Comments returned inline with a submission; the rest sit behind MoreComments
+            seed: Random seed
+        """
+        self.keywords = [k.lower() for k in keywords] or ['semaglutide']
+        self.posts_per_subreddit = posts_per_subreddit
+        self.max_comments_per_post = max_comments_per_post
+        self.tree_size = tree_size
+        self.seed = seed
+        self.base_time = int(time.time())
+        self._subreddits = {}
+        self._posts = {}
+        self._lock = threading.Lock()
+
+    def subreddit(self, name):
+        """Posts of a subreddit, newest first"""
+        key = name.lower()
+        with self._lock:
+            if key not in self._subreddits:
+                rng = random.Random(f"{self.seed}-{key}")
+                sub_index = len(self._subreddits) + 1
+                posts = []
+                for i in range(self.posts_per_subreddit):
+                    post_id = _base36(sub_index * 10_000_000 + i)
+                    keyword = self.keywords[i % len(self.keywords)]
+                    post = {
+                        'id': post_id,
+                        'name': f't3_{post_id}',
+                        'title': f"Week {i % 52} on {keyword}: question {i}",
+                        'selftext': f"Synthetic post {i} about {keyword} and side effects.",
+                        'author': f"user_{rng.randrange(5000)}",
+                        'score': int(rng.paretovariate(1.2)) - 1,
+                        'num_comments': rng.randrange(self.max_comments_per_post + 1),
+                        'created_utc': float(self.base_time - i * 900),
+                        'subreddit': name,
+                        'subreddit_name_prefixed': f"r/{name}",
+                        'url': f"https://www.reddit.com/r/{name}/comments/{post_id}/",
+                        'upvote_ratio': round(rng.uniform(0.5, 1.0), 2),
+                        'is_self': True,
+                        'permalink': f"/r/{name}/comments/{post_id}/",
+                    }
+                    posts.append(post)
+                    self._posts[post_id] = post
+                self._subreddits[key] = posts
+            return self._subreddits[key]
+
+    def post(self, post_id):
+        return self._posts.get(post_id)
+
+    def comment(self, post, index):
+        """Comment number `index` of a submission"""
+        comment_id = f"{post['id']}x{_base36(index)}"
+        return {
+            'id': comment_id,
+            'name': f't1_{comment_id}',
+            'body': f"Reply {index}: my experience with {self.keywords[index % len(self.keywords)]}.",
+            'author': f"user_{(index * 7919) % 5000}",
+            'score': (index * 31) % 50 - 5,
+            'created_utc': post['created_utc'] + 60 * (index + 1),
+            'parent_id': post['name'],
+            'link_id': post['name'],
+            'subreddit': post['subreddit'],
+            'replies': '',
+            'depth': 0,
+        }
+
+    def comment_ids(self, post):
+        return [f"{post['id']}x{_base36(i)}" for i in range(post['num_comments'])]
+
+
+def _thing(kind, data):
+    return {'kind': kind, 'data': data}
+
+
+def _listing(children, after=None):
+    return {'kind': 'Listing', 'data': {'after': after, 'before': None, 'children': children}}
+
+
+class MockRedditHandler(BaseHTTPRequestHandler):
+    """Request handler; server-wide state lives on self.server"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass  # Keep benchmark output clean
+
+    def _send(self, status, payload, headers=None):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=UTF-8')
+        self.send_header('Content-Length', str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_form(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        return {k: v[-1] for k, v in parse_qs(self.rfile.read(length).decode()).items()}
+
+    def do_GET(self):
+        self._handle('GET')
+
+    def do_POST(self):
+        self._handle('POST')
+
+    def _handle(self, method):
+        server = self.server
+        url = urlparse(self.path)
+        path = url.path.rstrip('/')
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        form = self._read_form() if method == 'POST' else {}
+
+        if path == '/api/v1/access_token':
+            server.count('access_token')
+            # One token per OAuth app, so quotas are tracked per app like on Reddit
+            client_id = 'anonymous'
+            auth = self.headers.get('Authorization', '')
+            if auth.lower().startswith('basic '):
+                client_id = base64.b64decode(auth[6:]).decode().split(':', 1)[0]
+            self._send(200, {'access_token': f"mock-{client_id}", 'token_type': 'bearer',
+                             'expires_in': 86400, 'scope': '*'})
+            return
+
+        endpoint = server.classify(path)
+        server.count(endpoint)
+
+        if server.latency:
+            time.sleep(server.latency * random.uniform(0.5, 1.5))
+
+        token = self.headers.get('Authorization', '').split(' ', 1)[-1]
+        rate_headers, limited = server.take_quota(token)
+        if limited or random.random() < server.rate_limit_rate:
+            server.count('429')
+            self._send(429, {'message': 'Too Many Requests', 'error': 429}, rate_headers)
+            return
+        if random.random() < server.error_rate:
+            server.count('5xx')
+            self._send(503, {'message': 'Service Unavailable', 'error': 503}, rate_headers)
+            return
+
+        try:
+            payload = server.route(endpoint, path, params, form)
+        except KeyError:
+            self._send(404, {'message': 'Not Found', 'error': 404}, rate_headers)
+            return
+        self._send(200, payload, rate_headers)
+
+
+class MockRedditServer(ThreadingHTTPServer):
+    """
+    Threaded HTTP server emulating the Reddit endpoints used by the collectors
+
+    Point praw/asyncpraw at it with the oauth_url and reddit_url settings.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, host='127.0.0.1', port=0, corpus=None, latency=0.0, error_rate=0.0,
+                 rate_limit_rate=0.0, quota=1000, window_seconds=600):
+        """
+        Initialize server
+
+        Args:
+            host: Bind address
+            port: Bind port (0 picks a free port)
+            corpus: SyntheticCorpus instance
+            latency: Mean per-request latency in seconds
+            error_rate: Probability of a 503 response
+            rate_limit_rate: Probability of a spurious 429 response
+            quota: Requests allowed per OAuth app per rate-limit window
+            window_seconds: Length of the rate-limit window
+        """
+        super().__init__((host, port), MockRedditHandler)
+        self.corpus = corpus or SyntheticCorpus(keywords=[])
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.quota = quota
+        self.window_seconds = window_seconds
+
+        self.counts = Counter()
+        self._state_lock = threading.Lock()
+        self._windows = {}  # token -> [window start, requests used]
+        self._thread = None
+
+    def handle_error(self, request, client_address):
+        """Ignore clients dropping connections (timeouts, shutdown)"""
+        if not isinstance(sys.exc_info()[1], (ConnectionResetError, BrokenPipeError)):
+            super().handle_error(request, client_address)
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, key):
+        with self._state_lock:
+            self.counts[key] += 1
+
+    def reset_counts(self):
+        with self._state_lock:
+            self.counts = Counter()
+            self._windows = {}
+
+    def take_quota(self, token=''):
+        """Consume one request from the token's window and build X-Ratelimit-* headers"""
+        with self._state_lock:
+            now = time.time()
+            window = self._windows.setdefault(token, [now, 0])
+            if now - window[0] >= self.window_seconds:
+                window[:] = [now, 0]
+            window[1] += 1
+            used = window[1]
+            remaining = self.quota - used
+            reset = max(int(window[0] + self.window_seconds - now), 1)
+
+        headers = {
+            'x-ratelimit-remaining': f"{max(remaining, 0):.1f}",
+            'x-ratelimit-used': str(used),
+            'x-ratelimit-reset': str(reset),
+        }
+        return headers, remaining < 0
+
+    @staticmethod
+    def classify(path):
+        parts = path.strip('/').split('/')
+        if path.startswith('/api/morechildren'):
+            return 'morechildren'
+        if parts[0] == 'comments':
+            return 'comments'
+        if parts[0] == 'r' and len(parts) >= 3:
+            return f"listing_{parts[2]}"
+        return 'other'
+
+    def route(self, endpoint, path, params, form):
+        """Build the JSON payload for a request"""
+        parts = path.strip('/').split('/')
+        if endpoint.startswith('listing_'):
+            return self._listing(parts[1], parts[2], params)
+        if endpoint == 'comments':
+            return self._comments(parts[1], params)
+        if endpoint == 'morechildren':
+            return self._morechildren({**params, **form})
+        raise KeyError(path)
+
+    def _listing(self, subreddit, kind, params):
+        posts = self.corpus.subreddit(subreddit)
+        if kind == 'search':
+            query = params.get('q', '').lower()
+            posts = [p for p in posts if query in p['title'].lower()]
+            if params.get('sort') != 'new':
+                posts = sorted(posts, key=lambda p: -p['score'])
+        elif kind in ('hot', 'top'):
+            posts = sorted(posts, key=lambda p: -p['score'])
+
+        start = 0
+        after = params.get('after')
+        if after:
+            names = [p['name'] for p in posts]
+            start = names.index(after) + 1 if after in names else len(posts)
+
+        limit = min(int(params.get('limit', 25)), 100)
+        page = posts[start:start + limit]
+        next_after = page[-1]['name'] if page and start + limit < len(posts) else None
+        return _listing([_thing('t3', p) for p in page], after=next_after)
+
+    def _comments(self, post_id, params):
+        post = self.corpus.post(post_id)
+        if post is None:
+            raise KeyError(post_id)
+
+        inline = min(post['num_comments'], self.corpus.tree_size)
+        children = [_thing('t1', self.corpus.comment(post, i)) for i in range(inline)]
+        rest = self.corpus.comment_ids(post)[inline:]
+        if rest:
+            children.append(_thing('more', {
+                'count': len(rest), 'children': rest, 'id': rest[0], 'name': f"t1_{rest[0]}",
+                'parent_id': post['name'], 'depth': 0
+            }))
+        return [_listing([_thing('t3', post)]), _listing(children)]
+
+    def _morechildren(self, params):
+        post = self.corpus.post(params.get('link_id', '').split('_', 1)[-1])
+        if post is None:
+            raise KeyError(params.get('link_id'))
+
+        requested = [c for c in params.get('children', '').split(',') if c]
+        index_of = {cid: i for i, cid in enumerate(self.corpus.comment_ids(post))}
+        things = [_thing('t1', self.corpus.comment(post, index_of[cid]))
+                  for cid in requested[:100] if cid in index_of]
+        return {'json': {'errors': [], 'data': {'things': things}}}
+
+    def start(self):
+        """Serve in a background thread"""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+def main():
+    """Run the mock server in the foreground"""
+    parser = argparse.ArgumentParser(description='Run a local mock Reddit API server')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.1, help='Mean latency per request (seconds)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Probability of a 503 response')
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help='Probability of a spurious 429')
+    parser.add_argument('--quota', type=int, default=1000, help='Requests per rate-limit window')
+    parser.add_argument('--window', type=int, default=600, help='Rate-limit window (seconds)')
+    parser.add_argument('--posts', type=int, default=500, help='Posts per subreddit')
+    args = parser.parse_args()
+
+    corpus = SyntheticCorpus(keywords=['semaglutide', 'ozempic', 'wegovy'], posts_per_subreddit=args.posts)
+    server = MockRedditServer(port=args.port, corpus=corpus, latency=args.latency,
+                              error_rate=args.error_rate, rate_limit_rate=args.rate_limit_rate,
+                              quota=args.quota, window_seconds=args.window)
+    print(f"Mock Reddit API listening on {server.url}")
+    print("Set reddit.oauth_url and reddit.reddit_url in config.yaml to this URL")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
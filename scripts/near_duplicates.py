@@ -0,0 +1,187 @@
+"""
+Near-Duplicate Detection
+MinHash signatures and LSH banding over the encoded corpus
+"""
+
+import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+
+
+class NearDuplicateDetector:
+    """
+    Find clusters of near-duplicate documents (reposts, copy-pasted comments)
+
+    Documents are sets of token shingles (shingle_size consecutive token ids).
+    Each gets a MinHash signature of num_perm values; documents whose
+    signatures agree on a whole band of num_perm / bands values become
+    candidates, and candidates whose estimated Jaccard similarity reaches
+    threshold are linked. Every step is vectorized and linear in the number
+    of tokens, apart from sorting band keys.
+    """
+
+    MAX_HASH = np.uint64(0xFFFFFFFF)
+
+    def __init__(self, threshold=0.8, num_perm=128, bands=32, shingle_size=3, seed=1):
+        """
+        Initialize detector
+
+        Args:
+            threshold: Minimum estimated Jaccard similarity of linked documents
+            num_perm: MinHash signature length
+            bands: LSH bands (must divide num_perm)
+            shingle_size: Tokens per shingle
+            seed: Seed of the hash functions
+        """
+        if num_perm % bands:
+            raise ValueError(f"bands ({bands}) must divide num_perm ({num_perm})")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+
+        rng = np.random.default_rng(seed)
+        # Multiply-shift hash functions; odd multipliers
+        self._a = rng.integers(1, 2**63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 2**63, size=num_perm, dtype=np.uint64)
+        self._band_weights = rng.integers(1, 2**63, size=self.rows, dtype=np.uint64) | np.uint64(1)
+
+    def _shingle_hashes(self, ids, offsets):
+        """
+        64-bit hashes of the shingles of a block of documents
+
+        Returns:
+            tuple: (hashes, block-relative document of each hash)
+        """
+        lengths = np.diff(offsets)
+        doc_of_token = np.repeat(np.arange(len(lengths)), lengths)
+        doc_end = np.repeat(offsets[1:] - offsets[0], lengths)
+        starts = np.flatnonzero(np.arange(len(ids)) + self.shingle_size <= doc_end)
+
+        hashes = np.zeros(len(starts), dtype=np.uint64)
+        with np.errstate(over='ignore'):
+            for j in range(self.shingle_size):
+                hashes = hashes * np.uint64(0x9E3779B97F4A7C15) + ids[starts + j].astype(np.uint64)
+            hashes ^= hashes >> np.uint64(29)
+        return hashes, doc_of_token[starts]
+
+    def _minhash_values(self, hashes):
+        """Hash function values of shingles (uint32, num_perm x shingles)"""
+        values = np.empty((self.num_perm, len(hashes)), dtype=np.uint32)
+        x = np.empty(len(hashes), dtype=np.uint64)
+        with np.errstate(over='ignore'):
+            for j in range(self.num_perm):
+                np.multiply(hashes, self._a[j], out=x)
+                x += self._b[j]
+                x >>= np.uint64(32)
+                values[j] = x
+        return values
+
+    def signatures(self, corpus, block_tokens=1 << 16):
+        """
+        MinHash signatures of every document
+
+        Args:
+            corpus: EncodedCorpus
+            block_tokens: Approximate tokens hashed at a time
+
+        Returns:
+            tuple: (uint32 array of shape (documents, num_perm),
+                    boolean mask of documents with at least one shingle)
+        """
+        n = len(corpus)
+        signatures = np.full((n, self.num_perm), self.MAX_HASH, dtype=np.uint32)
+        has_shingles = np.zeros(n, dtype=bool)
+        offsets = np.asarray(corpus.offsets)
+
+        doc_start = 0
+        while doc_start < n:
+            doc_end = int(np.searchsorted(offsets, offsets[doc_start] + block_tokens, side='right')) - 1
+            doc_end = min(max(doc_end, doc_start + 1), n)
+            block_offsets = offsets[doc_start:doc_end + 1]
+            ids = np.asarray(corpus.ids[block_offsets[0]:block_offsets[-1]])
+
+            hashes, docs = self._shingle_hashes(ids, block_offsets)
+            if len(hashes):
+                values = self._minhash_values(hashes)
+                # Shingles are grouped by document; take the minimum of each group
+                starts = np.flatnonzero(np.r_[True, docs[1:] != docs[:-1]])
+                block_docs = docs[starts] + doc_start
+                signatures[block_docs] = np.minimum.reduceat(values, starts, axis=1).T
+                has_shingles[block_docs] = True
+            doc_start = doc_end
+
+        return signatures, has_shingles
+
+    def _candidate_pairs(self, signatures, has_shingles):
+        """Pairs sharing a band bucket, each document paired with its bucket's first document"""
+        valid = np.flatnonzero(has_shingles)
+        pairs = []
+        for band in range(self.bands):
+            band_values = signatures[valid, band * self.rows:(band + 1) * self.rows].astype(np.uint64)
+            with np.errstate(over='ignore'):
+                keys = (band_values * self._band_weights).sum(axis=1, dtype=np.uint64)
+            order = np.argsort(keys, kind='stable')
+            sorted_keys = keys[order]
+            bucket_start = np.r_[True, sorted_keys[1:] != sorted_keys[:-1]]
+            heads = order[np.maximum.accumulate(np.where(bucket_start, np.arange(len(order)), 0))]
+            members = ~bucket_start
+            pairs.append(np.stack([valid[heads[members]], valid[order[members]]], axis=1))
+
+        pairs = np.concatenate(pairs) if pairs else np.zeros((0, 2), dtype=np.int64)
+        return np.unique(pairs, axis=0)
+
+    def find_representatives(self, corpus, block_pairs=1 << 16):
+        """
+        Cluster near-duplicate documents
+
+        Args:
+            corpus: EncodedCorpus
+            block_pairs: Candidate pairs verified at a time
+
+        Returns:
+            numpy.ndarray: For each document, the row of its cluster's first
+                           document (itself when it has no near duplicate)
+        """
+        n = len(corpus)
+        signatures, has_shingles = self.signatures(corpus)
+        pairs = self._candidate_pairs(signatures, has_shingles)
+
+        # Keep candidates whose signatures agree on at least threshold of their values
+        linked = np.zeros(len(pairs), dtype=bool)
+        for start in range(0, len(pairs), block_pairs):
+            a, b = pairs[start:start + block_pairs].T
+            linked[start:start + block_pairs] = (signatures[a] == signatures[b]).mean(axis=1) >= self.threshold
+        pairs = pairs[linked]
+
+        graph = coo_matrix((np.ones(len(pairs), dtype=np.int8), (pairs[:, 0], pairs[:, 1])), shape=(n, n))
+        num_clusters, labels = connected_components(graph, directed=False)
+        first_row = np.full(num_clusters, n, dtype=np.int64)
+        np.minimum.at(first_row, labels, np.arange(n))
+        return first_row[labels]
+
+    @staticmethod
+    def summarize(representatives, lengths):
+        """
+        Cluster counts and the corpus volume held by duplicates
+
+        Args:
+            representatives: Output of find_representatives()
+            lengths: Tokens per document
+
+        Returns:
+            dict: Summary for the preprocessing report
+        """
+        rows = np.arange(len(representatives))
+        duplicates = representatives != rows
+        total_tokens = int(np.sum(lengths))
+        duplicate_tokens = int(np.sum(lengths[duplicates]))
+        return {
+            'documents': int(len(representatives)),
+            'clusters': int(len(np.unique(representatives[duplicates]))),
+            'duplicate_documents': int(duplicates.sum()),
+            'duplicate_document_share': float(duplicates.mean()) if len(rows) else 0.0,
+            'duplicate_tokens': duplicate_tokens,
+            'duplicate_token_share': duplicate_tokens / total_tokens if total_tokens else 0.0
+        }
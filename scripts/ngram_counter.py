@@ -0,0 +1,158 @@
+"""
+N-gram Counter
+Exact n-gram counts over integer token ids, packed and counted with NumPy
+"""
+
+import numpy as np
+
+
+def packs_into_int64(n, vocabulary_size):
+    """Whether n-grams over vocabulary_size ids pack into one int64"""
+    return max(vocabulary_size, 1) ** n < 2**63
+
+
+def ngram_keys(ids, offsets, n, vocabulary_size):
+    """
+    Keys of the n-grams of a block of documents, in corpus order
+
+    Keys are int64 (ids packed base vocabulary_size) when packs_into_int64(),
+    otherwise fixed-size binary keys of the n int32 ids. n-grams never cross
+    a document boundary.
+
+    Args:
+        ids: Token ids of the documents, concatenated
+        offsets: Offsets of the documents into ids (len(documents) + 1)
+        n: Tokens per n-gram
+        vocabulary_size: Number of token ids
+
+    Returns:
+        numpy.ndarray: One key per n-gram
+    """
+    ids = np.asarray(ids, dtype=np.int64)
+    offsets = np.asarray(offsets, dtype=np.int64) - offsets[0]
+    doc_end = np.repeat(offsets[1:], np.diff(offsets))
+    starts = np.flatnonzero(np.arange(len(ids)) + n <= doc_end)
+
+    if packs_into_int64(n, vocabulary_size):
+        keys = np.zeros(len(starts), dtype=np.int64)
+        for j in range(n):
+            keys = keys * vocabulary_size + ids[starts + j]
+        return keys
+    rows = np.stack([ids[starts + j] for j in range(n)], axis=1).astype(np.int32)
+    return np.ascontiguousarray(rows).view(np.dtype((np.void, 4 * n))).ravel()
+
+
+def empty_keys(n, vocabulary_size):
+    """Zero-length key array of the right dtype"""
+    if packs_into_int64(n, vocabulary_size):
+        return np.zeros(0, dtype=np.int64)
+    return np.zeros(0, dtype=np.dtype((np.void, 4 * n)))
+
+
+def decode_keys(keys, n, vocabulary_size):
+    """Token id tuples of n-gram keys"""
+    if not packs_into_int64(n, vocabulary_size):
+        return [tuple(row) for row in keys.view(np.int32).reshape(-1, n).tolist()]
+    ids = np.empty((len(keys), n), dtype=np.int64)
+    for j in range(n - 1, -1, -1):
+        keys, ids[:, j] = np.divmod(keys, vocabulary_size)
+    return [tuple(row) for row in ids.tolist()]
+
+
+class NgramCounter:
+    """
+    Count the n-grams of an encoded corpus
+
+    Each n-gram of token ids is packed into one int64 (base vocabulary_size),
+    so a chunk is counted with a single np.unique instead of building a
+    string per n-gram. When vocabulary_size ** n does not fit in 63 bits the
+    n ids are kept as one fixed-size binary key instead, which is still
+    exact. Counts are held as sorted key/count arrays, together with the
+    position of each n-gram's first occurrence, so ties rank in order of
+    first appearance, like Counter.most_common.
+    """
+
+    def __init__(self, n, vocabulary_size):
+        """
+        Initialize an empty counter
+
+        Args:
+            n: Tokens per n-gram
+            vocabulary_size: Number of token ids
+        """
+        if n < 1:
+            raise ValueError(f"n must be positive, got {n}")
+        self.n = n
+        self.vocabulary_size = vocabulary_size
+        self.total = 0  # n-grams counted (with repetition)
+        self.keys = empty_keys(n, vocabulary_size)
+        self.counts = np.zeros(0, dtype=np.int64)
+        self.first = np.zeros(0, dtype=np.int64)
+
+    def update(self, ids, offsets):
+        """
+        Count the n-grams of a block of documents
+
+        Args:
+            ids: Token ids of the documents, concatenated
+            offsets: Offsets of the documents into ids (len(documents) + 1)
+        """
+        all_keys = ngram_keys(ids, offsets, self.n, self.vocabulary_size)
+        if not len(all_keys):
+            return
+
+        keys, first, counts = np.unique(all_keys, return_index=True, return_counts=True)
+        self._merge(keys, counts, first + self.total)
+        self.total += len(all_keys)
+
+    def merge(self, other):
+        """
+        Add the counts of another counter over later documents
+
+        Args:
+            other: NgramCounter with the same n and vocabulary_size
+        """
+        if (other.n, other.vocabulary_size) != (self.n, self.vocabulary_size):
+            raise ValueError("Cannot merge n-gram counters of different n or vocabulary")
+        self._merge(other.keys, other.counts, other.first + self.total)
+        self.total += other.total
+
+    def _merge(self, keys, counts, first):
+        """Fold sorted, unique keys into the running counts"""
+        if not len(self.keys):
+            self.keys, self.counts, self.first = keys, counts, first
+            return
+        all_keys = np.concatenate([self.keys, keys])
+        # Two sorted runs, so the stable sort is a linear merge
+        order = np.argsort(all_keys, kind='stable')
+        all_keys = all_keys[order]
+        starts = np.flatnonzero(np.r_[True, all_keys[1:] != all_keys[:-1]])
+        self.keys = all_keys[starts]
+        self.counts = np.add.reduceat(np.concatenate([self.counts, counts])[order], starts)
+        self.first = np.minimum.reduceat(np.concatenate([self.first, first])[order], starts)
+
+    def __len__(self):
+        """Distinct n-grams"""
+        return len(self.keys)
+
+    def most_common(self, k):
+        """
+        k most frequent n-grams
+
+        Args:
+            k: Number of n-grams
+
+        Returns:
+            list: (token id tuple, count) pairs, ties in order of first appearance
+        """
+        if k <= 0 or not len(self.keys):
+            return []
+        if k < len(self.counts):
+            # Only n-grams at least as frequent as the k-th can make the cut
+            kth = np.partition(self.counts, len(self.counts) - k)[len(self.counts) - k]
+            candidates = np.flatnonzero(self.counts >= kth)
+        else:
+            candidates = np.arange(len(self.counts))
+        ranked = candidates[np.lexsort((self.first[candidates], -self.counts[candidates]))][:k]
+        return list(zip(decode_keys(self.keys[ranked], self.n, self.vocabulary_size),
+                        self.counts[ranked].tolist()))
@@ -0,0 +1,195 @@
+"""
+Shared API Rate Limiter
+Token bucket refilled from Reddit's X-Ratelimit-* response headers
+"""
+
+import asyncio
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+
+def _retry_after_seconds(value):
+    """
+    Seconds to wait from a Retry-After header
+
+    Args:
+        value: Header value, delay-seconds or an HTTP-date (RFC 9110)
+
+    Returns:
+        float: Seconds (at least 0), or None if the value cannot be parsed
+    """
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+class TokenBucketRateLimiter:
+    """
+    Thread-safe token bucket shared by the sequential and concurrent collectors
+
+    Every outgoing request takes one token. Tokens refill at a configured rate
+    until Reddit reports its own quota, after which the refill rate is set to
+    spread the remaining requests evenly over the rest of the rate-limit window.
+    A 429 response (or a window with no requests left) pauses the bucket until
+    the server's reset time instead of backing off exponentially.
+    """
+
+    def __init__(self, requests_per_minute=60, burst=10):
+        """
+        Initialize rate limiter
+
+        Args:
+            requests_per_minute: Refill rate used until response headers arrive
+            burst: Maximum number of tokens that can accumulate
+        """
+        self.capacity = float(burst)
+        self.default_rate = requests_per_minute / 60.0
+        self.refill_rate = self.default_rate
+
+        self.tokens = self.capacity
+        self.last_refill = time.monotonic()
+        self.blocked_until = 0.0
+        self._lock = threading.Lock()
+
+        # Server-reported quota
+        self.server_remaining = None
+        self.server_used = None
+        self.server_reset_at = None
+
+        # Metrics
+        self.tokens_used = 0
+        self.wait_seconds = 0.0
+        self.wait_events = 0
+        self.rate_limited_responses = 0
+        self.header_updates = 0
+
+    def _refill(self, now):
+        """Add tokens accrued since the last refill"""
+        elapsed = now - self.last_refill
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.refill_rate)
+        self.last_refill = now
+
+    def _reserve(self, cost):
+        """
+        Take tokens and return how long the caller must wait before using them
+
+        Tokens may go negative: later callers then queue behind earlier ones.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.tokens -= cost
+            self.tokens_used += cost
+
+            wait = 0.0
+            if self.tokens < 0:
+                wait = -self.tokens / max(self.refill_rate, 1e-6)
+            wait = max(wait, self.blocked_until - now)
+
+            if wait > 0:
+                self.wait_seconds += wait
+                self.wait_events += 1
+            return wait
+
+    def acquire(self, cost=1):
+        """Block until `cost` requests may be issued"""
+        wait = self._reserve(cost)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, cost=1):
+        """Non-blocking counterpart of acquire for asyncio collectors"""
+        wait = self._reserve(cost)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def update_from_headers(self, headers, status=None):
+        """
+        Refill the bucket from a Reddit API response
+
+        Args:
+            headers: Response headers (case-insensitive mapping)
+            status: HTTP status code of the response
+        """
+        remaining = headers.get('x-ratelimit-remaining')
+        reset = headers.get('x-ratelimit-reset')
+        used = headers.get('x-ratelimit-used')
+
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+
+            if remaining is not None and reset is not None:
+                try:
+                    remaining = float(remaining)
+                    reset = max(float(reset), 1.0)
+                except ValueError:
+                    remaining = None
+
+                if remaining is not None:
+                    self.header_updates += 1
+                    self.server_remaining = remaining
+                    self.server_reset_at = now + reset
+                    if used is not None:
+                        try:
+                            self.server_used = int(float(used))
+                        except ValueError:
+                            pass
+
+                    if remaining >= 1:
+                        # Spend what is left of the window evenly until it resets
+                        self.refill_rate = remaining / reset
+                        self.tokens = min(self.tokens, remaining)
+                    else:
+                        # Quota exhausted: pause until the window resets
+                        self.refill_rate = self.default_rate
+                        self.tokens = min(self.tokens, 0.0)
+                        self.blocked_until = max(self.blocked_until, now + reset)
+
+            if status == 429:
+                self.rate_limited_responses += 1
+                # A missing or unparseable Retry-After falls back to the window reset
+                retry_after = headers.get('retry-after')
+                pause = _retry_after_seconds(retry_after) if retry_after is not None else None
+                if pause is None:
+                    if self.server_reset_at is not None and self.server_reset_at > now:
+                        pause = self.server_reset_at - now
+                    else:
+                        pause = 60.0
+                self.tokens = min(self.tokens, 0.0)
+                self.blocked_until = max(self.blocked_until, now + pause)
+
+    def get_metrics(self):
+        """
+        Get rate limiter metrics
+
+        Returns:
+            dict: Tokens used versus available and time spent waiting
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            return {
+                'tokens_used': int(self.tokens_used),
+                'tokens_available': max(self.tokens, 0.0),
+                'capacity': self.capacity,
+                'refill_rate_per_minute': self.refill_rate * 60,
+                'server_remaining': self.server_remaining,
+                'server_used': self.server_used,
+                'server_reset_in_seconds': (max(self.server_reset_at - now, 0.0)
+                                            if self.server_reset_at is not None else None),
+                'wait_seconds': self.wait_seconds,
+                'wait_events': self.wait_events,
+                'rate_limited_responses': self.rate_limited_responses,
+                'header_updates': self.header_updates
+            }
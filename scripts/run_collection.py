@@ -18,6 +18,8 @@ spec = importlib.util.spec_from_file_location("data_collection",
 collection_module = importlib.util.module_from_spec(spec)
 spec.loader.exec_module(collection_module)
 RedditScraper = collection_module.RedditScraper
+PooledRedditScraper = collection_module.PooledRedditScraper
+AsyncRedditScraper = collection_module.AsyncRedditScraper
 
 
 def main():
@@ -38,6 +40,14 @@ Examples:
   
   # Quick test run:
   python scripts/run_collection.py --target 100 --hours 0.5
+  
+  # Concurrent collection (requires asyncpraw):
+  python scripts/run_collection.py --async
+  
+  # Daily refresh: only content newer than the last run, plus comment deltas:
+  python scripts/run_collection.py --incremental
+  
+  # Several Reddit apps (REDDIT_CLIENT_ID_2, ... in .env) shard the work automatically
 
 Features:
   - Automatic checkpointing every 5 minutes
@@ -69,6 +79,19 @@ Features:
         help='Resume from last checkpoint'
     )
     
+    parser.add_argument(
+        '--async',
+        dest='use_async',
+        action='store_true',
+        help='Use the concurrent asyncpraw collector (see async_collection in config.yaml)'
+    )
+    
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='Stop paging at stored watermarks and merge into existing data/raw files'
+    )
+    
     parser.add_argument(
         '--no-confirm',
         action='store_true',
@@ -106,6 +129,10 @@ Features:
         print(f"  Subreddits:       {', '.join(config['data_collection']['subreddits'])}")
         print(f"  Keywords:         {', '.join(config['data_collection']['keywords'])}")
         print(f"  Resume mode:      {'Yes' if args.resume else 'No'}")
+        print(f"  Concurrent mode:  {'Yes' if args.use_async else 'No'}")
+        print(f"  Incremental mode: {'Yes' if args.incremental else 'No'}")
+        num_apps = 1 + len(config['reddit'].get('credentials') or [])
+        print(f"  Reddit apps:      {num_apps}{' (async mode uses the first only)' if args.use_async and num_apps > 1 else ''}")
         
         print(f"\nFeatures:")
         print(f"  ✓ Auto-save every 5 minutes")
@@ -139,7 +166,13 @@ Features:
         print("=" * 80 + "\n")
         
         # Initialize scraper
-        scraper = RedditScraper(config)
+        if args.use_async:
+            scraper_class = AsyncRedditScraper
+        elif num_apps > 1:
+            scraper_class = PooledRedditScraper
+        else:
+            scraper_class = RedditScraper
+        scraper = scraper_class(config, incremental=args.incremental)
         
         # Collect data
         scraper.collect_data(
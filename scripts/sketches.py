@@ -0,0 +1,264 @@
+"""
+Frequency Sketches
+Fixed-memory, mergeable top-k n-gram counts (Count-Min Sketch + Space-Saving)
+"""
+
+import numpy as np
+
+from ngram_counter import ngram_keys, empty_keys, decode_keys
+
+
+def _key_hashes(keys):
+    """uint64 values of n-gram keys (int64 or binary)"""
+    if keys.dtype == np.int64:
+        return keys.view(np.uint64)
+    columns = keys.view(np.int32).reshape(len(keys), -1)
+    hashes = np.zeros(len(keys), dtype=np.uint64)
+    with np.errstate(over='ignore'):
+        for j in range(columns.shape[1]):
+            hashes = hashes * np.uint64(0x9E3779B97F4A7C15) + columns[:, j].astype(np.uint64)
+    return hashes
+
+
+class CountMinSketch:
+    """
+    Count-Min Sketch over n-gram keys
+
+    Estimates never undercount. With probability 1 - exp(-depth) an
+    estimate exceeds the true count by at most e / width * total.
+    Sketches with the same shape and seed merge by adding their tables.
+    """
+
+    def __init__(self, width=1 << 20, depth=4, seed=1):
+        """
+        Initialize an empty sketch
+
+        Args:
+            width: Counters per row
+            depth: Rows (independent hash functions)
+            seed: Seed of the hash functions
+        """
+        self.width = width
+        self.depth = depth
+        self.seed = seed
+        self.total = 0
+        self.table = np.zeros((depth, width), dtype=np.int64)
+
+        rng = np.random.default_rng(seed)
+        # Multiply-shift hash functions; odd multipliers
+        self._a = rng.integers(1, 2**63, size=depth, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 2**63, size=depth, dtype=np.uint64)
+
+    def _columns(self, hashes, row):
+        with np.errstate(over='ignore'):
+            return ((hashes * self._a[row] + self._b[row]) >> np.uint64(32)) % np.uint64(self.width)
+
+    def add(self, keys, counts):
+        """
+        Add counts of distinct keys
+
+        Args:
+            keys: Distinct n-gram keys
+            counts: Occurrences of each key
+        """
+        hashes = _key_hashes(keys)
+        for row in range(self.depth):
+            self.table[row] += np.bincount(
+                self._columns(hashes, row).astype(np.int64), weights=counts, minlength=self.width
+            ).astype(np.int64)
+        self.total += int(np.sum(counts))
+
+    def estimate(self, keys):
+        """Upper-bound estimates of the counts of keys"""
+        hashes = _key_hashes(keys)
+        estimates = np.full(len(keys), np.iinfo(np.int64).max, dtype=np.int64)
+        for row in range(self.depth):
+            np.minimum(estimates, self.table[row][self._columns(hashes, row).astype(np.int64)], out=estimates)
+        return estimates
+
+    def merge(self, other):
+        """Add another sketch with the same width, depth and seed"""
+        if (other.width, other.depth, other.seed) != (self.width, self.depth, self.seed):
+            raise ValueError("Cannot merge Count-Min sketches of different shape or seed")
+        self.table += other.table
+        self.total += other.total
+
+    @property
+    def error(self):
+        """Maximum overcount at the stated confidence"""
+        return np.e / self.width * self.total
+
+    @property
+    def confidence(self):
+        return 1 - np.exp(-self.depth)
+
+
+class SpaceSaving:
+    """
+    Space-Saving heavy hitters, mergeable
+
+    Monitors at most capacity keys with a count that never undercounts and
+    an error (count - error never overcounts). Any key that is not monitored
+    occurred at most floor times, and floor <= total / capacity. Summaries
+    merge by adding counts, filling in each side's floor for keys it does
+    not monitor, and keeping the capacity largest.
+    """
+
+    def __init__(self, capacity, keys):
+        """
+        Initialize an empty summary
+
+        Args:
+            capacity: Maximum monitored keys
+            keys: Zero-length array of the key dtype
+        """
+        self.capacity = capacity
+        self.total = 0
+        self.floor = 0
+        self.keys = keys
+        self.counts = np.zeros(0, dtype=np.int64)
+        self.errors = np.zeros(0, dtype=np.int64)
+        self.first = np.zeros(0, dtype=np.int64)  # Position of first occurrence, for ties
+
+    def add(self, keys, counts, first):
+        """
+        Add exact counts of distinct keys seen after everything so far
+
+        Args:
+            keys: Distinct n-gram keys
+            counts: Occurrences of each key
+            first: Position of each key's first occurrence among the new n-grams
+        """
+        block = SpaceSaving(self.capacity, keys[:0])
+        block.keys, block.counts, block.first = keys, counts, first
+        block.errors = np.zeros(len(keys), dtype=np.int64)
+        block.total = int(np.sum(counts))
+        self.merge(block)
+
+    def merge(self, other):
+        """Add a summary of later n-grams"""
+        keys = np.concatenate([self.keys, other.keys])
+        if not len(keys):
+            self.total += other.total
+            return
+        keys, inverse = np.unique(keys, return_inverse=True)
+        mine, theirs = inverse[:len(self.keys)], inverse[len(self.keys):]
+
+        counts = np.full(len(keys), self.floor + other.floor, dtype=np.int64)
+        counts[mine] += self.counts - self.floor
+        counts[theirs] += other.counts - other.floor
+        errors = np.full(len(keys), self.floor + other.floor, dtype=np.int64)
+        errors[mine] += self.errors - self.floor
+        errors[theirs] += other.errors - other.floor
+        first = np.full(len(keys), np.iinfo(np.int64).max, dtype=np.int64)
+        first[theirs] = other.first + self.total
+        first[mine] = self.first
+
+        floor = self.floor + other.floor
+        if len(keys) > self.capacity:
+            keep = np.argpartition(-counts, self.capacity - 1)[:self.capacity]
+            dropped = np.ones(len(keys), dtype=bool)
+            dropped[keep] = False
+            floor = max(floor, int(counts[dropped].max()))
+            keep.sort()
+            keys, counts, errors, first = keys[keep], counts[keep], errors[keep], first[keep]
+
+        self.keys, self.counts, self.errors, self.first = keys, counts, errors, first
+        self.floor = floor
+        self.total += other.total
+
+
+class NgramSketch:
+    """
+    Approximate n-gram counts in fixed memory
+
+    Space-Saving finds the heavy hitters; each one's count is the smaller of
+    its Space-Saving and Count-Min upper bounds, and its Space-Saving lower
+    bound is reported alongside. While fewer than capacity distinct n-grams
+    have been seen the counts are exact. Sketches built with the same
+    parameters over different chunks or shards merge into the sketch of the
+    combined corpus.
+    """
+
+    def __init__(self, n, vocabulary_size, capacity=10000, width=1 << 20, depth=4, seed=1):
+        """
+        Initialize an empty sketch
+
+        Args:
+            n: Tokens per n-gram
+            vocabulary_size: Number of token ids
+            capacity: n-grams monitored by Space-Saving
+            width: Count-Min counters per row
+            depth: Count-Min rows
+            seed: Seed of the Count-Min hash functions
+        """
+        self.n = n
+        self.vocabulary_size = vocabulary_size
+        self.heavy_hitters = SpaceSaving(capacity, empty_keys(n, vocabulary_size))
+        self.count_min = CountMinSketch(width, depth, seed)
+
+    @property
+    def total(self):
+        """n-grams counted (with repetition)"""
+        return self.heavy_hitters.total
+
+    def update(self, ids, offsets):
+        """
+        Count the n-grams of a block of documents
+
+        Args:
+            ids: Token ids of the documents, concatenated
+            offsets: Offsets of the documents into ids (len(documents) + 1)
+        """
+        keys = ngram_keys(ids, offsets, self.n, self.vocabulary_size)
+        if not len(keys):
+            return
+        keys, first, counts = np.unique(keys, return_index=True, return_counts=True)
+        self.count_min.add(keys, counts)
+        self.heavy_hitters.add(keys, counts, first)
+
+    def merge(self, other):
+        """
+        Add a sketch of later documents
+
+        Args:
+            other: NgramSketch with the same parameters
+        """
+        if (other.n, other.vocabulary_size, other.heavy_hitters.capacity) != \
+                (self.n, self.vocabulary_size, self.heavy_hitters.capacity):
+            raise ValueError("Cannot merge n-gram sketches of different n, vocabulary or capacity")
+        self.count_min.merge(other.count_min)
+        self.heavy_hitters.merge(other.heavy_hitters)
+
+    def most_common(self, k):
+        """
+        k most frequent n-grams with bounds on their counts
+
+        Args:
+            k: Number of n-grams
+
+        Returns:
+            list: (token id tuple, count upper bound, count lower bound) triples,
+                  most frequent first
+        """
+        summary = self.heavy_hitters
+        if k <= 0 or not len(summary.keys):
+            return []
+        upper = np.minimum(summary.counts, self.count_min.estimate(summary.keys))
+        lower = summary.counts - summary.errors
+        ranked = np.lexsort((summary.first, -upper))[:k]
+        return list(zip(decode_keys(summary.keys[ranked], self.n, self.vocabulary_size),
+                        upper[ranked].tolist(), lower[ranked].tolist()))
+
+    def error_bounds(self):
+        """Guarantees on the counts, for reports"""
+        return {
+            'total': int(self.total),
+            'capacity': int(self.heavy_hitters.capacity),
+            'max_unmonitored_count': int(self.heavy_hitters.floor),
+            'count_min_width': int(self.count_min.width),
+            'count_min_depth': int(self.count_min.depth),
+            'count_min_max_overcount': float(self.count_min.error),
+            'count_min_confidence': float(self.count_min.confidence),
+            'exact': self.heavy_hitters.floor == 0
+        }
@@ -0,0 +1,121 @@
+"""
+Token Cache
+Persistent, content-addressed cache of tokenization results for preprocessing
+"""
+
+import hashlib
+import json
+import sqlite3
+from pathlib import Path
+
+
+class TokenCache:
+    """
+    SQLite cache of token lists keyed by text and preprocessing settings
+
+    Each entry is keyed by a BLAKE2b digest of the settings fingerprint and the
+    cleaned text, so an unchanged document is a cache hit on every later run
+    and any change to the text, the filters or the spaCy model is a miss.
+    Entries written under a different fingerprint can never hit again and
+    are dropped when the cache is opened.
+    """
+
+    SQL_BATCH_SIZE = 500  # Stay below SQLite's bound-parameter limit
+
+    def __init__(self, path='data/processed/token_cache.sqlite', fingerprint=''):
+        """
+        Initialize cache
+
+        Args:
+            path: Path to the SQLite database
+            fingerprint: Digest of everything besides the text that shapes the tokens
+        """
+        self.path = Path(path)
+        self.fingerprint = fingerprint
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Parallel preprocessing workers share the database; wait for each other's writes
+        self.conn = sqlite3.connect(str(self.path), timeout=60)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS tokens (key BLOB PRIMARY KEY, tokens TEXT NOT NULL) WITHOUT ROWID'
+        )
+        self.conn.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)')
+
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'fingerprint'").fetchone()
+        self.stats = {'hits': 0, 'misses': 0, 'invalidated_entries': 0}
+        if row is None or row[0] != fingerprint:
+            self.stats['invalidated_entries'] = self.conn.execute('DELETE FROM tokens').rowcount
+            self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('fingerprint', ?)", (fingerprint,))
+        self.conn.commit()
+
+    @staticmethod
+    def make_fingerprint(settings):
+        """
+        Digest of preprocessing settings
+
+        Args:
+            settings: JSON-serializable dict (sets are sorted)
+
+        Returns:
+            str: Hex digest
+        """
+        payload = json.dumps(settings, sort_keys=True, default=sorted)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _key(self, text):
+        return hashlib.blake2b(f"{self.fingerprint}\0{text}".encode('utf-8'), digest_size=16).digest()
+
+    def get_many(self, texts):
+        """
+        Look up cached token lists
+
+        Args:
+            texts: List of distinct texts
+
+        Returns:
+            dict: text -> tokens for every cache hit
+        """
+        keys = {self._key(text): text for text in texts}
+        found = {}
+        key_list = list(keys)
+        for start in range(0, len(key_list), self.SQL_BATCH_SIZE):
+            batch = key_list[start:start + self.SQL_BATCH_SIZE]
+            placeholders = ','.join('?' * len(batch))
+            for key, tokens in self.conn.execute(
+                f'SELECT key, tokens FROM tokens WHERE key IN ({placeholders})', batch
+            ):
+                found[keys[key]] = json.loads(tokens)
+
+        self.stats['hits'] += len(found)
+        self.stats['misses'] += len(keys) - len(found)
+        return found
+
+    def put_many(self, tokens_by_text):
+        """
+        Store token lists and make them durable
+
+        Args:
+            tokens_by_text: dict of text -> tokens
+        """
+        self.conn.executemany(
+            'INSERT OR REPLACE INTO tokens VALUES (?, ?)',
+            ((self._key(text), json.dumps(tokens)) for text, tokens in tokens_by_text.items())
+        )
+        self.conn.commit()
+
+    def count(self):
+        return self.conn.execute('SELECT COUNT(*) FROM tokens').fetchone()[0]
+
+    def get_metrics(self):
+        """Hit/miss counters and cache size for the preprocessing report"""
+        lookups = self.stats['hits'] + self.stats['misses']
+        metrics = dict(self.stats)
+        metrics['hit_rate'] = self.stats['hits'] / lookups if lookups else 0.0
+        metrics['entries'] = self.count()
+        return metrics
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
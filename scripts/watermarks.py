@@ -0,0 +1,102 @@
+"""
+Collection Watermarks
+Per-(subreddit, method, keyword) high-water marks for incremental collection
+"""
+
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+
+
+class WatermarkStore:
+    """
+    Persistent watermarks for chronological listings
+
+    A watermark records the newest submission seen for a listing, as both its
+    created_utc timestamp and its fullname cursor. Incremental runs stop paging
+    a listing once they reach content at or below the watermark. A listing's
+    new mark only replaces the old one when its walk got all the way down to
+    the old mark (or the end of the listing); a walk cut short by the target,
+    the runtime or the listing size keeps the old mark, so the next run fills
+    the gap instead of skipping it. New marks are staged in memory and only
+    persisted by save(), after the collected data has been written, so an
+    interrupted run never skips unsaved content.
+    """
+
+    def __init__(self, path='data/raw/watermarks.json'):
+        """
+        Initialize watermark store
+
+        Args:
+            path: Path to the watermark JSON file
+        """
+        self.path = Path(path)
+        self.watermarks = {}
+        self.pending = {}
+        self.candidates = {}  # Newest submission of listings being walked
+
+        if self.path.exists():
+            with open(self.path, 'r') as f:
+                self.watermarks = json.load(f)
+
+    @staticmethod
+    def _key(subreddit, method, keyword=None):
+        return f"{subreddit.lower()}|{method}|{(keyword or '').lower()}"
+
+    def get(self, subreddit, method, keyword=None):
+        """
+        Get the persisted watermark for a listing
+
+        Returns:
+            dict: {'created_utc', 'fullname', 'updated_at'} or None
+        """
+        return self.watermarks.get(self._key(subreddit, method, keyword))
+
+    def observe(self, subreddit, method, keyword, created_utc, fullname):
+        """Note a submission seen while walking a listing (see finish_listing)"""
+        key = self._key(subreddit, method, keyword)
+        current = self.candidates.get(key)
+        if current is None or created_utc > current['created_utc']:
+            self.candidates[key] = {
+                'created_utc': float(created_utc),
+                'fullname': fullname,
+                'updated_at': datetime.now().isoformat()
+            }
+
+    def finish_listing(self, subreddit, method, keyword, complete):
+        """
+        End a listing walk, staging its newest submission as the new watermark
+
+        Args:
+            subreddit: Subreddit name
+            method: Listing method
+            keyword: Search keyword (search method only)
+            complete: Whether the walk reached the old watermark or the end of
+                      the listing; otherwise the old watermark is kept
+
+        Returns:
+            bool: True if a new watermark was staged
+        """
+        key = self._key(subreddit, method, keyword)
+        candidate = self.candidates.pop(key, None)
+        if candidate is None or not complete:
+            return False
+        current = self.pending.get(key) or self.watermarks.get(key)
+        if current is not None and candidate['created_utc'] <= current['created_utc']:
+            return False
+        self.pending[key] = candidate
+        return True
+
+    def save(self):
+        """Commit staged watermarks to disk"""
+        if not self.pending:
+            return
+        self.watermarks.update(self.pending)
+        self.pending = {}
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(self.watermarks, f, indent=2)
+        os.replace(tmp_path, self.path)